@@ -0,0 +1,43 @@
+"""add offer counters (applicationsCount, messageCount, lastMessageAt)
+
+Revision ID: 46a33a12a230
+Revises: c6a29e0f5b18
+Create Date: 2026-10-17 19:02:11.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '46a33a12a230'
+down_revision = 'c6a29e0f5b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('applicationsCount', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('messageCount', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('lastMessageAt', sa.DateTime(), nullable=True))
+
+    # backfill so the running arithmetic starts consistent (same as `flask reconcile-counters`)
+    op.execute(
+        'UPDATE offers SET '
+        '"applicationsCount" = (SELECT COUNT(*) FROM matches m WHERE m."offerId" = offers."offerId"), '
+        '"messageCount" = (SELECT COUNT(*) FROM messages g WHERE g."offerId" = offers."offerId"), '
+        '"lastMessageAt" = (SELECT MAX(g."createdAt") FROM messages g WHERE g."offerId" = offers."offerId")'
+    )
+    # eventsFinalised used to be client-set; from now on it is derived from closed offers
+    op.execute(
+        'UPDATE "user" SET "eventsFinalised" = (SELECT COUNT(*) FROM offers o '
+        'WHERE o."acceptedPerformerId" = "user"."userId" AND o.status = \'closed\')'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.drop_column('lastMessageAt')
+        batch_op.drop_column('messageCount')
+        batch_op.drop_column('applicationsCount')
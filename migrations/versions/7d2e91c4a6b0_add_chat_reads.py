@@ -0,0 +1,53 @@
+"""add chat_reads (read watermarks) and messages (offerId, messageId) index
+
+Revision ID: 7d2e91c4a6b0
+Revises: 46a33a12a230
+Create Date: 2026-10-17 20:11:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e91c4a6b0'
+down_revision = '46a33a12a230'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_reads',
+    sa.Column('readId', sa.Integer(), nullable=False),
+    sa.Column('userId', sa.Integer(), nullable=False),
+    sa.Column('offerId', sa.Integer(), nullable=False),
+    sa.Column('lastReadMessageId', sa.Integer(), nullable=False),
+    sa.Column('updatedAt', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['offerId'], ['offers.offerId'], ),
+    sa.ForeignKeyConstraint(['userId'], ['user.userId'], ),
+    sa.PrimaryKeyConstraint('readId'),
+    sa.UniqueConstraint('userId', 'offerId', name='uq_chat_read_user_offer')
+    )
+    with op.batch_alter_table('chat_reads', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_reads_offer', ['offerId'], unique=False)
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_offer_id', ['offerId', 'messageId'], unique=False)
+
+    # everyone has read up to their own last message on each chat, which is
+    # what the dashboard's "unread" meant before the watermarks existed
+    op.execute(
+        'INSERT INTO chat_reads ("userId", "offerId", "lastReadMessageId", "updatedAt") '
+        'SELECT "authorId", "offerId", MAX("messageId"), MAX("createdAt") '
+        'FROM messages GROUP BY "authorId", "offerId"'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_offer_id')
+
+    with op.batch_alter_table('chat_reads', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_reads_offer')
+
+    op.drop_table('chat_reads')
@@ -0,0 +1,43 @@
+"""add user.deletedAt (soft delete)
+
+Revision ID: a5c3e8d17f42
+Revises: f2d6b8e13a74
+Create Date: 2026-10-17 15:12:40.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5c3e8d17f42'
+down_revision = 'f2d6b8e13a74'
+branch_labels = None
+depends_on = None
+
+# keep in sync with User.__table_args__ in src/api/models.py
+INDEXES = [
+    ('ix_user_deleted', 'user', ['deletedAt']),
+]
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deletedAt', sa.DateTime(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('deletedAt')
@@ -0,0 +1,56 @@
+"""add hot path indexes
+
+Revision ID: b7e2c4d91f03
+Revises: 6ff436c77491
+Create Date: 2026-10-17 10:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c4d91f03'
+down_revision = '6ff436c77491'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) — keep in sync with __table_args__ in api/models.py
+INDEXES = [
+    ('ix_user_role_created', 'user', ['role', 'createdAt']),
+    ('ix_user_created_id', 'user', ['createdAt', 'userId']),
+    ('ix_offers_distributor_created', 'offers', ['distributorId', 'createdAt']),
+    ('ix_offers_created_id', 'offers', ['createdAt', 'offerId']),
+    ('ix_offers_accepted_performer', 'offers', ['acceptedPerformerId']),
+    ('ix_matches_performer_created', 'matches', ['performerId', 'createdAt']),
+    ('ix_matches_offer_created', 'matches', ['offerId', 'createdAt']),
+    ('ix_messages_offer_created', 'messages', ['offerId', 'createdAt']),
+    ('ix_messages_author', 'messages', ['authorId']),
+    ('ix_reviews_rated_created', 'reviews', ['ratedId', 'createdAt']),
+    ('ix_reviews_offer', 'reviews', ['offerId']),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table,
+                              postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,43 @@
+"""add jobs table (background job queue)
+
+Revision ID: b8f14c6e2d93
+Revises: a5c3e8d17f42
+Create Date: 2026-10-17 16:02:11.730945
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f14c6e2d93'
+down_revision = 'a5c3e8d17f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('jobId', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=80), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('maxAttempts', sa.Integer(), nullable=False),
+    sa.Column('runAt', sa.DateTime(), nullable=False),
+    sa.Column('lockedAt', sa.DateTime(), nullable=True),
+    sa.Column('lockedBy', sa.String(length=120), nullable=True),
+    sa.Column('lastError', sa.Text(), nullable=True),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.Column('finishedAt', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('jobId')
+    )
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_status_priority_run', ['status', 'priority', 'runAt'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_status_priority_run')
+    op.drop_table('jobs')
@@ -0,0 +1,37 @@
+"""add matches.updatedAt index (recommendation index sync)
+
+Revision ID: c6a29e0f5b18
+Revises: b8f14c6e2d93
+Create Date: 2026-10-17 17:20:48.305117
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a29e0f5b18'
+down_revision = 'b8f14c6e2d93'
+branch_labels = None
+depends_on = None
+
+# keep in sync with Match.__table_args__ in src/api/models.py
+INDEXES = [
+    ('ix_matches_updated', 'matches', ['updatedAt']),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
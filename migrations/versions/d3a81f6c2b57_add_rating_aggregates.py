@@ -0,0 +1,42 @@
+"""add rating aggregates
+
+Revision ID: d3a81f6c2b57
+Revises: b7e2c4d91f03
+Create Date: 2026-10-17 11:03:52.540117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a81f6c2b57'
+down_revision = 'b7e2c4d91f03'
+branch_labels = None
+depends_on = None
+
+AGG_COLUMNS = ['ratingSum', 'ratingHist1', 'ratingHist2', 'ratingHist3', 'ratingHist4', 'ratingHist5']
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        for col in AGG_COLUMNS:
+            batch_op.add_column(sa.Column(col, sa.Integer(), nullable=False, server_default='0'))
+
+    # backfill from existing reviews so the running arithmetic starts consistent
+    op.execute(
+        'UPDATE "user" SET '
+        '"ratingSum" = COALESCE((SELECT SUM(r.score) FROM reviews r WHERE r."ratedId" = "user"."userId"), 0), '
+        '"ratingCount" = (SELECT COUNT(*) FROM reviews r WHERE r."ratedId" = "user"."userId"), '
+        + ', '.join(
+            f'"ratingHist{n}" = (SELECT COUNT(*) FROM reviews r '
+            f'WHERE r."ratedId" = "user"."userId" AND r.score = {n})'
+            for n in range(1, 6)
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        for col in reversed(AGG_COLUMNS):
+            batch_op.drop_column(col)
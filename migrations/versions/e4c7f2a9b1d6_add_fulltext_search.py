@@ -0,0 +1,98 @@
+"""add full-text search
+
+Revision ID: e4c7f2a9b1d6
+Revises: e91b0a7d4c28
+Create Date: 2026-10-17 12:31:17.845920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4c7f2a9b1d6'
+down_revision = 'e91b0a7d4c28'
+branch_labels = None
+depends_on = None
+
+# Snapshot of api/fulltext.py at the time of this revision.
+OFFER_TSV = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+PERFORMER_TSV = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(bio, '') || ' ' "
+    "|| coalesce(slogan, '') || ' ' || coalesce(genre, ''))"
+)
+
+SQLITE_UP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS offers_fts USING fts5(
+        title, description, content='offers', content_rowid='offerId'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_ai AFTER INSERT ON offers BEGIN
+        INSERT INTO offers_fts(rowid, title, description)
+        VALUES (new."offerId", new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_ad AFTER DELETE ON offers BEGIN
+        INSERT INTO offers_fts(offers_fts, rowid, title, description)
+        VALUES ('delete', old."offerId", old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_au AFTER UPDATE OF title, description ON offers BEGIN
+        INSERT INTO offers_fts(offers_fts, rowid, title, description)
+        VALUES ('delete', old."offerId", old.title, old.description);
+        INSERT INTO offers_fts(rowid, title, description)
+        VALUES (new."offerId", new.title, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS performers_fts USING fts5(
+        name, bio, slogan, genre, content='user', content_rowid='userId'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO performers_fts(rowid, name, bio, slogan, genre)
+        VALUES (new."userId", new.name, new.bio, new.slogan, new.genre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO performers_fts(performers_fts, rowid, name, bio, slogan, genre)
+        VALUES ('delete', old."userId", old.name, old.bio, old.slogan, old.genre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_au AFTER UPDATE OF name, bio, slogan, genre ON "user" BEGIN
+        INSERT INTO performers_fts(performers_fts, rowid, name, bio, slogan, genre)
+        VALUES ('delete', old."userId", old.name, old.bio, old.slogan, old.genre);
+        INSERT INTO performers_fts(rowid, name, bio, slogan, genre)
+        VALUES (new."userId", new.name, new.bio, new.slogan, new.genre);
+    END""",
+    "INSERT INTO offers_fts(offers_fts) VALUES ('rebuild')",
+    "INSERT INTO performers_fts(performers_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWN = [
+    "DROP TRIGGER IF EXISTS performers_fts_au",
+    "DROP TRIGGER IF EXISTS performers_fts_ad",
+    "DROP TRIGGER IF EXISTS performers_fts_ai",
+    "DROP TABLE IF EXISTS performers_fts",
+    "DROP TRIGGER IF EXISTS offers_fts_au",
+    "DROP TRIGGER IF EXISTS offers_fts_ad",
+    "DROP TRIGGER IF EXISTS offers_fts_ai",
+    "DROP TABLE IF EXISTS offers_fts",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_offers_fts ON offers USING GIN ({OFFER_TSV})')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_performer_fts ON "user" '
+                f"USING GIN ({PERFORMER_TSV}) WHERE role = 'performer'"
+            )
+    elif bind.dialect.name == 'sqlite':
+        for stmt in SQLITE_UP:
+            op.execute(stmt)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_user_performer_fts')
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_offers_fts')
+    elif bind.dialect.name == 'sqlite':
+        for stmt in SQLITE_DOWN:
+            op.execute(stmt)
@@ -0,0 +1,47 @@
+"""add offer search indexes
+
+Revision ID: e91b0a7d4c28
+Revises: d3a81f6c2b57
+Create Date: 2026-10-17 11:48:09.302715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e91b0a7d4c28'
+down_revision = 'd3a81f6c2b57'
+branch_labels = None
+depends_on = None
+
+# keep in sync with the module-level Index() definitions in api/models.py
+INDEXES = [
+    ('ix_offers_status_city_event', ['status', sa.text('lower(city)'), 'eventDate']),
+    ('ix_offers_status_genre_event', ['status', sa.text('lower(genre)'), 'eventDate']),
+    ('ix_offers_status_event', ['status', 'eventDate']),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, cols in INDEXES:
+                op.create_index(name, 'offers', cols, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, cols in INDEXES:
+            op.create_index(name, 'offers', cols, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='offers',
+                              postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='offers', if_exists=True)
@@ -0,0 +1,48 @@
+"""add updatedAt columns
+
+Revision ID: f2d6b8e13a74
+Revises: e4c7f2a9b1d6
+Create Date: 2026-10-17 14:06:21.277043
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d6b8e13a74'
+down_revision = 'e4c7f2a9b1d6'
+branch_labels = None
+depends_on = None
+
+TABLES = ['user', 'offers', 'matches']
+INDEXES = [
+    ('ix_user_updated', 'user', ['updatedAt']),
+    ('ix_user_role_updated', 'user', ['role', 'updatedAt']),
+    ('ix_offers_updated', 'offers', ['updatedAt']),
+]
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updatedAt', sa.DateTime(), nullable=True))
+        op.execute(f'UPDATE "{table}" SET "updatedAt" = "createdAt"')
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updatedAt')
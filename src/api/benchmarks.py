@@ -0,0 +1,276 @@
+"""
+Micro/mini benchmarks, exposed as flask CLI commands in api/commands.py.
+Serialization benchmarks build a throwaway SQLite database; the login storm
+drives the real routes against the configured one.
+"""
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from api.models import db, User, Offer
+from api.serializers import Projection, dumps
+from api.utils import hash_password
+
+
+def _timeit(fn, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def _summary(samples: list[float], statuses: dict) -> dict:
+    return {
+        "requests": len(samples),
+        "p50_ms": round(_percentile(samples, 50), 1),
+        "p99_ms": round(_percentile(samples, 99), 1),
+        "statuses": dict(statuses),
+    }
+
+
+def _seed_catalog(engine, rows: int):
+    rnd = random.Random(42)
+    now = datetime(2025, 1, 1)
+    cities = ["Madrid", "Barcelona", "Valencia", "Sevilla", "Bilbao"]
+    genres = ["rock", "jazz", "pop", "flamenco", "indie"]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "email": f"bench{i}@example.com", "password": "x",
+                "role": "distributor" if i % 5 == 0 else "performer",
+                "name": f"User {i}", "city": rnd.choice(cities), "createdAt": now,
+                "genre": rnd.choice(genres), "slogan": "Live music every night",
+                "bio": "Lorem ipsum dolor sit amet " * 20,
+                "musicians": [{"name": "A", "instrument": "guitar"}, {"name": "B", "instrument": "drums"}],
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Offer), [
+            {
+                "distributorId": 1 + (i % rows), "title": f"Concert {i}",
+                "description": "Looking for a band for a full evening set. " * 10,
+                "city": rnd.choice(cities), "venueName": "Sala", "genre": rnd.choice(genres),
+                "budget": rnd.randint(100, 2000), "status": "open",
+                "eventDate": now + timedelta(days=i % 365), "capacity": rnd.randint(50, 500),
+                "createdAt": now + timedelta(seconds=i),
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def bench_serialization(rows: int = 5000, repeat: int = 5) -> list[dict]:
+    """
+    Compares, per model, the ORM path (select(Model) -> serialize() -> Flask
+    JSON provider) with the projection path (column tuples -> Projection ->
+    serializers.dumps). Returns one result dict per (model, path).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.metadata.create_all(engine)
+        _seed_catalog(engine, rows)
+
+        results = []
+        for model in (User, Offer):
+            def orm_path():
+                with Session(engine) as session:
+                    objs = session.execute(select(model)).scalars().all()
+                    current_app.json.dumps([o.serialize() for o in objs])
+
+            proj = Projection(model)
+
+            def projection_path():
+                with Session(engine) as session:
+                    dumps(proj.to_dicts(session.execute(proj.select()).all()))
+
+            for label, fn in (("orm+serialize", orm_path), ("projection", projection_path)):
+                fn()  # warm-up
+                timings = _timeit(fn, repeat)
+                results.append({
+                    "model": model.__name__, "path": label, "rows": rows,
+                    "median_ms": round(statistics.median(timings), 1),
+                    "min_ms": round(min(timings), 1),
+                })
+        engine.dispose()
+    return results
+
+
+BENCH_LOGIN_EMAIL = "bench-login@example.invalid"
+BENCH_LOGIN_PASSWORD = "bench-password"
+
+
+def bench_login_storm(storm_threads: int = 16, probe_threads: int = 2, seconds: float = 10.0,
+                      probe_path: str = "/api/users?limit=20") -> dict:
+    """
+    Drives the real routes in-process (one WSGI app, many threads, like a
+    gthread worker): `storm_threads` clients loop on POST /api/login while
+    `probe_threads` clients loop on an unrelated GET. Runs the probes alone
+    first as a baseline. Uses (and creates if missing) a dedicated bench user
+    in the configured database.
+    """
+    app = current_app._get_current_object()
+    if not db.session.scalar(select(User).where(User.email == BENCH_LOGIN_EMAIL)):
+        db.session.add(User(email=BENCH_LOGIN_EMAIL, password=hash_password(BENCH_LOGIN_PASSWORD),
+                            role="performer", name="Bench", city="N/A"))
+        db.session.commit()
+
+    def loop(stop, samples, statuses, call):
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            status = call(client)
+            samples.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def login(client):
+        return client.post("/api/login", json={
+            "email": BENCH_LOGIN_EMAIL, "password": BENCH_LOGIN_PASSWORD}).status_code
+
+    def probe(client):
+        return client.get(probe_path).status_code
+
+    def run(with_storm: bool):
+        stop = threading.Event()
+        login_samples, login_statuses = [], {}
+        probe_samples, probe_statuses = [], {}
+        threads = [threading.Thread(target=loop, args=(stop, probe_samples, probe_statuses, probe))
+                   for _ in range(probe_threads)]
+        if with_storm:
+            threads += [threading.Thread(target=loop, args=(stop, login_samples, login_statuses, login))
+                        for _ in range(storm_threads)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        out = {"probe": _summary(probe_samples, probe_statuses)}
+        if with_storm:
+            out["login"] = _summary(login_samples, login_statuses)
+        return out
+
+    return {"baseline": run(False), "storm": run(True)}
+
+
+def bench_job_queue(jobs: int = 2000, workers: int = 4, batch_size: int = 1,
+                    enqueue_samples: int = 200) -> dict:
+    """
+    Job queue throughput against the configured database: times single
+    enqueue+commit (what a request pays), bulk-loads `jobs` no-op jobs, then
+    drains them with `workers` worker threads (burst mode) and reports jobs/s.
+    Bench jobs are deleted afterwards.
+    """
+    from sqlalchemy import delete
+    from api import tasks  # noqa: F401  registers the "noop" handler
+    from api.jobs import enqueue, run_workers, PRIORITY_LOW
+    from api.models import Job
+
+    app = current_app._get_current_object()
+    kind = "noop"
+    try:
+        def one():
+            enqueue(kind, {"bench": True}, priority=PRIORITY_LOW)
+            db.session.commit()
+
+        enqueue_ms = _timeit(one, enqueue_samples)
+        remaining = max(0, jobs - enqueue_samples)
+        if remaining:
+            now = datetime.now()
+            db.session.execute(insert(Job), [
+                {"kind": kind, "payload": {"bench": True}, "priority": i % 10,
+                 "status": "queued", "attempts": 0, "maxAttempts": 1,
+                 "runAt": now, "createdAt": now}
+                for i in range(remaining)
+            ])
+            db.session.commit()
+
+        start = time.perf_counter()
+        pool = run_workers(app, concurrency=workers, kinds=[kind], burst=True,
+                           batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        done = sum(w.succeeded for w in pool)
+        return {
+            "jobs": done,
+            "workers": workers,
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 2),
+            "jobs_per_s": round(done / elapsed, 1) if elapsed else 0.0,
+            "failed": sum(w.failed for w in pool),
+            "enqueue_p50_ms": round(_percentile(enqueue_ms, 50), 2),
+            "enqueue_p99_ms": round(_percentile(enqueue_ms, 99), 2),
+        }
+    finally:
+        db.session.rollback()
+        db.session.execute(delete(Job).where(Job.kind == kind))
+        db.session.commit()
+
+
+def bench_recommendations(offers: int = 100_000, performers: int = 20_000,
+                          repeat: int = 200, k: int = 10) -> list[dict]:
+    """
+    Top-k latency of the recommendation scoring (api/recommend.py) over
+    synthetic feature arrays of the given sizes, plus the cost of an
+    incremental upsert. No database involved.
+    """
+    import numpy as np
+    from api import recommend as rec
+
+    rng = np.random.default_rng(42)
+
+    def synthetic(spec, n, money_col):
+        cols = {
+            "genre": rng.integers(-1, 12, n), "city": rng.integers(-1, 40, n),
+            "capacity": rng.uniform(30, 2000, n), "rating": rng.uniform(0.3, 1.0, n),
+            money_col: rng.uniform(100, 3000, n),
+        }
+        return rec._Table.from_arrays(spec, np.arange(1, n + 1), cols)
+
+    offer_table = synthetic(rec.OFFER_SPEC, offers, "budget")
+    performer_table = synthetic(rec.PERFORMER_SPEC, performers, "rate")
+    probe = {"genre": 3, "city": 7, "capacity": 250.0, "budget": 900.0, "rate": 600.0, "rating": 0.8}
+    exclude = list(range(1, 51))
+
+    def offers_for_performer():
+        ids, active, cols = offer_table.view()
+        rec.top_k(ids, active, offer_table.pos, rec.score_offers(probe, cols), k, exclude)
+
+    def performers_for_offer():
+        ids, active, cols = performer_table.view()
+        rec.top_k(ids, active, performer_table.pos, rec.score_performers(probe, cols), k, exclude)
+
+    next_id = [offers + 1]
+
+    def upsert_offer():
+        offer_table.upsert(next_id[0], {"genre": 1, "city": 2, "capacity": 100.0,
+                                         "budget": 500.0, "rating": 0.6})
+        next_id[0] += 1
+
+    results = []
+    for label, rows, fn in (("offers for performer", offers, offers_for_performer),
+                            ("performers for offer", performers, performers_for_offer),
+                            ("incremental upsert", 1, upsert_offer)):
+        fn()  # warm-up
+        timings = _timeit(fn, repeat)
+        results.append({
+            "query": label, "rows": rows, "k": k,
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p99_ms": round(_percentile(timings, 99), 3),
+        })
+    return results
@@ -0,0 +1,73 @@
+"""
+Tiny local pub/sub used to wake up chat long-polls / SSE streams.
+
+Each channel carries only a monotonically increasing sequence number (the
+latest messageId of an offer); subscribers re-read the rows themselves.
+
+- Inside one process a threading.Condition wakes waiters immediately.
+- Across gunicorn workers on the same host the latest seq is also written to
+  a small file per channel (BROKER_DIR, default <instance>/broker); waiters
+  poll its mtime every `poll_interval` seconds.
+
+It stands in for a real broker (Redis pub/sub, Postgres LISTEN/NOTIFY) and
+keeps the same publish/wait interface.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+from flask import current_app
+
+
+class LocalBroker:
+    def __init__(self, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._latest: dict[str, int] = {}
+
+    def _dir(self) -> Path:
+        base = os.getenv("BROKER_DIR") or os.path.join(current_app.instance_path, "broker")
+        path = Path(base)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _read_file(self, directory: Path, channel: str) -> int:
+        try:
+            return int((directory / channel).read_text() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def publish(self, channel: str, seq: int):
+        directory = self._dir()
+        tmp = directory / f".{channel}.{os.getpid()}.{threading.get_ident()}"
+        tmp.write_text(str(int(seq)))
+        os.replace(tmp, directory / channel)  # atomic on POSIX and Windows
+        with self._cond:
+            if seq > self._latest.get(channel, 0):
+                self._latest[channel] = seq
+            self._cond.notify_all()
+
+    def wait(self, channel: str, after: int, timeout: float) -> int | None:
+        """
+        Blocks until channel's seq > after or timeout elapses.
+        Returns the new seq, or None on timeout.
+        """
+        directory = self._dir()
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = max(self._latest.get(channel, 0), self._read_file(directory, channel))
+            if seq > after:
+                return seq
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            with self._cond:
+                self._cond.wait(min(self.poll_interval, remaining))
+
+
+broker = LocalBroker()
+
+
+def chat_channel(offer_id: int) -> str:
+    return f"offer-{int(offer_id)}"
@@ -0,0 +1,337 @@
+"""
+Response cache for the public, read-heavy endpoints.
+
+Backends (RESPONSE_CACHE_BACKEND):
+  - "lru"    (default) in-process LRU with TTL. Invalidation only reaches the
+             worker that handled the write; other workers rely on the TTL.
+  - "shared" SQLite file shared by every worker on the host
+             (RESPONSE_CACHE_PATH, default <instance>/response_cache.sqlite3).
+  - "none"   disables caching.
+
+Entries expire after RESPONSE_CACHE_TTL seconds (default 30) and write paths
+drop the affected keys explicitly through invalidate(). Concurrent misses on
+the same key are collapsed: one caller renders, the others wait for its result.
+
+Each entry also holds the @conditional fingerprint computed when it was
+rendered, so hits are revalidated (ETag / 304) without touching the database.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, request, Response
+
+from .replicas import on_primary
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl) -> bool:
+        """Stores only if absent (or expired). Returns True if stored."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] >= time.monotonic():
+                return False
+            self._data[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+
+class SQLiteCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        if random.random() < 0.01:
+            conn.execute("DELETE FROM cache WHERE expires < ?", (now,))
+
+    def add(self, key, value, ttl) -> bool:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("DELETE FROM cache WHERE key = ? AND expires < ?", (key, now))
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        return cur.rowcount == 1
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        # range scan on the primary key instead of LIKE
+        self._conn().execute(
+            "DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+        )
+
+
+class ResponseCache:
+    LOCK_TTL = 5.0       # a renderer that dies releases its key after this
+    WAIT_STEP = 0.02
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        # striped locks: collapse misses inside this worker without a lock per key
+        self._stripes = [threading.Lock() for _ in range(64)]
+
+    def get_or_render(self, key, render):
+        """
+        Returns the cached body for key, or calls render() -> bytes | None and
+        caches its result. None results (errors, 404s) are never cached.
+        """
+        hit = self.backend.get(key)
+        if hit is not None:
+            return hit, True
+
+        with self._stripes[zlib.crc32(key.encode()) % len(self._stripes)]:
+            hit = self.backend.get(key)
+            if hit is not None:
+                return hit, True
+
+            lock_key = f"lock:{key}"
+            if self.backend.add(lock_key, b"1", self.LOCK_TTL):
+                try:
+                    body = render()
+                    if body is not None:
+                        self.backend.set(key, body, self.ttl)
+                    return body, False
+                finally:
+                    self.backend.delete(lock_key)
+
+            # another worker is rendering it; wait for its result
+            deadline = time.monotonic() + self.LOCK_TTL
+            while time.monotonic() < deadline:
+                time.sleep(self.WAIT_STEP)
+                hit = self.backend.get(key)
+                if hit is not None:
+                    return hit, True
+            return render(), False
+
+    def invalidate(self, *keys, prefixes=()):
+        for key in keys:
+            self.backend.delete(key)
+        for prefix in prefixes:
+            self.backend.delete_prefix(prefix)
+
+
+_cache = None
+_perm_cache = None
+_cache_lock = threading.Lock()
+
+
+def _make_backend(size: int):
+    """LRUCache / SQLiteCache per RESPONSE_CACHE_BACKEND, or None when disabled."""
+    kind = os.getenv("RESPONSE_CACHE_BACKEND", "lru").strip().lower()
+    if kind == "none":
+        return None
+    if kind == "shared":
+        path = os.getenv("RESPONSE_CACHE_PATH") or os.path.join(
+            current_app.instance_path, "response_cache.sqlite3")
+        return SQLiteCache(path)
+    return LRUCache(size)
+
+
+def get_cache() -> ResponseCache | None:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = _make_backend(int(os.getenv("RESPONSE_CACHE_SIZE", "1024")))
+                ttl = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+                _cache = ResponseCache(backend, ttl) if backend else False
+    return _cache or None
+
+
+def get_permission_cache():
+    """
+    Small key/value backend for computed authorization decisions (b"1"/b"0").
+    Same backend kind as the response cache, separate LRU budget.
+    """
+    global _perm_cache
+    if _perm_cache is None:
+        with _cache_lock:
+            if _perm_cache is None:
+                _perm_cache = _make_backend(int(os.getenv("PERMISSION_CACHE_SIZE", "8192"))) or False
+    return _perm_cache or None
+
+
+def _pack(fingerprint, body: bytes) -> bytes:
+    """Cache entry: one JSON line with (seed, last_modified), then the body."""
+    seed, last = fingerprint or (None, None)
+    head = json.dumps([seed, last.isoformat() if last else None])
+    return head.encode() + b"\n" + body
+
+
+def _unpack(value: bytes):
+    """-> (fingerprint | None, body)"""
+    head, _, body = value.partition(b"\n")
+    seed, last = json.loads(head)
+    if seed is None:
+        return None, body
+    return (seed, datetime.fromisoformat(last) if last else None), body
+
+
+def cached(key_fn):
+    """
+    Caches a JSON view's 200 response body under key_fn(**view_args).
+    Adds X-Cache: HIT|MISS. Non-200 responses pass through uncached, and so
+    does every request for which key_fn returns None.
+
+    Put it under @conditional: the fingerprint of a miss is stored with the
+    body and handed back through wrapper.stored_fingerprint on later hits.
+    """
+    def decorator(view):
+        def stored_fingerprint(**kwargs):
+            cache = get_cache()
+            key = key_fn(**kwargs) if cache is not None else None
+            value = cache.backend.get(key) if key is not None else None
+            if value is None:
+                return None
+            fingerprint, _ = _unpack(value)
+            if fingerprint is not None:
+                # serve exactly this entry, so the body matches the ETag
+                request.environ["cache.entry"] = (key, value)
+            return fingerprint
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            key = key_fn(**kwargs) if cache is not None else None
+            if key is None:
+                return view(*args, **kwargs)
+
+            passthrough = []
+
+            def render():
+                with on_primary():  # shared by every reader: never from a lagging replica
+                    rv = current_app.make_response(view(*args, **kwargs))
+                if rv.status_code != 200:
+                    passthrough.append(rv)
+                    return None
+                return _pack(request.environ.get("conditional.fingerprint"), rv.get_data())
+
+            entry = request.environ.pop("cache.entry", None)
+            if entry is not None and entry[0] == key:
+                value, hit = entry[1], True
+            else:
+                value, hit = cache.get_or_render(key, render)
+            if passthrough:
+                return passthrough[0]
+            _, body = _unpack(value)
+            resp = Response(body, status=200, mimetype="application/json")
+            resp.headers["X-Cache"] = "HIT" if hit else "MISS"
+            return resp
+
+        wrapper.stored_fingerprint = stored_fingerprint
+        return wrapper
+    return decorator
+
+
+def invalidate(*keys, prefixes=()):
+    cache = get_cache()
+    if cache is not None:
+        cache.invalidate(*keys, prefixes=prefixes)
+
+
+def invalidate_chat_permissions(*offer_ids):
+    backend = get_permission_cache()
+    if backend is not None:
+        for offer_id in offer_ids:
+            backend.delete_prefix(chat_perm_prefix(offer_id))
+
+
+# Key builders shared by the cached views and the write paths
+def offer_key(offer_id):
+    return f"offer:{int(offer_id)}"
+
+def user_key(user_id):
+    return f"user:{int(user_id)}"
+
+def reviews_prefix(user_id):
+    return f"reviews:{int(user_id)}:"
+
+def reviews_key(user_id, fields):
+    # one entry per ?fields= variant (see fields_key()); writes drop them all by prefix
+    return None if fields is None else f"{reviews_prefix(user_id)}{fields}"
+
+def chat_perm_prefix(offer_id):
+    return f"chatperm:{int(offer_id)}:"
+
+def chat_perm_key(offer_id, user_id, role):
+    return f"{chat_perm_prefix(offer_id)}{int(user_id)}:{role}"
+
+OFFERS_LATEST = "offers:latest:"
+USERS_LATEST = "users:latest:"
+
+
+def latest_key(prefix, fields):
+    # normalised so ?limit=abc and ?limit= don't create new entries
+    if fields is None:
+        return None
+    role = (request.args.get("role") or "").strip().lower()[:20]
+    limit = (request.args.get("limit") or "").strip()[:3]
+    return f"{prefix}{role}:{limit}:{fields}"
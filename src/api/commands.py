@@ -17,18 +17,293 @@ def setup_commands(app):
     @app.cli.command("insert-test-users") # name of our command
     @click.argument("count") # argument of out command
     def insert_test_users(count):
+        from sqlalchemy import insert
+        from api.utils import hash_password
+
         print("Creating test users")
-        for x in range(1, int(count) + 1):
-            user = User()
-            user.email = "test_user" + str(x) + "@test.com"
-            user.password = "123456"
-            user.is_active = True
-            db.session.add(user)
-            db.session.commit()
-            print("User: ", user.email, " created.")
+        password = hash_password("123456")  # same password for all, hashed once
+        emails = ["test_user" + str(x) + "@test.com" for x in range(1, int(count) + 1)]
+        db.session.execute(insert(User), [
+            {"email": email, "password": password, "role": "performer",
+             "name": email.split("@")[0][:25], "city": "Madrid"}
+            for email in emails
+        ])
+        db.session.commit()
+        for email in emails:
+            print("User: ", email, " created.")
 
         print("All test users created")
 
+    """
+    Bulk-loads synthetic users/offers/matches/messages/reviews for load tests (api/datagen.py).
+    Every generated user logs in with the password in api.datagen.DATAGEN_PASSWORD.
+    $ flask insert-test-data --users 1000000 --offers 200000 --matches 5000000 --messages 20000000
+    """
     @app.cli.command("insert-test-data")
-    def insert_test_data():
-        pass
\ No newline at end of file
+    @click.option("--users", default=1000, show_default=True)
+    @click.option("--offers", default=200, show_default=True)
+    @click.option("--matches", default=5000, show_default=True)
+    @click.option("--messages", default=20000, show_default=True)
+    @click.option("--batch-size", default=10000, show_default=True, help="rows per INSERT/COPY and commit")
+    @click.option("--seed", default=42, show_default=True)
+    def insert_test_data(users, offers, matches, messages, batch_size, seed):
+        import time
+        from api.datagen import generate
+
+        started = time.perf_counter()
+
+        def progress(table, done):
+            elapsed = time.perf_counter() - started
+            print(f"{table:<10}{done:>12} rows  ({elapsed:.0f} s)")
+
+        counts = generate(users, offers, matches, messages, batch_size, seed, progress)
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        print(f"Inserted {total} rows in {elapsed:.1f} s ({total / elapsed:.0f} rows/s): "
+              + ", ".join(f"{table}={n}" for table, n in counts.items()))
+
+    """
+    Fails (exit code 1) if any hot query in api/query_plans.py is planned as a full table scan.
+    Run it after `flask db upgrade` against SQLite or Postgres: $ flask check-query-plans
+    """
+    @app.cli.command("check-query-plans")
+    def check_query_plans():
+        from api.query_plans import HOT_QUERIES, check_plans
+
+        failures = check_plans()
+        for label, steps in failures:
+            print("FULL SCAN:", label)
+            for step in steps:
+                print("   ", step)
+        if failures:
+            raise SystemExit(1)
+        print(f"All {len(HOT_QUERIES)} hot queries use an index")
+
+    """
+    Fails (exit code 1) if importing the serving app (wsgi.py) in a fresh interpreter is over the
+    import-time budget or pulls in an optional subsystem eagerly (api/startup.py).
+    $ flask check-startup --budget-ms 800 --repeat 5
+    """
+    @app.cli.command("check-startup")
+    @click.option("--budget-ms", default=None, type=float, help="default: STARTUP_BUDGET_MS or 800")
+    @click.option("--repeat", default=5, show_default=True)
+    def check_startup(budget_ms, repeat):
+        from api.startup import check_startup as check, STARTUP_BUDGET_MS
+
+        result, failures = check(budget_ms or STARTUP_BUDGET_MS, repeat)
+        print(f"import {result['module']}: median {result['median_ms']} ms, min {result['min_ms']} ms")
+        print("slowest top-level imports: " + ", ".join(f"{name} {ms} ms" for name, ms in result["slowest"]))
+        for failure in failures:
+            print("FAIL:", failure)
+        if failures:
+            raise SystemExit(1)
+        print("Startup within budget")
+
+    """
+    Rebuilds ratingAvg/ratingCount/ratingSum/ratingHist* for every user from the
+    reviews table with one grouped query. Use it to repair drift: $ flask rebuild-ratings
+    """
+    @app.cli.command("rebuild-ratings")
+    def rebuild_ratings():
+        from api.ratings import rebuild_ratings as rebuild
+
+        print(f"Rebuilt rating aggregates for {rebuild()} rated users")
+
+    """
+    Recomputes Offer.applicationsCount/messageCount/lastMessageAt and
+    User.eventsFinalised from matches, messages and offers, and rewrites the
+    rows that drifted: $ flask reconcile-counters [--dry-run]
+    """
+    @app.cli.command("reconcile-counters")
+    @click.option("--batch-size", default=5000, show_default=True)
+    @click.option("--dry-run", is_flag=True, help="only report the drift")
+    def reconcile_counters(batch_size, dry_run):
+        from api.counters import reconcile_counters as reconcile
+
+        drift = reconcile(batch_size, dry_run)
+        verb = "Found" if dry_run else "Fixed"
+        print(f"{verb} drift in {drift['offers']} offers and {drift['users']} users")
+
+    """
+    Microbenchmark: ORM serialize() vs column-projection serialization on a throwaway SQLite DB.
+    $ flask bench-serialize --rows 20000 --repeat 5
+    """
+    @app.cli.command("bench-serialize")
+    @click.option("--rows", default=5000, show_default=True)
+    @click.option("--repeat", default=5, show_default=True)
+    def bench_serialize(rows, repeat):
+        from api.benchmarks import bench_serialization
+
+        results = bench_serialization(rows, repeat)
+        print(f"{'model':<8}{'path':<16}{'rows':>8}{'median ms':>12}{'min ms':>10}")
+        for r in results:
+            print(f"{r['model']:<8}{r['path']:<16}{r['rows']:>8}{r['median_ms']:>12}{r['min_ms']:>10}")
+
+    """
+    Login storm benchmark: p50/p99 of /api/login and of an unrelated endpoint while logins saturate hashing.
+    $ flask bench-login --storm 16 --seconds 10
+    """
+    @app.cli.command("bench-login")
+    @click.option("--storm", default=16, show_default=True, help="concurrent login clients")
+    @click.option("--probes", default=2, show_default=True, help="concurrent clients on the probe endpoint")
+    @click.option("--seconds", default=10.0, show_default=True)
+    @click.option("--probe-path", default="/api/users?limit=20", show_default=True)
+    def bench_login(storm, probes, seconds, probe_path):
+        from api.benchmarks import bench_login_storm
+
+        results = bench_login_storm(storm, probes, seconds, probe_path)
+        for phase, endpoints in results.items():
+            for name, r in endpoints.items():
+                print(f"{phase:<9}{name:<7} n={r['requests']:<6} p50={r['p50_ms']:>8} ms"
+                      f"  p99={r['p99_ms']:>8} ms  {r['statuses']}")
+
+    """
+    Purges soft-deleted users (DELETE /users/<id> only tombstones them) in bounded batches,
+    printing progress. Safe to interrupt and re-run; --follow keeps it running as a worker.
+    $ flask purge-deleted-users --batch-size 500 --follow
+    """
+    @app.cli.command("purge-deleted-users")
+    @click.option("--batch-size", default=500, show_default=True, help="max rows per statement/transaction")
+    @click.option("--pause", default=0.0, show_default=True, help="seconds to sleep between batches")
+    @click.option("--follow", is_flag=True, help="keep polling for new tombstones")
+    @click.option("--interval", default=30.0, show_default=True, help="poll interval with --follow")
+    def purge_deleted_users(batch_size, pause, follow, interval):
+        import time
+        from api.purge import pending_user_ids, purge_user
+
+        def progress(user_id, step, n, total):
+            print(f"user {user_id}: {step:<16} -{n:<6} ({total} so far)")
+            if pause:
+                time.sleep(pause)
+
+        while True:
+            pending = pending_user_ids()
+            if pending:
+                print(f"{len(pending)} deleted user(s) to purge")
+            for user_id in pending:
+                done = purge_user(user_id, batch_size, progress)
+                print(f"user {user_id}: {'purged' if done else 'incomplete, will retry'}")
+            db.session.remove()
+            if not follow:
+                break
+            time.sleep(interval)
+
+    """
+    Background job worker (api/jobs.py). Runs until Ctrl+C; --burst exits once nothing is ready.
+    $ flask jobs-worker --concurrency 4 [--kind purge_user] [--burst]
+    """
+    @app.cli.command("jobs-worker")
+    @click.option("--concurrency", default=1, show_default=True, help="worker threads in this process")
+    @click.option("--kind", "kinds", multiple=True, help="only claim these job kinds (repeatable)")
+    @click.option("--poll", default=1.0, show_default=True, help="seconds between polls when idle")
+    @click.option("--batch-size", default=1, show_default=True, help="jobs claimed per round trip")
+    @click.option("--burst", is_flag=True, help="exit when the queue is drained")
+    def jobs_worker(concurrency, kinds, poll, batch_size, burst):
+        from api import tasks  # noqa: F401  registers the handlers
+        from api.jobs import run_workers
+
+        print(f"Starting {concurrency} worker(s) for {', '.join(kinds) if kinds else 'all kinds'}")
+        workers = run_workers(app, concurrency, kinds, burst, poll, batch_size)
+        print(f"Done: {sum(w.succeeded for w in workers)} succeeded, "
+              f"{sum(w.failed for w in workers)} failed")
+
+    """
+    Enqueues a job by hand, e.g. a full ratings rebuild: $ flask jobs-enqueue rebuild_ratings
+    """
+    @app.cli.command("jobs-enqueue")
+    @click.argument("kind")
+    @click.option("--payload", default="{}", help="JSON object passed to the handler as kwargs")
+    @click.option("--priority", default=5, show_default=True, help="0 = most urgent, 9 = bulk")
+    @click.option("--delay", default=0.0, show_default=True, help="seconds before it becomes ready")
+    def jobs_enqueue(kind, payload, priority, delay):
+        import json
+        from api.jobs import enqueue
+
+        job = enqueue(kind, json.loads(payload), priority=priority, delay=delay)
+        db.session.commit()
+        print(f"Enqueued job {job.jobId} ({kind})")
+
+    """
+    Job counts per kind and status: $ flask jobs-status
+    """
+    @app.cli.command("jobs-status")
+    def jobs_status():
+        from api.jobs import queue_stats
+
+        stats = queue_stats()
+        if not stats:
+            print("No jobs")
+        for kind, counts in sorted(stats.items()):
+            print(f"{kind:<20}" + "  ".join(f"{status}={n}" for status, n in sorted(counts.items())))
+
+    """
+    Job queue throughput: enqueue latency and drain rate with N worker threads.
+    $ flask bench-jobs --jobs 5000 --workers 4
+    """
+    @app.cli.command("bench-jobs")
+    @click.option("--jobs", default=2000, show_default=True)
+    @click.option("--workers", default=4, show_default=True)
+    @click.option("--batch-size", default=1, show_default=True)
+    def bench_jobs(jobs, workers, batch_size):
+        from api.benchmarks import bench_job_queue
+
+        r = bench_job_queue(jobs, workers, batch_size)
+        print(f"enqueue+commit p50={r['enqueue_p50_ms']} ms  p99={r['enqueue_p99_ms']} ms")
+        print(f"drained {r['jobs']} jobs with {r['workers']} worker(s) (batch {r['batch_size']}) "
+              f"in {r['seconds']} s: {r['jobs_per_s']} jobs/s, {r['failed']} failed")
+
+    """
+    Recommendation scoring latency over synthetic feature arrays (no DB needed).
+    $ flask bench-recommend --offers 100000 --performers 20000
+    """
+    @app.cli.command("bench-recommend")
+    @click.option("--offers", default=100_000, show_default=True)
+    @click.option("--performers", default=20_000, show_default=True)
+    @click.option("--repeat", default=200, show_default=True)
+    @click.option("--k", default=10, show_default=True)
+    def bench_recommend(offers, performers, repeat, k):
+        from api.benchmarks import bench_recommendations
+
+        for r in bench_recommendations(offers, performers, repeat, k):
+            print(f"{r['query']:<22}{r['rows']:>8} rows  k={r['k']:<4}"
+                  f"p50={r['p50_ms']:>8} ms  p99={r['p99_ms']:>8} ms")
+
+    """
+    Load benchmark: virtual users drive login/browse/search/apply/chat/review (api/loadtest.py)
+    and report throughput and p50/p95/p99 per endpoint. Results are saved as JSON for comparison.
+    Seed first with `flask insert-test-data`; the mix writes, so use a throwaway database.
+    $ flask bench-load --concurrency 32 --seconds 60 [--url http://localhost:3001] [--compare last]
+    """
+    @app.cli.command("bench-load")
+    @click.option("--concurrency", default=16, show_default=True, help="virtual users")
+    @click.option("--seconds", default=30.0, show_default=True, help="measured duration")
+    @click.option("--warmup", default=3.0, show_default=True, help="unmeasured ramp-up seconds")
+    @click.option("--seed", default=1, show_default=True)
+    @click.option("--mix", default=None, help='JSON weights, e.g. \'{"browse": 5, "chat_post": 1}\'')
+    @click.option("--url", default=None, help="drive a running server instead of the app in-process")
+    @click.option("--out", default=None, help="result file (default: BENCH_RESULTS_DIR/load-<time>.json)")
+    @click.option("--compare", default=None, help='saved result to compare against, or "last"')
+    def bench_load(concurrency, seconds, warmup, seed, mix, url, out, compare):
+        import json
+        from api.loadtest import run_load, save_results, load_results, compare_results
+
+        result = run_load(concurrency, seconds, warmup, seed, json.loads(mix) if mix else None, url)
+        print(f"{'endpoint':<30}{'requests':>9}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'errors':>8}  statuses")
+        for name, r in [*result["endpoints"].items(), ("total", result["total"])]:
+            print(f"{name:<30}{r['requests']:>9}{r['rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+                  f"{r['p99_ms']:>9}{r['errors']:>8}  {r['statuses']}")
+        path = save_results(result, out)
+        print(f"Saved {path}")
+
+        if compare:
+            before = load_results(compare, exclude=path)
+            print(f"Compared with the run of {before['startedAt']} ({before['target']}):")
+            for row in compare_results(before, result):
+                if "missing" in row:
+                    print(f"{row['endpoint']:<30}missing {row['missing']}")
+                    continue
+                print(f"{row['endpoint']:<30}" + "  ".join(
+                    f"{key} {row[key]['before']} -> {row[key]['after']}"
+                    + (f" ({row[key]['change_pct']:+}%)" if row[key]["change_pct"] is not None else "")
+                    for key in ("rps", "p50_ms", "p95_ms", "p99_ms")))
@@ -0,0 +1,85 @@
+"""
+Conditional GET (ETag / Last-Modified) for the JSON API.
+
+A view opts in with @conditional(fingerprint_fn). fingerprint_fn(**view_args)
+runs one cheap query (row version, count + max(updatedAt), max(id), ...) and
+returns (seed, last_modified) — or None to skip conditional handling (not
+found, forbidden, long-poll, ...), in which case the view runs as usual.
+
+The ETag is derived from the seed, the full request path and the caller's
+identity, never from the response body, so a 304 is answered before the view
+loads or serializes anything.
+
+Views that are also @cached (api/cache.py) keep the fingerprint next to the
+cached body: a cache hit, and the 304 it may turn into, costs no query at
+all, and the ETag always describes the body being served. fingerprint_fn
+only runs on a miss.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, current_app
+from flask_jwt_extended import get_jwt_identity
+
+
+def _identity():
+    try:
+        return get_jwt_identity() or ""
+    except Exception:
+        return ""
+
+
+def _as_utc(dt: datetime | None) -> datetime | None:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.replace(microsecond=0)
+
+
+def make_etag(seed) -> str:
+    raw = f"{request.full_path}|{_identity()}|{seed}"
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def conditional(fingerprint_fn):
+    def decorator(view):
+        stored_fingerprint = getattr(view, "stored_fingerprint", None)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            fp = stored_fingerprint(**kwargs) if stored_fingerprint else None
+            if fp is None:
+                fp = fingerprint_fn(**kwargs)
+                if fp is None:
+                    return view(*args, **kwargs)
+                # stored with the body if the view caches it
+                request.environ["conditional.fingerprint"] = fp
+
+            seed, last_modified = fp
+            etag = make_etag(seed)
+            last_modified = _as_utc(last_modified)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            elif request.if_modified_since and last_modified:
+                not_modified = last_modified <= request.if_modified_since
+            else:
+                not_modified = False
+
+            if not_modified:
+                resp = current_app.response_class(status=304)
+            else:
+                resp = current_app.make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+
+            resp.set_etag(etag)
+            if last_modified:
+                resp.last_modified = last_modified
+            resp.headers["Cache-Control"] = "no-cache"  # always revalidate
+            resp.vary.add("Authorization")
+            return resp
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+"""
+Denormalized counters kept in step with the write paths:
+  - Offer.applicationsCount  matches on the offer (apply, batch apply, purge)
+  - Offer.messageCount       chat messages on the offer (post message, purge)
+  - Offer.lastMessageAt      newest message's createdAt (post message)
+  - User.eventsFinalised     closed offers the performer was accepted for
+                             (conclude, accept on a closed offer, purge)
+
+Each helper is one UPDATE with column arithmetic, so concurrent writers
+never lose increments; none of them commits: callers run them in the same
+transaction as the row they describe, like api/ratings.py.
+
+A purge that deletes an offer's newest message leaves lastMessageAt behind,
+and a crash between statements is always possible; reconcile_counters()
+(`flask reconcile-counters` or a "reconcile_counters" job) recomputes
+everything from the source tables and rewrites only the rows that drifted.
+"""
+from collections import Counter
+
+from sqlalchemy import select, update, func, case
+
+from api.models import db, User, Offer, Match, Message
+from api import cache
+from api.cache import offer_key, user_key, OFFERS_LATEST, USERS_LATEST
+
+# Offer.status values that count as a performed event: POST /offers/<id>/conclude stores "closed"
+FINALISED_STATUSES = ("closed",)
+
+
+def add_applications(counts: dict[int, int]):
+    """counts: offerId -> delta (new matches, or minus deleted ones)."""
+    for offer_id, delta in counts.items():
+        if delta:
+            db.session.execute(
+                update(Offer)
+                .where(Offer.offerId == offer_id)
+                .values(applicationsCount=Offer.applicationsCount + delta)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def record_message(offer_id: int, created_at):
+    """
+    Counts one new message. Leaves updatedAt alone: chat activity is not an
+    offer edit and must not churn the offer ETags / response cache.
+    """
+    db.session.execute(
+        update(Offer)
+        .where(Offer.offerId == offer_id)
+        .values(
+            messageCount=Offer.messageCount + 1,
+            lastMessageAt=case((Offer.lastMessageAt >= created_at, Offer.lastMessageAt),
+                               else_=created_at),
+            updatedAt=Offer.updatedAt,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def remove_messages(counts: dict[int, int]):
+    """counts: offerId -> deleted messages. lastMessageAt is left to reconcile."""
+    for offer_id, n in counts.items():
+        db.session.execute(
+            update(Offer)
+            .where(Offer.offerId == offer_id)
+            .values(messageCount=Offer.messageCount - n, updatedAt=Offer.updatedAt)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def add_events_finalised(user_id: int | None, delta: int):
+    if user_id is None or not delta:
+        return
+    db.session.execute(
+        update(User)
+        .where(User.userId == user_id)
+        .values(eventsFinalised=func.coalesce(User.eventsFinalised, 0) + delta)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def move_event_finalised(from_id: int | None, to_id: int):
+    """Moves one finalised event between performers in a single UPDATE."""
+    if from_id is None:
+        return add_events_finalised(to_id, 1)
+    db.session.execute(
+        update(User)
+        .where(User.userId.in_((from_id, to_id)))
+        .values(eventsFinalised=func.coalesce(User.eventsFinalised, 0)
+                + case((User.userId == to_id, 1), else_=-1))
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def finalised_delta(old_status: str, new_status: str) -> int:
+    """+1 / -1 / 0 for the accepted performer when an offer moves between statuses."""
+    return (new_status in FINALISED_STATUSES) - (old_status in FINALISED_STATUSES)
+
+
+def _id_batches(pk, batch_size):
+    last = 0
+    while True:
+        ids = db.session.execute(
+            select(pk).where(pk > last).order_by(pk).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def _reconcile_offers(ids, dry_run):
+    stored = {oid: (apps, msgs, last) for oid, apps, msgs, last in db.session.execute(
+        select(Offer.offerId, Offer.applicationsCount, Offer.messageCount, Offer.lastMessageAt)
+        .where(Offer.offerId.in_(ids))
+    )}
+    apps = dict(db.session.execute(
+        select(Match.offerId, func.count()).where(Match.offerId.in_(ids)).group_by(Match.offerId)
+    ).all())
+    msgs = {oid: (n, last) for oid, n, last in db.session.execute(
+        select(Message.offerId, func.count(), func.max(Message.createdAt))
+        .where(Message.offerId.in_(ids)).group_by(Message.offerId)
+    )}
+    fixes = []
+    for oid, current in stored.items():
+        n, last = msgs.get(oid, (0, None))
+        actual = (apps.get(oid, 0), n, last)
+        if current != actual:
+            fixes.append({"offerId": oid, "applicationsCount": actual[0],
+                          "messageCount": actual[1], "lastMessageAt": actual[2]})
+    if fixes and not dry_run:
+        db.session.execute(update(Offer), fixes)
+    return [fix["offerId"] for fix in fixes]
+
+
+def _reconcile_users(ids, dry_run):
+    actual = dict(db.session.execute(
+        select(Offer.acceptedPerformerId, func.count())
+        .where(Offer.acceptedPerformerId.in_(ids), Offer.status.in_(FINALISED_STATUSES))
+        .group_by(Offer.acceptedPerformerId)
+    ).all())
+    fixes = [
+        {"userId": uid, "eventsFinalised": actual.get(uid, 0)}
+        for uid, stored in db.session.execute(
+            select(User.userId, User.eventsFinalised).where(User.userId.in_(ids))
+        )
+        if stored != actual.get(uid, 0)  # NULL (never maintained) counts as drift
+    ]
+    if fixes and not dry_run:
+        db.session.execute(update(User), fixes)
+    return [fix["userId"] for fix in fixes]
+
+
+def reconcile_counters(batch_size: int = 5000, dry_run: bool = False) -> dict:
+    """
+    Recomputes the counters from matches/messages/offers in batches of
+    `batch_size` rows (one grouped query per table per batch, one commit per
+    batch) and rewrites the rows that drifted. Returns the number of drifted
+    offers and users; with dry_run nothing is written.
+    """
+    drift = Counter()
+    for ids in _id_batches(Offer.offerId, batch_size):
+        fixed = _reconcile_offers(ids, dry_run)
+        drift["offers"] += len(fixed)
+        if fixed and not dry_run:
+            db.session.commit()
+            cache.invalidate(*(offer_key(oid) for oid in fixed), prefixes=(OFFERS_LATEST,))
+    for ids in _id_batches(User.userId, batch_size):
+        fixed = _reconcile_users(ids, dry_run)
+        drift["users"] += len(fixed)
+        if fixed and not dry_run:
+            db.session.commit()
+            cache.invalidate(*(user_key(uid) for uid in fixed), prefixes=(USERS_LATEST,))
+    db.session.rollback()
+    return {"offers": drift["offers"], "users": drift["users"]}
@@ -0,0 +1,300 @@
+"""
+Synthetic data generator for load tests (`flask insert-test-data`).
+
+Bulk-loads users, offers, matches, messages and reviews in the shape the
+app produces them: ~1 venue per 5 performers, offers spread over the last
+year in a handful of cities/genres, a few chat-approved applicants per
+offer, closed offers with an accepted performer and reviews both ways.
+Rating aggregates and the offer/user counters are rebuilt once at the end.
+
+Everything is derived from `seed`, so two runs with the same arguments on
+an empty database produce the same rows. Rows are streamed in chunks of
+`batch_size` and committed per chunk, so memory stays flat at any volume
+(1M users / 5M matches / 20M messages is a matter of time, not RAM):
+
+  - Postgres: COPY ... FROM STDIN (psycopg2 or psycopg 3), then the
+    serial sequences are moved past the explicit ids.
+  - anything else: one executemany INSERT per chunk.
+
+Every generated user shares DATAGEN_PASSWORD, hashed once, so the load
+benchmark can log in as any of them.
+"""
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, func, text
+
+from api.models import db, User, Offer, Match, Message, Review
+from api.ratings import rebuild_ratings
+from api.counters import reconcile_counters
+from api.utils import hash_password
+
+DATAGEN_PASSWORD = "loadtest-password"
+DATAGEN_EMAIL_DOMAIN = "loadtest.invalid"
+
+CITIES = ["Madrid", "Barcelona", "Valencia", "Sevilla", "Bilbao", "Zaragoza", "Málaga",
+          "Granada", "Murcia", "Palma", "Alicante", "Valladolid", "Vigo", "Gijón"]
+GENRES = ["rock", "jazz", "pop", "flamenco", "indie", "blues", "metal", "folk",
+          "electronic", "soul", "reggae", "classical"]
+WORDS = ("live music stage sound set band night crowd venue gig acoustic "
+         "drums guitar bass vocals encore tour rehearsal backline").split()
+
+# fractions of offers by final status; the rest stay open
+CLOSED_SHARE = 0.2
+CANCELLED_SHARE = 0.05
+# applicants per offer the venue opened a chat with
+APPROVED_PER_OFFER = 3
+
+USER_COLS = ("userId", "email", "password", "role", "name", "city", "createdAt", "updatedAt",
+             "ratingAvg", "ratingCount", "ratingSum", "ratingHist1", "ratingHist2",
+             "ratingHist3", "ratingHist4", "ratingHist5", "capacity", "genre", "slogan", "bio")
+OFFER_COLS = ("offerId", "distributorId", "title", "description", "city", "venueName", "genre",
+              "budget", "status", "eventDate", "capacity", "createdAt", "updatedAt",
+              "acceptedPerformerId")
+MATCH_COLS = ("matchId", "performerId", "offerId", "status", "rate", "chatApproved",
+              "message", "createdAt", "updatedAt")
+MESSAGE_COLS = ("messageId", "offerId", "authorId", "body", "createdAt")
+REVIEW_COLS = ("reviewId", "raterId", "ratedId", "offerId", "score", "comment", "createdAt")
+
+
+def _sentence(rnd, n):
+    return " ".join(rnd.choice(WORDS) for _ in range(n)).capitalize()
+
+
+def _spread(total, buckets, i):
+    """Share of `total` for bucket i when split as evenly as possible."""
+    return total // buckets + (1 if i < total % buckets else 0)
+
+
+class _Layout:
+    """
+    Id ranges and the deterministic offer -> venue / applicants mapping, so
+    matches, messages and reviews can be generated without keeping the
+    offers in memory.
+    """
+
+    def __init__(self, seed, users, offers, matches, base):
+        self.seed = seed
+        self.users = users
+        self.offers = offers
+        self.venues = max(1, users // 5)
+        self.performers = max(1, users - self.venues)
+        self.matches = matches
+        self.base = base  # table -> last existing id
+        self.per_offer = min(self.performers, -(-matches // offers)) if offers else 0
+
+    def user_id(self, i):
+        return self.base["user"] + 1 + i
+
+    def venue_id(self, i):
+        return self.user_id(i % self.venues)
+
+    def performer_id(self, i):
+        return self.user_id(self.venues + i % self.performers)
+
+    def offer_id(self, o):
+        return self.base["offers"] + 1 + o
+
+    def offer_rnd(self, o):
+        return random.Random(self.seed * 1_000_003 + o)
+
+    def offer_status(self, o):
+        r = self.offer_rnd(o).random()
+        if r < CLOSED_SHARE:
+            return "closed"
+        if r < CLOSED_SHARE + CANCELLED_SHARE:
+            return "cancelled"
+        return "open"
+
+    def distributor(self, o):
+        return self.venue_id(o * 7 + self.offer_rnd(o).randrange(self.venues))
+
+    def match_count(self, o):
+        return min(self.per_offer, _spread(self.matches, self.offers, o))
+
+    def applicants(self, o):
+        """Distinct performers applying to offer o; the first one is accepted if closed."""
+        start = (o * 2654435761) % self.performers
+        return [self.performer_id(start + j) for j in range(self.match_count(o))]
+
+
+def _last_ids():
+    return {
+        "user": db.session.scalar(select(func.max(User.userId))) or 0,
+        "offers": db.session.scalar(select(func.max(Offer.offerId))) or 0,
+        "matches": db.session.scalar(select(func.max(Match.matchId))) or 0,
+        "messages": db.session.scalar(select(func.max(Message.messageId))) or 0,
+        "reviews": db.session.scalar(select(func.max(Review.reviewId))) or 0,
+    }
+
+
+def _gen_users(layout, rnd, password, now):
+    for i in range(layout.users):
+        uid = layout.user_id(i)
+        venue = i < layout.venues
+        created = now - timedelta(days=rnd.uniform(30, 730))
+        yield (
+            uid, f"load{uid}@{DATAGEN_EMAIL_DOMAIN}", password,
+            "distributor" if venue else "performer",
+            f"{'Sala' if venue else 'Band'} {uid}"[:25], rnd.choice(CITIES), created, created,
+            0.0, 0, 0, 0, 0, 0, 0, 0,
+            rnd.randint(50, 1500) if venue else rnd.randint(1, 8),
+            rnd.choice(GENRES), _sentence(rnd, 5)[:140], _sentence(rnd, 40),
+        )
+
+
+def _gen_offers(layout, now):
+    for o in range(layout.offers):
+        rnd = layout.offer_rnd(o)
+        rnd.random()  # offer_status() draw
+        status = layout.offer_status(o)
+        created = now - timedelta(days=rnd.uniform(0, 365))
+        event = created + timedelta(days=rnd.uniform(7, 120))
+        applicants = layout.applicants(o)
+        accepted = applicants[0] if status == "closed" and applicants else None
+        yield (
+            layout.offer_id(o), layout.distributor(o), _sentence(rnd, 4)[:140], _sentence(rnd, 30),
+            rnd.choice(CITIES), f"Sala {o % 997}", rnd.choice(GENRES),
+            round(rnd.uniform(150, 3000), 2), status, event, rnd.randint(50, 1500),
+            created, created, accepted,
+        )
+
+
+def _gen_matches(layout, now):
+    mid = layout.base["matches"]
+    for o in range(layout.offers):
+        rnd = layout.offer_rnd(o)
+        closed = layout.offer_status(o) == "closed"
+        for j, performer in enumerate(layout.applicants(o)):
+            mid += 1
+            if closed:
+                status = "accepted" if j == 0 else "rejected"
+            else:
+                status = "rejected" if rnd.random() < 0.1 else "pending"
+            created = now - timedelta(days=rnd.uniform(0, 300))
+            yield (mid, performer, layout.offer_id(o), status, round(rnd.uniform(100, 2500), 2),
+                   j < APPROVED_PER_OFFER, _sentence(rnd, 8), created, created)
+
+
+def _gen_messages(layout, total, now):
+    mid = layout.base["messages"]
+    for o in range(layout.offers):
+        count = _spread(total, layout.offers, o)
+        if not count:
+            continue
+        rnd = layout.offer_rnd(o)
+        authors = [layout.distributor(o)] + layout.applicants(o)[:APPROVED_PER_OFFER]
+        at = now - timedelta(days=rnd.uniform(1, 200))
+        for _ in range(count):
+            mid += 1
+            at += timedelta(seconds=rnd.randint(5, 3600))
+            yield (mid, layout.offer_id(o), rnd.choice(authors), _sentence(rnd, rnd.randint(3, 25)), at)
+
+
+def _gen_reviews(layout, now):
+    rid = layout.base["reviews"]
+    for o in range(layout.offers):
+        if layout.offer_status(o) != "closed" or not layout.match_count(o):
+            continue
+        rnd = layout.offer_rnd(o)
+        venue, performer = layout.distributor(o), layout.applicants(o)[0]
+        for rater, rated in ((venue, performer), (performer, venue)):
+            if rnd.random() < 0.7:
+                rid += 1
+                yield (rid, rater, rated, layout.offer_id(o), rnd.choices(range(1, 6), (1, 1, 3, 6, 8))[0],
+                       _sentence(rnd, 12), now - timedelta(days=rnd.uniform(0, 100)))
+
+
+def _copy(table, cols, rows):
+    """COPY rows into table through the session's psycopg connection."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(["\\N" if v is None else v for v in row])
+    buf.seek(0)
+    quoted = ", ".join(f'"{c}"' for c in cols)
+    sql = f'COPY "{table}" ({quoted}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+    cursor = db.session.connection().connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buf)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+    finally:
+        cursor.close()
+
+
+def _load(model, cols, rows, batch_size, use_copy, progress):
+    table = model.__table__
+    done = 0
+    chunk = []
+
+    def flush():
+        if use_copy:
+            _copy(table.name, cols, chunk)
+        else:
+            db.session.execute(insert(table), [dict(zip(cols, row)) for row in chunk])
+        db.session.commit()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            flush()
+            done += len(chunk)
+            chunk = []
+            if progress:
+                progress(table.name, done)
+    if chunk:
+        flush()
+        done += len(chunk)
+        if progress:
+            progress(table.name, done)
+    return done
+
+
+def _bump_sequences():
+    """Explicit ids do not advance Postgres serial sequences; move them past max(id)."""
+    for model, pk in ((User, "userId"), (Offer, "offerId"), (Match, "matchId"),
+                      (Message, "messageId"), (Review, "reviewId")):
+        table = model.__table__.name
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', '{pk}'), "
+            f"(SELECT COALESCE(MAX(\"{pk}\"), 1) FROM \"{table}\"))"
+        ))
+    db.session.commit()
+
+
+def generate(users: int = 1000, offers: int = 200, matches: int = 5000, messages: int = 20000,
+             batch_size: int = 10000, seed: int = 42, progress=None) -> dict:
+    """
+    Appends the given volumes to the configured database (existing rows are
+    left alone; new ids start after the current maxima). progress(table,
+    rows_so_far) is called after each committed chunk. Returns rows per table.
+    """
+    if users < 2:
+        raise ValueError("need at least 2 users (a venue and a performer)")
+    use_copy = db.engine.dialect.name == "postgresql"
+    rnd = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    layout = _Layout(seed, users, offers, matches, _last_ids())
+    password = hash_password(DATAGEN_PASSWORD)
+
+    counts = {}
+    counts["user"] = _load(User, USER_COLS, _gen_users(layout, rnd, password, now),
+                           batch_size, use_copy, progress)
+    counts["offers"] = _load(Offer, OFFER_COLS, _gen_offers(layout, now),
+                             batch_size, use_copy, progress)
+    counts["matches"] = _load(Match, MATCH_COLS, _gen_matches(layout, now),
+                              batch_size, use_copy, progress)
+    counts["messages"] = _load(Message, MESSAGE_COLS, _gen_messages(layout, messages, now),
+                               batch_size, use_copy, progress)
+    counts["reviews"] = _load(Review, REVIEW_COLS, _gen_reviews(layout, now),
+                              batch_size, use_copy, progress)
+    if use_copy:
+        _bump_sequences()
+    rebuild_ratings()
+    reconcile_counters(batch_size)
+    return counts
@@ -0,0 +1,156 @@
+"""
+Full-text search over offers (title, description) and performer profiles
+(name, bio, slogan, genre).
+
+- SQLite: external-content FTS5 tables kept in sync by triggers.
+- Postgres: GIN expression indexes over to_tsvector(...); the index is
+  maintained by Postgres itself, queries must use the exact same expression.
+
+The migration e4c7f2a9b1d6 installs the same objects for existing databases;
+the listener below covers db.create_all() (AUTO_CREATE_DB=1).
+"""
+import re
+
+from sqlalchemy import event, select, text
+
+from api.models import db, User, Offer
+
+TS_CONFIG = "simple"  # language-neutral: offers are written in ES and EN
+
+OFFER_TSV = (
+    f"to_tsvector('{TS_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+PERFORMER_TSV = (
+    f"to_tsvector('{TS_CONFIG}', coalesce(name, '') || ' ' || coalesce(bio, '') || ' ' "
+    "|| coalesce(slogan, '') || ' ' || coalesce(genre, ''))"
+)
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS offers_fts USING fts5(
+        title, description, content='offers', content_rowid='offerId'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_ai AFTER INSERT ON offers BEGIN
+        INSERT INTO offers_fts(rowid, title, description)
+        VALUES (new."offerId", new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_ad AFTER DELETE ON offers BEGIN
+        INSERT INTO offers_fts(offers_fts, rowid, title, description)
+        VALUES ('delete', old."offerId", old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS offers_fts_au AFTER UPDATE OF title, description ON offers BEGIN
+        INSERT INTO offers_fts(offers_fts, rowid, title, description)
+        VALUES ('delete', old."offerId", old.title, old.description);
+        INSERT INTO offers_fts(rowid, title, description)
+        VALUES (new."offerId", new.title, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS performers_fts USING fts5(
+        name, bio, slogan, genre, content='user', content_rowid='userId'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO performers_fts(rowid, name, bio, slogan, genre)
+        VALUES (new."userId", new.name, new.bio, new.slogan, new.genre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO performers_fts(performers_fts, rowid, name, bio, slogan, genre)
+        VALUES ('delete', old."userId", old.name, old.bio, old.slogan, old.genre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS performers_fts_au AFTER UPDATE OF name, bio, slogan, genre ON "user" BEGIN
+        INSERT INTO performers_fts(performers_fts, rowid, name, bio, slogan, genre)
+        VALUES ('delete', old."userId", old.name, old.bio, old.slogan, old.genre);
+        INSERT INTO performers_fts(rowid, name, bio, slogan, genre)
+        VALUES (new."userId", new.name, new.bio, new.slogan, new.genre);
+    END""",
+    "INSERT INTO offers_fts(offers_fts) VALUES ('rebuild')",
+    "INSERT INTO performers_fts(performers_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_offers_fts ON offers USING GIN ({OFFER_TSV})",
+    f"CREATE INDEX IF NOT EXISTS ix_user_performer_fts ON \"user\" USING GIN ({PERFORMER_TSV}) "
+    "WHERE role = 'performer'",
+]
+
+
+def install(connection):
+    """Creates the FTS objects for the connection's dialect (idempotent)."""
+    name = connection.dialect.name
+    ddl = SQLITE_DDL if name == "sqlite" else POSTGRES_DDL if name == "postgresql" else []
+    for stmt in ddl:
+        connection.exec_driver_sql(stmt)
+
+
+@event.listens_for(db.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install(connection)
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_query(q: str) -> str | None:
+    """Turns free text into a safe FTS5 MATCH: every word required, last one as prefix."""
+    words = _WORD.findall(q or "")
+    if not words:
+        return None
+    quoted = [f'"{w}"' for w in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_offers(q: str, limit: int, offset: int):
+    """Offers ranked by relevance (best first)."""
+    if db.engine.dialect.name == "postgresql":
+        if not (q or "").strip():
+            return []
+        stmt = text(
+            f"SELECT offers.* FROM offers, websearch_to_tsquery('{TS_CONFIG}', :q) AS query "
+            f"WHERE {OFFER_TSV} @@ query "
+            f"ORDER BY ts_rank({OFFER_TSV}, query) DESC, offers.\"offerId\" "
+            "LIMIT :limit OFFSET :offset"
+        )
+        params = {"q": q}
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return []
+        stmt = text(
+            "SELECT offers.* FROM offers_fts JOIN offers ON offers.\"offerId\" = offers_fts.rowid "
+            "WHERE offers_fts MATCH :q ORDER BY bm25(offers_fts), offers.\"offerId\" "
+            "LIMIT :limit OFFSET :offset"
+        )
+        params = {"q": match}
+    params.update(limit=limit, offset=offset)
+    return db.session.execute(
+        select(Offer).from_statement(stmt), params
+    ).scalars().all()
+
+
+def search_performers(q: str, limit: int, offset: int):
+    """Performer profiles ranked by relevance (best first)."""
+    if db.engine.dialect.name == "postgresql":
+        if not (q or "").strip():
+            return []
+        stmt = text(
+            f"SELECT \"user\".* FROM \"user\", websearch_to_tsquery('{TS_CONFIG}', :q) AS query "
+            f"WHERE role = 'performer' AND \"deletedAt\" IS NULL AND {PERFORMER_TSV} @@ query "
+            f"ORDER BY ts_rank({PERFORMER_TSV}, query) DESC, \"user\".\"userId\" "
+            "LIMIT :limit OFFSET :offset"
+        )
+        params = {"q": q}
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return []
+        stmt = text(
+            "SELECT \"user\".* FROM performers_fts "
+            "JOIN \"user\" ON \"user\".\"userId\" = performers_fts.rowid "
+            "WHERE performers_fts MATCH :q AND \"user\".role = 'performer' "
+            "AND \"user\".\"deletedAt\" IS NULL "
+            "ORDER BY bm25(performers_fts), \"user\".\"userId\" "
+            "LIMIT :limit OFFSET :offset"
+        )
+        params = {"q": match}
+    params.update(limit=limit, offset=offset)
+    return db.session.execute(
+        select(User).from_statement(stmt), params
+    ).scalars().all()
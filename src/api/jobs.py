@@ -0,0 +1,246 @@
+"""
+Durable background jobs backed by the `jobs` table.
+
+Producers call enqueue() inside the request's own transaction, so a job
+exists if and only if the write that needed it committed. Workers
+(`flask jobs-worker`) claim ready jobs in (priority, runAt) order:
+
+  - Postgres: SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never
+    wait on or double-claim the same row.
+  - SQLite (and anything else): one conditional UPDATE ... WHERE
+    status = 'queued' per candidate; an UPDATE that touched no row means
+    another worker got there first.
+
+Attempts are counted at claim time. A failing job is retried with
+exponential backoff (JOB_BACKOFF_BASE * 2^(attempt-1) seconds, capped at
+JOB_BACKOFF_MAX, with jitter) until maxAttempts, then kept as 'failed' with
+its lastError. Jobs whose worker died mid-run are requeued after
+JOB_LOCK_TIMEOUT seconds, so handlers must be idempotent.
+
+Handlers are registered with @task("kind") (see api/tasks.py) and receive
+the payload as keyword arguments.
+"""
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.exc import OperationalError
+
+from api.models import db, Job
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+JOB_LOCK_TIMEOUT = float(os.getenv("JOB_LOCK_TIMEOUT", "600"))
+JOB_BACKOFF_BASE = float(os.getenv("JOB_BACKOFF_BASE", "5"))
+JOB_BACKOFF_MAX = float(os.getenv("JOB_BACKOFF_MAX", "900"))
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "86400"))  # seconds finished jobs are kept
+
+_handlers = {}
+
+
+def task(kind: str):
+    """Registers the decorated function as the handler for `kind`."""
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def enqueue(kind: str, payload: dict | None = None, priority: int = PRIORITY_NORMAL,
+            delay: float = 0.0, max_attempts: int = 5) -> Job:
+    """Adds a job to the current session; workers see it once the caller commits."""
+    job = Job(kind=kind, payload=payload or {}, priority=priority, maxAttempts=max_attempts,
+              runAt=datetime.now() + timedelta(seconds=delay))
+    db.session.add(job)
+    return job
+
+
+def _ready(now, limit, kinds=None):
+    q = select(Job.jobId).where(Job.status == "queued", Job.runAt <= now)
+    if kinds:
+        q = q.where(Job.kind.in_(kinds))
+    return q.order_by(Job.priority, Job.runAt).limit(limit)
+
+
+def claim(worker_id: str, limit: int = 1, kinds=None) -> list[int]:
+    """Marks up to `limit` ready jobs as running for worker_id; returns their ids."""
+    now = datetime.now()
+    claimed = dict(status="running", lockedAt=now, lockedBy=worker_id,
+                   attempts=Job.attempts + 1)
+    try:
+        if db.engine.dialect.name == "postgresql":
+            ids = db.session.execute(
+                _ready(now, limit, kinds).with_for_update(skip_locked=True)
+            ).scalars().all()
+            if ids:
+                db.session.execute(update(Job).where(Job.jobId.in_(ids)).values(**claimed))
+        else:
+            ids = []
+            # over-fetch a little: some candidates may be taken by other workers
+            for job_id in db.session.execute(_ready(now, limit * 4, kinds)).scalars().all():
+                res = db.session.execute(
+                    update(Job).where(Job.jobId == job_id, Job.status == "queued").values(**claimed)
+                )
+                if res.rowcount:
+                    ids.append(job_id)
+                    if len(ids) >= limit:
+                        break
+        db.session.commit()
+    except OperationalError:
+        # SQLite writer contention ("database is locked"): try again next poll
+        db.session.rollback()
+        return []
+    return ids
+
+
+def _finish(job_id: int, error: str | None):
+    now = datetime.now()
+    if error is None:
+        values = dict(status="done", finishedAt=now, lastError=None)
+    else:
+        attempts, max_attempts = db.session.execute(
+            select(Job.attempts, Job.maxAttempts).where(Job.jobId == job_id)
+        ).one()
+        if attempts >= max_attempts:
+            values = dict(status="failed", finishedAt=now, lastError=error)
+        else:
+            backoff = min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * 2 ** (attempts - 1))
+            values = dict(status="queued", lastError=error,
+                          runAt=now + timedelta(seconds=backoff * random.uniform(0.5, 1.0)))
+    db.session.execute(
+        update(Job).where(Job.jobId == job_id).values(lockedAt=None, lockedBy=None, **values)
+    )
+    db.session.commit()
+
+
+def run_job(job_id: int) -> bool:
+    """Runs one claimed job and records the outcome. Returns True on success."""
+    kind, payload = db.session.execute(
+        select(Job.kind, Job.payload).where(Job.jobId == job_id)
+    ).one()
+    db.session.commit()  # the handler starts from a clean transaction
+    try:
+        handler = _handlers.get(kind)
+        if handler is None:
+            raise LookupError(f"no handler registered for job kind '{kind}'")
+        handler(**(payload or {}))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _finish(job_id, traceback.format_exc(limit=5)[-4000:])
+        return False
+    _finish(job_id, None)
+    return True
+
+
+def requeue_stale() -> int:
+    """Puts back jobs locked for longer than JOB_LOCK_TIMEOUT (their worker died)."""
+    cutoff = datetime.now() - timedelta(seconds=JOB_LOCK_TIMEOUT)
+    res = db.session.execute(
+        update(Job).where(Job.status == "running", Job.lockedAt < cutoff)
+        .values(status="queued", lockedAt=None, lockedBy=None)
+    )
+    db.session.commit()
+    return res.rowcount
+
+
+def prune_finished() -> int:
+    cutoff = datetime.now() - timedelta(seconds=JOB_RETENTION)
+    res = db.session.execute(
+        delete(Job).where(Job.status == "done", Job.finishedAt < cutoff)
+    )
+    db.session.commit()
+    return res.rowcount
+
+
+def queue_stats() -> dict:
+    """{kind: {status: count}} over the whole table."""
+    out = {}
+    rows = db.session.execute(
+        select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)
+    ).all()
+    for kind, status, n in rows:
+        out.setdefault(kind, {})[status] = n
+    return out
+
+
+class Worker:
+    """
+    One claiming loop. Several can run as threads of one process
+    (run_workers) and/or as separate processes on any number of hosts.
+    """
+    MAINTENANCE_EVERY = 60.0
+
+    def __init__(self, app, name: str | None = None, kinds=None,
+                 poll_interval: float = 1.0, batch_size: int = 1):
+        self.app = app
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = list(kinds) if kinds else None
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.succeeded = 0
+        self.failed = 0
+
+    def run(self, stop: threading.Event, burst: bool = False):
+        """Processes jobs until stop is set (or, with burst, until none are ready)."""
+        with self.app.app_context():
+            next_maintenance = 0.0
+            try:
+                while not stop.is_set():
+                    ids = claim(self.name, self.batch_size, self.kinds)
+                    for job_id in ids:
+                        if run_job(job_id):
+                            self.succeeded += 1
+                        else:
+                            self.failed += 1
+                    if ids:
+                        continue
+                    if burst:
+                        break
+                    now = datetime.now().timestamp()
+                    if now >= next_maintenance:
+                        requeue_stale()
+                        prune_finished()
+                        next_maintenance = now + self.MAINTENANCE_EVERY
+                    stop.wait(self.poll_interval)
+            finally:
+                db.session.remove()
+
+
+def run_workers(app, concurrency: int = 1, kinds=None, burst: bool = False,
+                poll_interval: float = 1.0, batch_size: int = 1, stop: threading.Event | None = None):
+    """Runs `concurrency` worker threads until Ctrl+C (or until drained with burst)."""
+    stop = stop or threading.Event()
+    base = f"{socket.gethostname()}:{os.getpid()}"
+    workers = [Worker(app, f"{base}:{i}", kinds, poll_interval, batch_size)
+               for i in range(concurrency)]
+    threads = [threading.Thread(target=w.run, args=(stop, burst), daemon=True) for w in workers]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            while t.is_alive():
+                t.join(0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        for t in threads:
+            t.join()
+    return workers
+
+
+def start_background_worker(app, poll_interval: float = 5.0, kinds=None) -> threading.Event:
+    """
+    Runs one Worker as a daemon thread of the current process: gunicorn.conf.py
+    starts one in every web worker (JOBS_IN_WEB), so jobs run even where no
+    separate worker service is deployed. Set the returned event to stop it.
+    """
+    stop = threading.Event()
+    worker = Worker(app, kinds=kinds, poll_interval=poll_interval)
+    threading.Thread(target=worker.run, args=(stop,), daemon=True, name="jobs-worker").start()
+    return stop
@@ -0,0 +1,326 @@
+"""
+Load benchmark (`flask bench-load`): virtual users drive the real routes
+with a weighted mix of login, browse, search, apply, chat and review
+traffic, and every request is timed per endpoint.
+
+Targets either the app in-process (one WSGI app, many threads, like a
+gthread worker; default) or a running server via --url. Either way the
+fixtures (users, offers, chats) are read from the configured database, so
+point both at the same one, seeded with `flask insert-test-data`. The mix
+writes (applications, messages, reviews): use a throwaway database. All
+virtual users share one client IP, so expect 429s on login unless rate
+limiting is off (RATE_LIMIT_BACKEND=none).
+
+Results are saved as JSON (BENCH_RESULTS_DIR, default <instance>/bench) so
+runs can be compared with --compare.
+"""
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from flask import current_app
+from sqlalchemy import select
+
+from api.benchmarks import _percentile
+from api.datagen import DATAGEN_EMAIL_DOMAIN, DATAGEN_PASSWORD, CITIES, GENRES
+from api.models import db, User, Offer, Match
+
+# relative weights of the actions each virtual user picks from
+DEFAULT_MIX = {
+    "browse": 30,
+    "search": 15,
+    "offer": 15,
+    "users": 5,
+    "chat_read": 15,
+    "chat_post": 8,
+    "apply": 8,
+    "review": 2,
+    "login": 2,
+}
+
+FIXTURE_USERS = 2000
+
+
+class _InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        res = self.client.open(path, method=method, json=body, headers=headers)
+        return res.status_code, res.get_json(silent=True)
+
+
+class _HttpClient:
+    """One keep-alive connection per virtual user."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.factory = (http.client.HTTPSConnection if parts.scheme == "https"
+                        else http.client.HTTPConnection)
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.conn = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            if self.conn is None:
+                self.conn = self.factory(self.netloc, timeout=60)
+            self.conn.request(method, self.prefix + path, payload, headers)
+            res = self.conn.getresponse()
+            data = res.read()
+        except (OSError, http.client.HTTPException):
+            self.conn = None
+            return 0, None  # reported as status 0
+        try:
+            return res.status, json.loads(data) if data else None
+        except ValueError:
+            return res.status, None
+
+
+def _fixtures(users: int):
+    """Generated performers, their approved chats and closed offers, and open offers."""
+    chats, reviews = {}, {}
+    rows = db.session.execute(
+        select(User.userId, User.email)
+        .where(User.role == "performer", User.deletedAt.is_(None),
+               User.email.like(f"%@{DATAGEN_EMAIL_DOMAIN}"))
+        .order_by(User.userId).limit(users)
+    ).all()
+    performers = dict(rows)
+    if performers:
+        ids = list(performers)
+        for perf_id, offer_id in db.session.execute(
+            select(Match.performerId, Match.offerId)
+            .where(Match.performerId.in_(ids), Match.chatApproved.is_(True))
+        ).all():
+            chats.setdefault(perf_id, []).append(offer_id)
+        for perf_id, offer_id, venue_id in db.session.execute(
+            select(Offer.acceptedPerformerId, Offer.offerId, Offer.distributorId)
+            .where(Offer.acceptedPerformerId.in_(ids), Offer.status == "closed")
+        ).all():
+            reviews.setdefault(perf_id, []).append((offer_id, venue_id))
+    open_offers = db.session.execute(
+        select(Offer.offerId).where(Offer.status == "open")
+        .order_by(Offer.offerId.desc()).limit(5000)
+    ).scalars().all()
+    db.session.remove()
+    return performers, chats, reviews, open_offers
+
+
+class _VirtualUser:
+    def __init__(self, client, rnd, user_id, email, chats, reviews, open_offers, record):
+        self.client = client
+        self.rnd = rnd
+        self.user_id = user_id
+        self.email = email
+        self.chats = chats
+        self.reviews = reviews
+        self.open_offers = open_offers
+        self.record = record
+        self.token = None
+        self.seen = {}  # offerId -> last messageId read
+
+    def call(self, name, method, path, body=None):
+        start = time.perf_counter()
+        status, data = self.client.request(method, path, body, self.token)
+        self.record(name, (time.perf_counter() - start) * 1000, status)
+        return status, data
+
+    def login(self):
+        status, data = self.call("POST /login", "POST", "/api/login",
+                                 {"email": self.email, "password": DATAGEN_PASSWORD})
+        if status == 200:
+            self.token = data["token"]
+
+    def browse(self):
+        self.call("GET /offers", "GET", "/api/offers?limit=20&fields=offerId,title,city,genre,eventDate")
+
+    def search(self):
+        r = self.rnd
+        self.call("GET /offers/search", "GET",
+                  f"/api/offers/search?status=open&city={r.choice(CITIES)}"
+                  f"&genre={r.choice(GENRES)}&limit=20")
+
+    def offer(self):
+        if self.open_offers:
+            self.call("GET /offers/<id>", "GET", f"/api/offers/{self.rnd.choice(self.open_offers)}")
+
+    def users(self):
+        self.call("GET /users/latest", "GET", "/api/users/latest?role=performer&limit=6")
+
+    def chat_read(self):
+        if not self.chats:
+            return self.browse()
+        offer_id = self.rnd.choice(self.chats)
+        since = self.seen.get(offer_id)
+        path = f"/api/offers/{offer_id}/messages" + (f"?since={since}" if since is not None else "")
+        status, data = self.call("GET /offers/<id>/messages", "GET", path)
+        if status == 200 and data:
+            self.seen[offer_id] = max(m["messageId"] for m in data)
+        elif status == 200:
+            self.seen.setdefault(offer_id, 0)
+
+    def chat_post(self):
+        if not self.chats:
+            return self.browse()
+        self.call("POST /offers/<id>/messages", "POST",
+                  f"/api/offers/{self.rnd.choice(self.chats)}/messages",
+                  {"body": f"load test message {self.rnd.random():.6f}"})
+
+    def apply(self):
+        if self.open_offers:
+            self.call("POST /offers/<id>/apply", "POST",
+                      f"/api/offers/{self.rnd.choice(self.open_offers)}/apply",
+                      {"rate": self.rnd.randint(100, 2500), "message": "load test"})
+
+    def review(self):
+        if not self.reviews:
+            return self.browse()
+        offer_id, venue_id = self.rnd.choice(self.reviews)
+        # 201 the first time, 409 afterwards: both are served requests
+        self.call("POST /reviews", "POST", "/api/reviews",
+                  {"raterId": self.user_id, "ratedId": venue_id, "offerId": offer_id,
+                   "score": self.rnd.randint(3, 5), "comment": "load test"})
+
+
+def run_load(concurrency: int = 16, seconds: float = 30.0, warmup: float = 3.0, seed: int = 1,
+             mix: dict | None = None, base_url: str | None = None) -> dict:
+    """
+    Runs `concurrency` virtual users for warmup + seconds and returns the
+    result document: config, overall and per-endpoint throughput, p50/p95/p99
+    and status counts. Requests finishing during warm-up are not counted.
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    app = current_app._get_current_object()
+    performers, chats, reviews, open_offers = _fixtures(max(concurrency, FIXTURE_USERS))
+    if not performers:
+        raise RuntimeError("no generated users found: run `flask insert-test-data` first")
+
+    rnd = random.Random(seed)
+    # prefer performers with an open chat, so chat traffic has somewhere to go
+    pool = sorted(performers, key=lambda uid: (uid not in chats, uid))
+    picked = [pool[i % len(pool)] for i in range(concurrency)]
+
+    lock = threading.Lock()
+    samples, statuses = {}, {}
+    measuring = threading.Event()
+    stop = threading.Event()
+
+    def record(name, ms, status):
+        if not measuring.is_set():
+            return
+        with lock:
+            samples.setdefault(name, []).append(ms)
+            counts = statuses.setdefault(name, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    actions, weights = zip(*mix.items())
+
+    def loop(vu):
+        vu.login()
+        while not stop.is_set():
+            action = vu.rnd.choices(actions, weights)[0]
+            if action == "login" or vu.token is None:
+                vu.login()
+            else:
+                getattr(vu, action)()
+
+    vusers = [
+        _VirtualUser(_HttpClient(base_url) if base_url else _InProcessClient(app),
+                     random.Random(rnd.random()), uid, performers[uid],
+                     chats.get(uid, []), reviews.get(uid, []), open_offers, record)
+        for uid in picked
+    ]
+    threads = [threading.Thread(target=loop, args=(vu,), daemon=True) for vu in vusers]
+    for t in threads:
+        t.start()
+    time.sleep(warmup)
+    measuring.set()
+    start = time.perf_counter()
+    time.sleep(seconds)
+    measuring.clear()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in threads:
+        t.join()
+
+    def summary(timings, counts):
+        return {
+            "requests": len(timings),
+            "rps": round(len(timings) / elapsed, 1),
+            "p50_ms": round(_percentile(timings, 50), 2),
+            "p95_ms": round(_percentile(timings, 95), 2),
+            "p99_ms": round(_percentile(timings, 99), 2),
+            "errors": sum(n for status, n in counts.items() if status == 0 or status >= 500),
+            "statuses": {str(status): n for status, n in sorted(counts.items())},
+        }
+
+    all_samples = [ms for timings in samples.values() for ms in timings]
+    all_statuses = {}
+    for counts in statuses.values():
+        for status, n in counts.items():
+            all_statuses[status] = all_statuses.get(status, 0) + n
+    return {
+        "startedAt": datetime.now().isoformat(timespec="seconds"),
+        "target": base_url or "in-process",
+        "database": db.engine.dialect.name,
+        "config": {"concurrency": concurrency, "seconds": seconds, "warmup": warmup,
+                   "seed": seed, "mix": mix},
+        "seconds": round(elapsed, 2),
+        "total": summary(all_samples, all_statuses),
+        "endpoints": {name: summary(samples[name], statuses[name]) for name in sorted(samples)},
+    }
+
+
+def results_dir() -> Path:
+    return Path(os.getenv("BENCH_RESULTS_DIR") or Path(current_app.instance_path) / "bench")
+
+
+def save_results(result: dict, out: str | None = None) -> Path:
+    """Writes the result document to `out` or a timestamped file in results_dir()."""
+    path = Path(out) if out else results_dir() / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2))
+    return path
+
+
+def load_results(ref: str, exclude: Path | None = None) -> dict:
+    """Reads a saved result; ref "last" is the newest file in results_dir() other than exclude."""
+    if ref == "last":
+        runs = sorted(p for p in results_dir().glob("load-*.json") if p != exclude)
+        if not runs:
+            raise FileNotFoundError(f"no saved runs in {results_dir()}")
+        ref = runs[-1]
+    return json.loads(Path(ref).read_text())
+
+
+def compare_results(before: dict, after: dict) -> list[dict]:
+    """Per endpoint (and "total"): rps and p50/p95/p99 before -> after with % change."""
+    def pct(a, b):
+        return round((b - a) / a * 100, 1) if a else None
+
+    rows = []
+    names = ["total"] + sorted(set(before["endpoints"]) | set(after["endpoints"]))
+    for name in names:
+        a = before["total"] if name == "total" else before["endpoints"].get(name)
+        b = after["total"] if name == "total" else after["endpoints"].get(name)
+        if not a or not b:
+            rows.append({"endpoint": name, "missing": "before" if not a else "after"})
+            continue
+        rows.append({"endpoint": name, **{
+            key: {"before": a[key], "after": b[key], "change_pct": pct(a[key], b[key])}
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+        }})
+    return rows
@@ -0,0 +1,329 @@
+"""
+Request and SQL instrumentation, exposed in Prometheus text format at /metrics.
+
+Per request (keyed by the Flask endpoint, e.g. "api.get_offers"):
+  - http_request_duration_seconds{endpoint,method,status}  histogram
+  - http_request_db_seconds{endpoint}                       histogram, time in SQL
+  - http_request_db_queries{endpoint}                       histogram, statements
+  - http_requests_in_flight                                 gauge
+and per process, for each engine ("primary", "replica1", ...):
+  - db_pool_checkout_seconds{engine}                        histogram, pool waits
+  - db_pool_checked_out{engine} / db_pool_size{engine}      gauges
+
+SQL time and counts come from the before/after_cursor_execute engine events;
+pool waits from timing the pool's connect(). Requests dispatched inside
+another one (POST /api/batch) count for both.
+
+Aggregation across gunicorn workers works like the chat broker: each process
+keeps its metrics in memory and writes a snapshot to METRICS_DIR/<pid>.json
+(default <instance>/metrics) at most every METRICS_FLUSH_INTERVAL seconds
+and at exit. A scrape, whichever worker serves it, merges its live values
+with every other snapshot: counters and histograms of exited workers are
+kept (so totals never go backwards), gauges only count live processes.
+Clear METRICS_DIR when deploying if old totals should not carry over.
+It stands in for prometheus_client's multiprocess mode without the
+dependency. METRICS_ENABLED=0 turns everything off.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.models import db
+from api.replicas import engine_label
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+POOL_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "http_request_duration_seconds": ("histogram", "Request latency until the response is ready.",
+                                      LATENCY_BUCKETS),
+    "http_request_db_seconds": ("histogram", "Time spent executing SQL per request.",
+                                LATENCY_BUCKETS),
+    "http_request_db_queries": ("histogram", "SQL statements executed per request.", QUERY_BUCKETS),
+    "http_requests_in_flight": ("gauge", "Requests currently being handled.", None),
+    "db_pool_checkout_seconds": ("histogram", "Time waiting for a pooled DB connection.",
+                                 POOL_BUCKETS),
+    "db_pool_checked_out": ("gauge", "Pooled DB connections currently checked out.", None),
+    "db_pool_size": ("gauge", "Configured DB connection pool size.", None),
+}
+
+
+class Registry:
+    """In-memory counters for one process; snapshots are plain JSON."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hist = {}    # (name, labels) -> [per-bucket counts..., +Inf count, sum]
+        self._gauges = {}  # (name, labels) -> value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        with self._lock:
+            h = self._hist.get((name, labels))
+            if h is None:
+                h = self._hist[(name, labels)] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    h[i] += 1
+                    break
+            else:
+                h[len(buckets)] += 1
+            h[-1] += value
+
+    def add(self, name, labels, delta):
+        with self._lock:
+            self._gauges[(name, labels)] = self._gauges.get((name, labels), 0) + delta
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self._gauges[(name, labels)] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "histograms": [[n, list(l), list(h)] for (n, l), h in self._hist.items()],
+                "gauges": [[n, list(l), v] for (n, l), v in self._gauges.items()],
+            }
+
+
+registry = Registry()
+_local = threading.local()
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def _frames():
+    stack = getattr(_local, "frames", None)
+    if stack is None:
+        stack = _local.frames = []
+    return stack
+
+
+# ---- SQL ------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    frames = getattr(_local, "frames", None)
+    if start is None or not frames:
+        return
+    elapsed = time.perf_counter() - start
+    for frame in frames:
+        frame["db_seconds"] += elapsed
+        frame["db_queries"] += 1
+
+
+def _instrument_pool(engine, label):
+    """Wraps engine.pool.connect() to time checkouts (again after a dispose())."""
+    pool = engine.pool
+    if getattr(pool, "_metrics_timed", False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            registry.observe("db_pool_checkout_seconds", (label,), time.perf_counter() - start)
+
+    pool.connect = timed_connect
+    pool._metrics_timed = True
+
+
+def _pool_gauges():
+    try:
+        engines = db.engines
+    except RuntimeError:  # no app context
+        return
+    for key, engine in engines.items():
+        pool, label = engine.pool, (engine_label(key),)
+        if hasattr(pool, "checkedout"):
+            registry.set("db_pool_checked_out", label, pool.checkedout())
+        if hasattr(pool, "size"):
+            registry.set("db_pool_size", label, pool.size())
+
+
+# ---- requests ---------------------------------------------------------------
+
+def _before_request():
+    for key, engine in db.engines.items():
+        _instrument_pool(engine, engine_label(key))
+    frame = {"start": time.perf_counter(), "db_seconds": 0.0, "db_queries": 0}
+    request.environ["metrics.frame"] = frame
+    _frames().append(frame)
+    registry.add("http_requests_in_flight", (), 1)
+
+
+def _after_request(response):
+    frame = request.environ.get("metrics.frame")
+    if frame is not None:
+        endpoint = request.endpoint or "<unmatched>"
+        registry.observe("http_request_duration_seconds",
+                         (endpoint, request.method, str(response.status_code)),
+                         time.perf_counter() - frame["start"])
+        registry.observe("http_request_db_seconds", (endpoint,), frame["db_seconds"])
+        registry.observe("http_request_db_queries", (endpoint,), frame["db_queries"])
+    return response
+
+
+def _teardown_request(exc):
+    frame = request.environ.pop("metrics.frame", None)
+    if frame is None:
+        return
+    stack = _frames()
+    for i, f in enumerate(stack):
+        if f is frame:
+            del stack[i]
+            break
+    registry.add("http_requests_in_flight", (), -1)
+    if time.monotonic() - _last_flush >= METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+# ---- cross-process aggregation ----------------------------------------------
+
+def _dir() -> Path:
+    base = os.getenv("METRICS_DIR") or os.path.join(current_app.instance_path, "metrics")
+    path = Path(base)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def flush(directory: Path | None = None):
+    """Writes this process's snapshot; atomic like broker.publish()."""
+    global _last_flush
+    if not _flush_lock.acquire(blocking=False):
+        return  # another thread of this process is already writing it
+    try:
+        directory = directory or _dir()
+        _pool_gauges()
+        tmp = directory / f".{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(registry.snapshot()))
+        os.replace(tmp, directory / f"{os.getpid()}.json")
+        _last_flush = time.monotonic()
+    finally:
+        _flush_lock.release()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists but belongs to someone else
+    return True
+
+
+def collect() -> tuple[dict, dict]:
+    """Merged (histograms, gauges) of this process and every snapshot on disk."""
+    _pool_gauges()
+    snapshots = [registry.snapshot()]
+    directory = _dir()
+    for path in directory.glob("*.json"):
+        try:
+            pid = int(path.stem)
+            if pid == os.getpid():
+                continue
+            snapshots.append(json.loads(path.read_text()))
+        except (ValueError, OSError):
+            continue  # half-written or foreign file
+
+    hist, gauges = {}, {}
+    for snap in snapshots:
+        for name, labels, values in snap["histograms"]:
+            key = (name, tuple(labels))
+            merged = hist.get(key)
+            hist[key] = values if merged is None else [a + b for a, b in zip(merged, values)]
+        if snap["pid"] != os.getpid() and not _alive(snap["pid"]):
+            continue
+        for name, labels, value in snap["gauges"]:
+            key = (name, tuple(labels))
+            gauges[key] = gauges.get(key, 0) + value
+    return hist, gauges
+
+
+LABEL_NAMES = {
+    "http_request_duration_seconds": ("endpoint", "method", "status"),
+    "http_request_db_seconds": ("endpoint",),
+    "http_request_db_queries": ("endpoint",),
+    "db_pool_checkout_seconds": ("engine",),
+    "db_pool_checked_out": ("engine",),
+    "db_pool_size": ("engine",),
+}
+
+
+def _labels(names, values, extra=""):
+    parts = []
+    for k, v in zip(names, values):
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    hist, gauges = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        names = LABEL_NAMES.get(name, ())
+        if kind == "gauge":
+            for (n, labels), value in sorted(gauges.items()):
+                if n == name:
+                    lines.append(f"{name}{_labels(names, labels)} {_num(value)}")
+            continue
+        for (n, labels), values in sorted(hist.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, math.inf), values[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _num(float(bound))
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_num(float(values[-1]))}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app):
+    """Registers the request hooks (no-op when METRICS_ENABLED=0)."""
+    if not METRICS_ENABLED:
+        return
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    with app.app_context():
+        directory = _dir()
+    atexit.register(flush, directory)
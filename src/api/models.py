@@ -2,15 +2,25 @@ from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import (
     String, Float, Integer, Numeric, DateTime, Text, ForeignKey,
-    CheckConstraint, UniqueConstraint, Boolean
+    CheckConstraint, UniqueConstraint, Boolean, Index, func
 )
 from datetime import datetime
 
-db = SQLAlchemy()
+from .replicas import RoutingSession
+
+# reads may go to a replica: see api/replicas.py
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 class User(db.Model):
     __tablename__ = "user"
+    __table_args__ = (
+        Index("ix_user_role_created", "role", "createdAt"),
+        Index("ix_user_created_id", "createdAt", "userId"),
+        Index("ix_user_updated", "updatedAt"),
+        Index("ix_user_role_updated", "role", "updatedAt"),
+        Index("ix_user_deleted", "deletedAt"),
+    )
     userId: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(
         String(120), unique=True, nullable=False)
@@ -20,9 +30,22 @@ class User(db.Model):
     name: Mapped[str] = mapped_column(String(25), nullable=False)
     city: Mapped[str] = mapped_column(String(50), nullable=False)
     createdAt: Mapped[datetime] = mapped_column(default=datetime.now)
+    # bumped on every UPDATE (ORM or Core); drives ETag/Last-Modified
+    updatedAt: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=True)
+    # set by DELETE /users/<id>; the row and its cascade are removed later by
+    # `flask purge-deleted-users` (see api/purge.py). Read paths skip these rows.
+    deletedAt: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     ratingAvg: Mapped[float] = mapped_column(
         Float(precision=2), nullable=True, default=0)
     ratingCount: Mapped[int] = mapped_column(Integer, nullable=True, default=0)
+    # running aggregates kept in step with reviews (see api/ratings.py)
+    ratingSum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ratingHist1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ratingHist2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ratingHist3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ratingHist4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ratingHist5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     avatarUrl: Mapped[str] = mapped_column(String(255), nullable=True)
     capacity: Mapped[int] = mapped_column(Integer, nullable=True)
     genre: Mapped[str] = mapped_column(String(80), nullable=True)
@@ -30,6 +53,7 @@ class User(db.Model):
     bio: Mapped[str] = mapped_column(Text, nullable=True)
     musicians: Mapped[dict] = mapped_column(
         db.JSON, nullable=True)  # list[ {name, instrument} ]
+    # closed offers this performer was accepted for; server-maintained (api/counters.py)
     eventsFinalised: Mapped[int] = mapped_column(
         Integer, nullable=True, default=0)
 
@@ -43,6 +67,13 @@ class User(db.Model):
             "createdAt": self.createdAt,
             "ratingAvg": self.ratingAvg,
             "ratingCount": self.ratingCount,
+            "ratingHistogram": {
+                "1": self.ratingHist1 or 0,
+                "2": self.ratingHist2 or 0,
+                "3": self.ratingHist3 or 0,
+                "4": self.ratingHist4 or 0,
+                "5": self.ratingHist5 or 0,
+            },
             "avatarUrl": self.avatarUrl,
             "capacity": self.capacity,
             "genre": self.genre,
@@ -56,6 +87,12 @@ class User(db.Model):
 
 class Offer(db.Model):
     __tablename__ = "offers"
+    __table_args__ = (
+        Index("ix_offers_distributor_created", "distributorId", "createdAt"),
+        Index("ix_offers_created_id", "createdAt", "offerId"),
+        Index("ix_offers_accepted_performer", "acceptedPerformerId"),
+        Index("ix_offers_updated", "updatedAt"),
+    )
     offerId: Mapped[int] = mapped_column(primary_key=True)
     distributorId: Mapped[int] = mapped_column(
         ForeignKey("user.userId"), nullable=False)
@@ -65,19 +102,28 @@ class Offer(db.Model):
     venueName: Mapped[str] = mapped_column(String(140), nullable=True)
     genre: Mapped[str] = mapped_column(String(80), nullable=True)
     budget: Mapped[float] = mapped_column(Numeric(10, 2), nullable=True)
-    # open | closed | cancelled | concluded
+    # open | closed (concluded by the venue) | cancelled
     status: Mapped[str] = mapped_column(
         String(20), default="open", nullable=False)
     eventDate: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, nullable=False)
     capacity: Mapped[int] = mapped_column(Integer, nullable=True)
     createdAt: Mapped[datetime] = mapped_column(default=datetime.now)
+    updatedAt: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=True)
 
     # NEW: once venue accepts a performer, store it here
     acceptedPerformerId: Mapped[int | None] = mapped_column(
         ForeignKey("user.userId"), nullable=True
     )
 
+    # denormalized from matches/messages, kept in step by the write paths (api/counters.py)
+    applicationsCount: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    messageCount: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    lastMessageAt: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     def serialize(self):
         return {
             "offerId": self.offerId,
@@ -93,14 +139,24 @@ class Offer(db.Model):
             "capacity": self.capacity,
             "createdAt": self.createdAt,
             "acceptedPerformerId": self.acceptedPerformerId,
+            "applicationsCount": self.applicationsCount,
         }
 
 
+# /offers/search filters: case-insensitive city/genre, then an eventDate range
+Index("ix_offers_status_city_event", Offer.status, func.lower(Offer.city), Offer.eventDate)
+Index("ix_offers_status_genre_event", Offer.status, func.lower(Offer.genre), Offer.eventDate)
+Index("ix_offers_status_event", Offer.status, Offer.eventDate)
+
+
 class Match(db.Model):
     __tablename__ = "matches"
     __table_args__ = (
         UniqueConstraint("performerId", "offerId",
                          name="uq_match_performer_offer"),
+        Index("ix_matches_performer_created", "performerId", "createdAt"),
+        Index("ix_matches_offer_created", "offerId", "createdAt"),
+        Index("ix_matches_updated", "updatedAt"),
     )
 
     matchId: Mapped[int] = mapped_column(primary_key=True)
@@ -122,6 +178,8 @@ class Match(db.Model):
 
     message: Mapped[str] = mapped_column(Text, nullable=True)
     createdAt: Mapped[datetime] = mapped_column(default=datetime.now)
+    updatedAt: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=True)
 
     def serialize(self):
         return {
@@ -138,6 +196,12 @@ class Match(db.Model):
 
 class Message(db.Model):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_offer_created", "offerId", "createdAt"),
+        Index("ix_messages_author", "authorId"),
+        # newest message / messages after a read watermark, per offer
+        Index("ix_messages_offer_id", "offerId", "messageId"),
+    )
 
     messageId: Mapped[int] = mapped_column(primary_key=True)
     offerId: Mapped[int] = mapped_column(
@@ -157,6 +221,32 @@ class Message(db.Model):
         }
 
 
+class ChatRead(db.Model):
+    """Per user and offer chat: the newest message the user has read."""
+    __tablename__ = "chat_reads"
+    __table_args__ = (
+        UniqueConstraint("userId", "offerId", name="uq_chat_read_user_offer"),
+        Index("ix_chat_reads_offer", "offerId"),
+    )
+
+    readId: Mapped[int] = mapped_column(primary_key=True)
+    userId: Mapped[int] = mapped_column(
+        ForeignKey("user.userId"), nullable=False)
+    offerId: Mapped[int] = mapped_column(
+        ForeignKey("offers.offerId"), nullable=False)
+    # messages with a greater messageId are unread (0 = nothing read yet)
+    lastReadMessageId: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updatedAt: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=True)
+
+    def serialize(self):
+        return {
+            "offerId": self.offerId,
+            "lastReadMessageId": self.lastReadMessageId,
+            "updatedAt": self.updatedAt,
+        }
+
+
 class Review(db.Model):
     __tablename__ = "reviews"
     __table_args__ = (
@@ -164,6 +254,8 @@ class Review(db.Model):
                         name="ck_review_score_range"),
         UniqueConstraint("raterId", "ratedId", "offerId",
                          name="uq_review_pair_offer"),
+        Index("ix_reviews_rated_created", "ratedId", "createdAt"),
+        Index("ix_reviews_offer", "offerId"),
     )
 
     reviewId: Mapped[int] = mapped_column(primary_key=True)
@@ -187,3 +279,44 @@ class Review(db.Model):
             "comment": self.comment,
             "createdAt": self.createdAt,
         }
+
+
+class Job(db.Model):
+    """Deferred work run by `flask jobs-worker` (see api/jobs.py)."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # claim order: WHERE status = 'queued' AND runAt <= now ORDER BY priority, runAt
+        Index("ix_jobs_status_priority_run", "status", "priority", "runAt"),
+    )
+
+    jobId: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(80), nullable=False)
+    payload: Mapped[dict] = mapped_column(db.JSON, nullable=True)
+    # lower runs first: 0 = most urgent, 5 = normal, 9 = bulk/maintenance
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    # queued | running | done | failed
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    maxAttempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    runAt: Mapped[datetime] = mapped_column(default=datetime.now)
+    lockedAt: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    lockedBy: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    lastError: Mapped[str | None] = mapped_column(Text, nullable=True)
+    createdAt: Mapped[datetime] = mapped_column(default=datetime.now)
+    finishedAt: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def serialize(self):
+        return {
+            "jobId": self.jobId,
+            "kind": self.kind,
+            "payload": self.payload,
+            "priority": self.priority,
+            "status": self.status,
+            "attempts": self.attempts,
+            "maxAttempts": self.maxAttempts,
+            "runAt": self.runAt,
+            "lastError": self.lastError,
+            "createdAt": self.createdAt,
+            "finishedAt": self.finishedAt,
+        }
@@ -0,0 +1,188 @@
+"""
+Purge of soft-deleted users.
+
+DELETE /users/<id> only tombstones the row (User.deletedAt); every read path
+skips tombstoned users from then on. Their cascade (messages, chat read
+watermarks, matches, reviews, offers and finally the user row) is removed
+here, at most `batch_size` rows per statement and one short transaction per
+batch, so the hot tables are never locked for long.
+
+There is no separate progress table: each step is "delete the next batch of
+rows that still match", so an interrupted purge simply resumes where it
+stopped the next time it runs. DELETE /users/<id> enqueues a "purge_user"
+job (api/tasks.py); `flask purge-deleted-users` sweeps every tombstone.
+"""
+from collections import Counter
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+
+from api.models import db, User, Offer, Match, Message, Review, ChatRead
+from api import cache
+from api.cache import invalidate_chat_permissions, offer_key, user_key, reviews_prefix
+from api.cache import OFFERS_LATEST, USERS_LATEST
+from api.ratings import apply_review_to_ratings
+from api.counters import (
+    FINALISED_STATUSES, add_applications, add_events_finalised, remove_messages,
+)
+
+
+def _owned_offers(user_id):
+    return select(Offer.offerId).where(Offer.distributorId == user_id)
+
+
+def _delete_batch(model, pk, cond, batch_size, *extra):
+    """Deletes up to batch_size rows matching cond; returns the (pk, *extra) rows."""
+    rows = db.session.execute(select(pk, *extra).where(cond).limit(batch_size)).all()
+    if rows:
+        db.session.execute(
+            delete(model).where(pk.in_([row[0] for row in rows]))
+            .execution_options(synchronize_session=False)
+        )
+    return rows
+
+
+def _messages(user_id, batch_size, touched):
+    rows = _delete_batch(Message, Message.messageId,
+                         Message.offerId.in_(_owned_offers(user_id)), batch_size)
+    if len(rows) < batch_size:
+        # the user's messages on other venues' offers: those offers stay, fix their counts
+        others = _delete_batch(Message, Message.messageId,
+                               Message.authorId == user_id, batch_size - len(rows), Message.offerId)
+        remove_messages(Counter(offer_id for _, offer_id in others))
+        rows += others
+    return len(rows)
+
+
+def _chat_reads(user_id, batch_size, touched):
+    rows = _delete_batch(ChatRead, ChatRead.readId,
+                         ChatRead.offerId.in_(_owned_offers(user_id)), batch_size)
+    if len(rows) < batch_size:
+        rows += _delete_batch(ChatRead, ChatRead.readId,
+                              ChatRead.userId == user_id, batch_size - len(rows))
+    return len(rows)
+
+
+def _matches(user_id, batch_size, touched):
+    rows = _delete_batch(Match, Match.matchId,
+                         Match.offerId.in_(_owned_offers(user_id)), batch_size, Match.offerId)
+    if len(rows) < batch_size:
+        applied = _delete_batch(Match, Match.matchId,
+                                Match.performerId == user_id, batch_size - len(rows), Match.offerId)
+        add_applications({oid: -n for oid, n in Counter(oid for _, oid in applied).items()})
+        touched["offers"].update(offer_id for _, offer_id in applied)
+        rows += applied
+    touched["chat"].update(offer_id for _, offer_id in rows)
+    return len(rows)
+
+
+def _reviews(user_id, batch_size, touched):
+    rows = []
+    for cond in (Review.offerId.in_(_owned_offers(user_id)),
+                 Review.raterId == user_id,
+                 Review.ratedId == user_id):
+        if len(rows) >= batch_size:
+            break
+        rows += _delete_batch(Review, Review.reviewId, cond, batch_size - len(rows),
+                              Review.ratedId, Review.score)
+    # take the purged reviews out of the other users' running aggregates
+    doomed = Counter((rated_id, score) for _, rated_id, score in rows if rated_id != user_id)
+    for (rated_id, score), n in doomed.items():
+        apply_review_to_ratings(rated_id, score, -n)
+    touched["users"].update(rated_id for rated_id, _ in doomed)
+    return len(rows)
+
+
+def _accepted_offers(user_id, batch_size, touched):
+    ids = db.session.execute(
+        select(Offer.offerId).where(Offer.acceptedPerformerId == user_id).limit(batch_size)
+    ).scalars().all()
+    if ids:
+        db.session.execute(
+            update(Offer).where(Offer.offerId.in_(ids)).values(acceptedPerformerId=None)
+            .execution_options(synchronize_session=False)
+        )
+    touched["offers"].update(ids)
+    touched["chat"].update(ids)
+    return len(ids)
+
+
+def _offers(user_id, batch_size, touched):
+    rows = _delete_batch(Offer, Offer.offerId, Offer.distributorId == user_id, batch_size,
+                         Offer.status, Offer.acceptedPerformerId)
+    # the performers of the venue's past events lose them with the offers
+    performed = Counter(performer for _, status, performer in rows
+                        if performer is not None and status in FINALISED_STATUSES)
+    for performer_id, n in performed.items():
+        add_events_finalised(performer_id, -n)
+    touched["users"].update(performed)
+    touched["offers"].update(offer_id for offer_id, _, _ in rows)
+    touched["chat"].update(offer_id for offer_id, _, _ in rows)
+    return len(rows)
+
+
+# order matters: children before the offers and the user they reference
+STEPS = [
+    ("messages", _messages),
+    ("chat reads", _chat_reads),
+    ("matches", _matches),
+    ("reviews", _reviews),
+    ("accepted offers", _accepted_offers),
+    ("offers", _offers),
+]
+
+
+def _invalidate(touched):
+    cache.invalidate(
+        *(user_key(uid) for uid in touched["users"]),
+        *(offer_key(oid) for oid in touched["offers"]),
+        prefixes=(USERS_LATEST, OFFERS_LATEST, *(reviews_prefix(uid) for uid in touched["users"])),
+    )
+    invalidate_chat_permissions(*touched["chat"])
+
+
+def pending_user_ids(limit: int | None = None) -> list[int]:
+    """Tombstoned users still waiting for their purge, oldest deletion first."""
+    q = (select(User.userId).where(User.deletedAt.is_not(None))
+         .order_by(User.deletedAt, User.userId))
+    if limit:
+        q = q.limit(limit)
+    return db.session.execute(q).scalars().all()
+
+
+def purge_user(user_id: int, batch_size: int = 500, on_batch=None) -> bool:
+    """
+    Purges one tombstoned user's cascade batch by batch, then the user row.
+    on_batch(user_id, step, rows_in_batch, step_total) is called after each
+    committed batch. Returns True once the user row is gone, False if it was
+    not tombstoned or a concurrent write got in the way (the next run retries).
+    """
+    if db.session.scalar(select(User.deletedAt).where(User.userId == user_id)) is None:
+        return False
+
+    for step, run in STEPS:
+        total = 0
+        while True:
+            touched = {"users": set(), "offers": set(), "chat": set()}
+            n = run(user_id, batch_size, touched)
+            db.session.commit()
+            _invalidate(touched)
+            total += n
+            if on_batch and n:
+                on_batch(user_id, step, n, total)
+            if n < batch_size:
+                break
+
+    try:
+        db.session.execute(
+            delete(User).where(User.userId == user_id, User.deletedAt.is_not(None))
+        )
+        db.session.commit()
+    except IntegrityError:
+        # a request still holding the user's token wrote a row after its step ran
+        db.session.rollback()
+        return False
+    _invalidate({"users": {user_id}, "offers": set(), "chat": set()})
+    if on_batch:
+        on_batch(user_id, "user", 1, 1)
+    return True
@@ -0,0 +1,177 @@
+"""
+EXPLAIN-based regression check for the hot lookups in routes.py.
+
+Each entry builds its statement with the same helper the route executes
+(projection, LIVE_USER filters, keyset cursor and the @conditional
+fingerprint included). The check compiles it against the bound engine, asks
+the database for its plan and reports any step that reads a whole table
+instead of going through an index.
+Run it with:  $ flask check-query-plans
+"""
+from datetime import datetime
+import json
+
+from sqlalchemy import select, text
+
+from api.models import db, User, Offer, Match, Message, Review
+from api import routes as r
+from api.jobs import _ready
+from api.serializers import Projection
+
+# Sample values only need the right type; the planner never sees real data.
+_ID = 1
+_TS = datetime(2025, 1, 1)
+_CURSOR = (_TS, _ID)
+_LIMIT = 20
+_SEARCH = {"status": "open", "city": "madrid", "genre": "rock", "dateFrom": "2025-01-01"}
+
+
+def _page(q, created_col, id_col):
+    return r._keyset(q, created_col, id_col, _CURSOR, _LIMIT)
+
+
+def _search_conds():
+    conds, _ = r._search_conditions(_SEARCH)
+    return conds
+
+
+def _conversations(role):
+    q, sort_at = r._conversations_query(_ID, role)
+    return r._keyset(q, sort_at, Offer.offerId, _CURSOR, _LIMIT)
+
+
+HOT_QUERIES = [
+    ("get_users (page)",
+     lambda: _page(r._users_stmt(Projection(User)), User.createdAt, User.userId)),
+    ("get_users fingerprint",
+     lambda: r._fp_agg_stmt(User.updatedAt, r.LIVE_USER)),
+    ("users_latest",
+     lambda: r._latest_stmt(Projection(User), User, 3, User.role == "performer", r.LIVE_USER)),
+    ("users_latest fingerprint",
+     lambda: r._fp_agg_stmt(User.updatedAt, r.LIVE_USER, User.role == "performer")),
+    ("get_offers (page)",
+     lambda: _page(r._offers_stmt(Projection(Offer)), Offer.createdAt, Offer.offerId)),
+    ("get_offers fingerprint",
+     lambda: r._fp_agg_stmt(Offer.updatedAt)),
+    ("offers_latest",
+     lambda: r._latest_stmt(Projection(Offer), Offer, 10)),
+    ("offers_created_by_user (page)",
+     lambda: _page(r._offers_stmt(Projection(Offer), Offer.distributorId == _ID),
+                   Offer.createdAt, Offer.offerId)),
+    ("offers_created_by_user fingerprint",
+     lambda: r._fp_agg_stmt(Offer.updatedAt, Offer.distributorId == _ID)),
+    ("offers_user_applied (page)",
+     lambda: _page(r._applied_stmt(Projection(Offer), _ID), Offer.createdAt, Offer.offerId)),
+    ("offers_user_applied fingerprint",
+     lambda: r._fp_applied_stmt(_ID)),
+    ("dashboard fingerprint",
+     lambda: r._fp_dashboard_stmt(_ID, _ID)),
+    ("search_offers (page)",
+     lambda: _page(r._offers_stmt(Projection(Offer), *_search_conds()),
+                   Offer.createdAt, Offer.offerId)),
+    ("search_offers facets",
+     lambda: r._facets_stmt(_search_conds())),
+    ("search_offers fingerprint",
+     lambda: r._fp_agg_stmt(Offer.updatedAt, *_search_conds())),
+    ("list_offer_matches",
+     lambda: r._offer_matches_stmt(Projection(Match), _ID)),
+    ("list_offer_matches fingerprint",
+     lambda: r._fp_agg_stmt(Match.updatedAt, Match.offerId == _ID,
+                            r._by_live_user(Match.performerId))),
+    ("offer owner",
+     lambda: r._owned_offer_stmt(_ID, _ID)),
+    ("chat permission",
+     lambda: r._chat_permission_stmt(_ID, _ID)),
+    ("get_messages_for_offer",
+     lambda: r._messages_stmt(Projection(Message), _ID)),
+    ("get_messages_for_offer (after)",
+     lambda: r._messages_stmt(Projection(Message), _ID, _ID)),
+    ("get_messages_for_offer fingerprint",
+     lambda: r._fp_messages_stmt(_ID)),
+    ("my_conversations (performer)",
+     lambda: _conversations("performer")),
+    ("my_conversations (venue)",
+     lambda: _conversations("venue")),
+    ("get_reviews_for_user",
+     lambda: r._reviews_stmt(Projection(Review), _ID)),
+    ("get_reviews_for_user fingerprint",
+     lambda: r._fp_reviews_stmt(_ID)),
+    ("purge: pending users",
+     lambda: select(User.userId).where(User.deletedAt.is_not(None))
+     .order_by(User.deletedAt, User.userId)),
+    ("purge: messages by author",
+     lambda: select(Message.messageId).where(Message.authorId == _ID)),
+    ("purge: offers accepted by performer",
+     lambda: select(Offer.offerId).where(Offer.acceptedPerformerId == _ID)),
+    ("purge: reviews by offer",
+     lambda: select(Review.reviewId).where(Review.offerId == _ID)),
+    ("purge: reviews by rater",
+     lambda: select(Review.reviewId).where(Review.raterId == _ID).limit(500)),
+    ("recommendations: offers changed since",
+     lambda: select(Offer.offerId).where(Offer.updatedAt >= _TS)),
+    ("recommendations: users changed since",
+     lambda: select(User.userId).where(User.updatedAt >= _TS)),
+    ("recommendations: matches changed since",
+     lambda: select(Match.performerId).where(Match.updatedAt >= _TS)),
+    ("jobs: claim",
+     lambda: _ready(_TS, 4)),
+]
+
+
+def _compile(stmt, dialect):
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _sqlite_full_scans(conn, sql, params=()):
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    bad = []
+    for row in rows:
+        detail = str(row[-1])
+        # "SCAN t" is a full scan; "SCAN t USING [COVERING] INDEX ..." is an index walk
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            bad.append(detail)
+    return bad
+
+
+def _pg_full_scans(conn, sql):
+    # Tiny dev tables make Seq Scan the cheapest plan; forbid it so we see
+    # whether an index path exists at all.
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    bad = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan":
+            bad.append(f"Seq Scan on {node.get('Relation Name')}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return bad
+
+
+def check_plans(engine=None):
+    """
+    Returns a list of (label, [offending plan steps]) for every hot query
+    whose plan contains a full table scan. Empty list == all good.
+    """
+    engine = engine or db.engine
+    dialect = engine.dialect
+    if dialect.name == "sqlite":
+        inspect_plan = _sqlite_full_scans
+    elif dialect.name == "postgresql":
+        inspect_plan = _pg_full_scans
+    else:
+        raise RuntimeError(f"unsupported dialect for plan check: {dialect.name}")
+
+    failures = []
+    with engine.connect() as conn:
+        for label, build in HOT_QUERIES:
+            with conn.begin():
+                bad = inspect_plan(conn, _compile(build(), dialect))
+            if bad:
+                failures.append((label, bad))
+    return failures
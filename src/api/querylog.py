@@ -0,0 +1,189 @@
+"""
+Per-request query inspector for development and tests (QUERY_DEBUG=1, or
+automatically when app.testing).
+
+Every statement a request issues is recorded with its duration and the
+app-code call site that triggered it. At the end of the request:
+
+  - the same statement text run QUERY_DEBUG_REPEAT+ times (default 3) is
+    logged as an N+1 suspect, with the call site of its first execution;
+  - statements slower than QUERY_SLOW_MS (default 100) are logged with
+    their EXPLAIN (EXPLAIN QUERY PLAN on SQLite);
+  - routes decorated with @query_budget(n) that issued more than n
+    statements are logged, and fail the request with QueryBudgetExceeded
+    when app.testing or QUERY_BUDGET_STRICT=1, so tests catch regressions.
+
+Responses also carry X-Query-Count / X-Query-Time-Ms in this mode.
+Off by default: outside it nothing is recorded.
+"""
+import os
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.models import db
+
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "0") == "1"
+QUERY_DEBUG_REPEAT = int(os.getenv("QUERY_DEBUG_REPEAT", "3"))
+QUERY_SLOW_MS = float(os.getenv("QUERY_SLOW_MS", "100"))
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "0") == "1"
+
+# call sites are reported from files under src/ only, skipping this module
+_SRC_ROOT = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int):
+    """
+    Declares the most statements one call of the route may issue. Put it
+    directly under @api.route so it tags the registered view function.
+    """
+    def decorator(fn):
+        fn.query_budget = max_queries
+        return fn
+    return decorator
+
+
+def _frames():
+    stack = getattr(_local, "frames", None)
+    if stack is None:
+        stack = _local.frames = []
+    return stack
+
+
+def _call_site() -> list[str]:
+    sites = []
+    for frame in traceback.extract_stack()[:-2]:
+        if frame.filename.startswith(_SRC_ROOT) and frame.filename != _THIS_FILE:
+            sites.append(f"{os.path.relpath(frame.filename, _SRC_ROOT)}:{frame.lineno} in {frame.name}")
+    return sites[-3:]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and getattr(_local, "frames", None):
+        context._querylog_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_querylog_start", None)
+    frames = getattr(_local, "frames", None)
+    if start is None or not frames:
+        return
+    entry = {
+        "statement": statement,
+        "parameters": parameters,
+        "executemany": executemany,
+        "ms": (time.perf_counter() - start) * 1000,
+        "site": _call_site(),
+    }
+    for frame in frames:
+        frame.append(entry)
+
+
+def _explain(statement, parameters) -> list[str]:
+    dialect = db.engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    try:
+        with db.engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters or ()).all()
+    except Exception as e:  # EXPLAIN is best effort (DDL, executemany, ...)
+        return [f"(no plan: {e.__class__.__name__})"]
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [str(row[0]) for row in rows]
+
+
+def _before_request():
+    if not (QUERY_DEBUG or current_app.testing):
+        return
+    queries = []
+    request.environ["querylog.queries"] = queries
+    _frames().append(queries)
+
+
+def _report(queries, endpoint):
+    log = current_app.logger
+    total_ms = sum(q["ms"] for q in queries)
+
+    repeats = Counter(q["statement"] for q in queries if not q["executemany"])
+    for statement, n in repeats.items():
+        if n >= QUERY_DEBUG_REPEAT:
+            first = next(q for q in queries if q["statement"] == statement)
+            log.warning("N+1 suspect in %s: %d x %s\n  first from: %s",
+                        endpoint, n, " ".join(statement.split())[:300],
+                        " <- ".join(reversed(first["site"])) or "?")
+
+    for q in queries:
+        if q["ms"] >= QUERY_SLOW_MS and not q["executemany"]:
+            plan = _explain(q["statement"], q["parameters"])
+            log.warning("slow query in %s (%.1f ms): %s\n  from: %s\n  plan:\n    %s",
+                        endpoint, q["ms"], " ".join(q["statement"].split())[:500],
+                        " <- ".join(reversed(q["site"])) or "?", "\n    ".join(plan))
+    return total_ms
+
+
+def _pop_frame():
+    queries = request.environ.pop("querylog.queries", None)
+    if queries is not None:
+        stack = _frames()
+        for i, frame in enumerate(stack):
+            if frame is queries:
+                del stack[i]
+                break
+    return queries
+
+
+def _after_request(response):
+    # popped here so the error response of a failed budget is not checked again
+    queries = _pop_frame()
+    if queries is None:
+        return response
+    endpoint = request.endpoint or "<unmatched>"
+    total_ms = _report(queries, endpoint)
+    response.headers["X-Query-Count"] = str(len(queries))
+    response.headers["X-Query-Time-Ms"] = f"{total_ms:.1f}"
+
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, "query_budget", None)
+    if budget is not None and len(queries) > budget:
+        details = "\n  ".join(
+            f"{q['ms']:.1f} ms  {' '.join(q['statement'].split())[:200]}" for q in queries)
+        msg = f"{endpoint} issued {len(queries)} queries (budget {budget}):\n  {details}"
+        if current_app.testing or QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(msg)
+        current_app.logger.warning(msg)
+    return response
+
+
+def _teardown_request(exc):
+    _pop_frame()  # requests that never reached after_request
+
+
+def init_app(app):
+    """
+    Registers the hooks; they only record while QUERY_DEBUG=1 or app.testing,
+    which tests usually switch on after importing the app.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+def current_queries() -> list[dict]:
+    """Statements recorded so far in the current request (empty when disabled)."""
+    return request.environ.get("querylog.queries", []) if request else []
@@ -0,0 +1,259 @@
+"""
+Per-client rate limiting and per-process admission control.
+
+Rate limits (429): token buckets, declared per route with
+@rate_limit("name", "10/minute", burst=5). Buckets are keyed by the JWT user
+id when the request carries a valid token, else by client IP (the
+RATE_LIMIT_PROXIES-th address from the right of X-Forwarded-For when the app
+sits behind that many proxies, else the socket peer). Any limit can be
+overridden with RATE_LIMIT_<NAME>="20/minute" (burst = the count). Backends
+(RATE_LIMIT_BACKEND), like the response cache:
+  - "memory" (default) per-process buckets: the effective limit is
+             multiplied by the number of workers.
+  - "shared" SQLite file shared by every worker on the host
+             (RATE_LIMIT_PATH, default <instance>/ratelimit.sqlite3).
+  - "none"   disables rate limiting.
+
+Admission control (503): at most ADMISSION_MAX_INFLIGHT requests run at once
+per process (default: the gunicorn thread count); a request that cannot get a slot within
+ADMISSION_QUEUE_TIMEOUT seconds is shed instead of queueing behind the
+others. Requests that already waited longer than ADMISSION_MAX_QUEUE_MS in
+front of the app (X-Request-Start, set by Heroku/Render-style routers and
+nginx) are shed on arrival: their client has most likely given up. Both
+answer with Retry-After so well-behaved clients back off.
+"""
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+RATE_LIMIT_PROXIES = int(os.getenv("RATE_LIMIT_PROXIES", "0"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# gunicorn.conf.py sets it to the worker's thread count; 8 matches its default
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "8"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "0.25"))
+ADMISSION_MAX_QUEUE_MS = float(os.getenv("ADMISSION_MAX_QUEUE_MS", "2000"))
+# never shed: probes and scrapes must answer even under overload
+ADMISSION_EXEMPT = ("/health", "/metrics")
+# long-polls / streams park for up to 30 s: they would pin every slot
+ADMISSION_EXEMPT_ENDPOINTS = ("api.stream_messages_for_offer",)
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_limit(spec: str) -> tuple[float, int]:
+    """ "10/minute" -> (refill rate per second, count) """
+    count, unit = spec.strip().split("/")
+    return int(count) / _UNITS[unit.strip().rstrip("s")], int(count)
+
+
+def _refill(tokens, updated, now, rate, burst):
+    return min(burst, tokens + (now - updated) * rate)
+
+
+class MemoryBuckets:
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._data: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1.0) -> float:
+        """Takes `cost` tokens; returns 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._data.get(key, (burst, now))
+            tokens = _refill(tokens, updated, now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            self._data[key] = (tokens, now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)  # an evicted bucket starts full again
+        return wait
+
+
+class SQLiteBuckets:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rate, burst, cost=1.0) -> float:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")  # read-modify-write under the write lock
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(*(row or (burst, now)), now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                         (key, tokens, now))
+            if random.random() < 0.001:
+                # idle for a day: full again anyway
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - 86400,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    """MemoryBuckets / SQLiteBuckets per RATE_LIMIT_BACKEND, or None when disabled."""
+    global _buckets
+    if _buckets is None:
+        with _buckets_lock:
+            if _buckets is None:
+                kind = os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower()
+                if kind == "none":
+                    _buckets = False
+                elif kind == "shared":
+                    path = os.getenv("RATE_LIMIT_PATH") or os.path.join(
+                        current_app.instance_path, "ratelimit.sqlite3")
+                    _buckets = SQLiteBuckets(path)
+                else:
+                    _buckets = MemoryBuckets()
+    return _buckets or None
+
+
+def client_ip() -> str:
+    if RATE_LIMIT_PROXIES:
+        hops = [h.strip() for h in request.headers.get("X-Forwarded-For", "").split(",") if h.strip()]
+        if len(hops) >= RATE_LIMIT_PROXIES:
+            return hops[-RATE_LIMIT_PROXIES]
+    return request.remote_addr or "unknown"
+
+
+def client_key() -> str:
+    """user:<id> for a valid JWT, else ip:<address>."""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:  # a bad token is the route's business, not the limiter's
+        identity = None
+    return f"user:{identity}" if identity else f"ip:{client_ip()}"
+
+
+def _refuse(status, message, retry_after):
+    retry_after = max(1, math.ceil(retry_after))
+    resp = jsonify({"message": message, "retryAfter": retry_after})
+    resp.status_code = status
+    resp.headers["Retry-After"] = str(retry_after)
+    return resp
+
+
+def rate_limit(name: str, limit: str, burst: int | None = None, key=client_key):
+    """
+    Token bucket per (name, key()): `limit` sets the sustained rate
+    ("10/minute"), `burst` how many may come back to back (default: the count).
+    Over the limit the route answers 429 with Retry-After.
+    """
+    spec = os.getenv(f"RATE_LIMIT_{name.upper()}")
+    rate, count = parse_limit(spec or limit)
+    capacity = count if spec or burst is None else burst
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            buckets = get_buckets()
+            if buckets is not None and request.method != "OPTIONS":
+                wait = buckets.take(f"{name}:{key()}", rate, capacity)
+                if wait:
+                    return _refuse(429, "too many requests, slow down", wait)
+            return fn(*args, **kwargs)
+        wrapper.rate_limit = (name, rate, capacity)
+        return wrapper
+    return decorator
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: int, queue_timeout: float, max_queue_ms: float):
+        self.max_inflight = max_inflight
+        self.queue_timeout = queue_timeout
+        self.max_queue_ms = max_queue_ms
+        self._slots = threading.BoundedSemaphore(max_inflight) if max_inflight > 0 else None
+        self._local = threading.local()
+        self.shed = 0
+
+    @staticmethod
+    def _queued_ms():
+        """Milliseconds since the router saw the request (X-Request-Start), if known."""
+        raw = request.headers.get("X-Request-Start", "").strip()
+        if raw.startswith("t="):
+            raw = raw[2:]
+        try:
+            started = float(raw)
+        except ValueError:
+            return None
+        # routers send seconds (nginx: 1700000000.123), ms or µs since the epoch
+        while started > 1e11:
+            started /= 1000
+        return (time.time() - started) * 1000
+
+    def _exempt(self):
+        if request.path in ADMISSION_EXEMPT or request.method == "OPTIONS":
+            return True
+        if request.endpoint in ADMISSION_EXEMPT_ENDPOINTS:
+            return True
+        if request.endpoint == "api.get_messages_for_offer" and request.args.get("wait"):
+            return True
+        # sub-requests of POST /api/batch run inside a request that holds a slot
+        return getattr(self._local, "held", False)
+
+    def before_request(self):
+        if self._exempt():
+            return None
+        if self.max_queue_ms:
+            queued = self._queued_ms()
+            if queued is not None and queued > self.max_queue_ms:
+                self.shed += 1
+                return _refuse(503, "server busy, retry shortly", 1)
+        if self._slots is not None:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                self.shed += 1
+                return _refuse(503, "server busy, retry shortly", 1)
+            request.environ["admission.slot"] = True
+            self._local.held = True
+        return None
+
+    def teardown_request(self, exc):
+        if request.environ.pop("admission.slot", False):
+            self._local.held = False
+            self._slots.release()
+
+
+admission = AdmissionController(ADMISSION_MAX_INFLIGHT, ADMISSION_QUEUE_TIMEOUT, ADMISSION_MAX_QUEUE_MS)
+
+
+def init_app(app):
+    """Registers the admission controller (ADMISSION_MAX_INFLIGHT=0 and ADMISSION_MAX_QUEUE_MS=0 disable it)."""
+    if admission.max_inflight <= 0 and not admission.max_queue_ms:
+        return
+    app.before_request(admission.before_request)
+    app.teardown_request(admission.teardown_request)
@@ -0,0 +1,91 @@
+"""
+Running rating aggregates on User (ratingCount/ratingSum/ratingAvg/ratingHist1..5).
+
+Shared by the review routes and the purge of deleted users (api/purge.py);
+rebuild_ratings() recomputes them from scratch (`flask rebuild-ratings` or a
+"rebuild_ratings" job).
+"""
+from sqlalchemy import select, update, func, case, cast, or_, Numeric
+
+from api.models import db, User, Review
+from api import cache
+from api.cache import user_key, USERS_LATEST
+
+# stored aggregates, in the order rebuild_ratings() computes them
+_AGGREGATES = (User.ratingCount, User.ratingSum, User.ratingAvg, User.ratingHist1,
+               User.ratingHist2, User.ratingHist3, User.ratingHist4, User.ratingHist5)
+_NAMES = [col.key for col in _AGGREGATES]
+
+
+def apply_review_to_ratings(user_id: int, score: int, delta: int):
+    """
+    Adds (delta>0) or removes (delta<0) |delta| reviews of `score` from the user's
+    running aggregates with a single UPDATE. Does not commit: callers run it in
+    the same transaction as the review insert/delete.
+    """
+    count = func.coalesce(User.ratingCount, 0)
+    total = func.coalesce(User.ratingSum, 0)
+    new_count = count + delta
+    new_sum = total + delta * score
+    hist_col = getattr(User, f"ratingHist{score}")
+    db.session.execute(
+        update(User)
+        .where(User.userId == user_id)
+        .values({
+            User.ratingCount: new_count,
+            User.ratingSum: new_sum,
+            hist_col: func.coalesce(hist_col, 0) + delta,
+            User.ratingAvg: case(
+                (new_count > 0, func.round(cast(new_sum, Numeric) / new_count, 2)),
+                else_=0.0,
+            ),
+        })
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def _normalised(values):
+    count, total, avg, *hist = (v or 0 for v in values)
+    return (count, total, round(avg, 2), *hist)
+
+
+def rebuild_ratings() -> int:
+    """
+    Recomputes every user's aggregates from the reviews table with one grouped
+    query and rewrites only the users whose stored values differ, so updatedAt
+    (ETags, cached responses, the recommendation index) moves for them alone.
+    Commits; returns the number of rated users.
+    """
+    hist = [func.sum(case((Review.score == n, 1), else_=0)) for n in range(1, 6)]
+    actual = {
+        rated_id: (count, total, round(total / count, 2), *h)
+        for rated_id, count, total, *h in db.session.execute(
+            select(Review.ratedId, func.count(), func.sum(Review.score), *hist)
+            .group_by(Review.ratedId)
+        )
+    }
+
+    stored = db.session.execute(
+        select(User.userId, *_AGGREGATES).where(User.userId.in_(select(Review.ratedId)))
+    ).all()
+    fixes = [
+        {"userId": user_id, **dict(zip(_NAMES, actual[user_id]))}
+        for user_id, *current in stored
+        if _normalised(current) != actual[user_id]
+    ]
+    if fixes:
+        db.session.execute(update(User), fixes)
+    changed = [fix["userId"] for fix in fixes]
+
+    # users whose last review is gone go back to zero
+    changed += db.session.execute(
+        update(User)
+        .where(or_(*(func.coalesce(col, 0) != 0 for col in _AGGREGATES)),
+               User.userId.not_in(select(Review.ratedId)))
+        .values(dict.fromkeys(_NAMES, 0))
+        .returning(User.userId)
+    ).scalars().all()
+    db.session.commit()
+    if changed:
+        cache.invalidate(*(user_key(uid) for uid in changed), prefixes=(USERS_LATEST,))
+    return len(actual)
@@ -0,0 +1,366 @@
+"""
+Performer <-> offer recommendations.
+
+Every open offer and every performer is one row of a few compact NumPy
+arrays (int32 codes for genre/city, float32 for capacity, budget, rate and
+rating). A query scores the whole other side in one vectorized pass and takes
+the top k with argpartition, so 100k offers cost a few milliseconds and the
+only SQL is loading the k winners.
+
+Score = weighted sum of per-term fits in 0..1 (unknown values score 0.5):
+  genre     same genre
+  city      same city
+  capacity  offer capacity (or the venue's User.capacity) vs the average capacity
+            of the offers the performer applied to, compared on a log scale
+  budget    offer budget / performer's average past Match.rate, capped at 1
+  rating    ratingAvg of the other side, shrunk towards 3 while reviews are few
+
+The index lives in each worker process. It is built on first use and then
+patched incrementally: at most every RECOMMEND_SYNC_INTERVAL seconds a request
+reads only the offers, users and matches whose updatedAt moved (all indexed)
+and upserts/removes those rows. A full rebuild every RECOMMEND_REBUILD_INTERVAL
+seconds compacts the arrays and bounds any drift.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select, func
+
+from api.models import db, User, Offer, Match
+
+SYNC_INTERVAL = float(os.getenv("RECOMMEND_SYNC_INTERVAL", "5"))
+REBUILD_INTERVAL = float(os.getenv("RECOMMEND_REBUILD_INTERVAL", "900"))
+# re-read rows updated slightly before the last sync: a transaction can commit
+# after we looked even though its updatedAt is older
+SYNC_OVERLAP = timedelta(seconds=30)
+
+W_GENRE, W_CITY, W_CAPACITY, W_BUDGET, W_RATING = 0.30, 0.25, 0.15, 0.20, 0.10
+NEUTRAL = 0.5
+RATING_PRIOR, RATING_PRIOR_WEIGHT = 3.0, 3
+
+OFFER_SPEC = {"genre": np.int32, "city": np.int32, "capacity": np.float32,
+              "budget": np.float32, "rating": np.float32}
+PERFORMER_SPEC = {"genre": np.int32, "city": np.int32, "capacity": np.float32,
+                  "rate": np.float32, "rating": np.float32}
+
+
+class _Vocab:
+    """Lower-cased string -> small int code; -1 for missing."""
+
+    def __init__(self):
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def code(self, value) -> int:
+        key = (value or "").strip().lower()
+        if not key:
+            return -1
+        code = self._codes.get(key)
+        if code is None:
+            with self._lock:
+                code = self._codes.setdefault(key, len(self._codes))
+        return code
+
+
+class _Table:
+    """Column arrays with an id -> row map. Removed rows are masked, not moved."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.size = 0
+        self.ids = np.empty(0, np.int64)
+        self.active = np.empty(0, bool)
+        self.cols = {name: np.empty(0, dtype) for name, dtype in spec.items()}
+        self.pos = {}
+
+    @classmethod
+    def from_arrays(cls, spec, ids, cols):
+        table = cls(spec)
+        table.ids = np.asarray(ids, np.int64)
+        table.size = len(table.ids)
+        table.active = np.ones(table.size, bool)
+        table.cols = {name: np.asarray(cols[name], dtype) for name, dtype in spec.items()}
+        table.pos = {int(row_id): i for i, row_id in enumerate(table.ids)}
+        return table
+
+    def _grow(self, need):
+        capacity = len(self.ids)
+        if need <= capacity:
+            return
+        capacity = max(need, capacity * 2, 1024)
+
+        def grown(arr):
+            out = np.empty(capacity, arr.dtype)
+            out[:self.size] = arr[:self.size]
+            return out
+
+        # readers keep whatever arrays they already hold
+        self.cols = {name: grown(arr) for name, arr in self.cols.items()}
+        self.active = grown(self.active)
+        self.ids = grown(self.ids)
+
+    def upsert(self, row_id, values):
+        i = self.pos.get(row_id)
+        if i is None:
+            self._grow(self.size + 1)
+            i = self.size
+            self.ids[i] = row_id
+            self.size += 1
+            self.pos[row_id] = i
+        for name, value in values.items():
+            self.cols[name][i] = value
+        self.active[i] = True
+
+    def remove(self, row_id):
+        i = self.pos.get(row_id)
+        if i is not None:
+            self.active[i] = False
+
+    def row(self, row_id):
+        i = self.pos.get(row_id)
+        if i is None or not self.active[i]:
+            return None
+        return {name: arr[i] for name, arr in self.cols.items()}
+
+    def view(self):
+        n = self.size
+        return self.ids[:n], self.active[:n], {name: arr[:n] for name, arr in self.cols.items()}
+
+
+# -------------------------
+# Scoring (pure NumPy; scalars broadcast against arrays)
+# -------------------------
+
+def _nan(value):
+    return np.nan if value is None else float(value)
+
+def _rating_fit(avg, count):
+    """ratingAvg shrunk towards RATING_PRIOR by RATING_PRIOR_WEIGHT virtual reviews, as 0..1."""
+    count = count or 0
+    return ((avg or 0.0) * count + RATING_PRIOR * RATING_PRIOR_WEIGHT) / (count + RATING_PRIOR_WEIGHT) / 5.0
+
+def _same(a, b):
+    return np.where((a < 0) | (b < 0), NEUTRAL, (a == b).astype(np.float32))
+
+def _capacity_fit(a, b):
+    with np.errstate(invalid="ignore"):
+        fit = np.exp(-np.abs(np.log1p(a) - np.log1p(b)))
+    return np.where(np.isnan(fit), NEUTRAL, fit)
+
+def _budget_fit(budget, rate):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fit = np.minimum(np.asarray(budget, np.float32) / rate, 1.0)
+    return np.where(np.isnan(fit), NEUTRAL, fit)
+
+def score_offers(performer, offers):
+    """performer: feature dict (scalars); offers: column arrays. Returns float scores."""
+    return (W_GENRE * _same(offers["genre"], performer["genre"])
+            + W_CITY * _same(offers["city"], performer["city"])
+            + W_CAPACITY * _capacity_fit(offers["capacity"], performer["capacity"])
+            + W_BUDGET * _budget_fit(offers["budget"], performer["rate"])
+            + W_RATING * offers["rating"])
+
+def score_performers(offer, performers):
+    """offer: feature dict (scalars); performers: column arrays."""
+    return (W_GENRE * _same(performers["genre"], offer["genre"])
+            + W_CITY * _same(performers["city"], offer["city"])
+            + W_CAPACITY * _capacity_fit(offer["capacity"], performers["capacity"])
+            + W_BUDGET * _budget_fit(offer["budget"], performers["rate"])
+            + W_RATING * performers["rating"])
+
+def top_k(ids, active, pos, scores, k, exclude=()):
+    """[(id, score)] of the k best active rows, best first. pos maps id -> row."""
+    scores = np.where(active, scores, -np.inf)
+    for row_id in exclude:
+        i = pos.get(row_id)
+        if i is not None and i < len(scores):
+            scores[i] = -np.inf
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [(int(ids[i]), float(scores[i])) for i in best if scores[i] > -np.inf]
+
+
+# -------------------------
+# Index
+# -------------------------
+
+def _offer_rows(*conds):
+    return db.session.execute(
+        select(Offer.offerId, Offer.status, Offer.genre, Offer.city,
+               func.coalesce(Offer.capacity, User.capacity), Offer.budget,
+               User.ratingAvg, User.ratingCount, User.deletedAt)
+        .join(User, User.userId == Offer.distributorId)
+        .where(*conds)
+    ).all()
+
+def _performer_rows(*conds):
+    return db.session.execute(
+        select(User.userId, User.role, User.deletedAt, User.genre, User.city,
+               User.ratingAvg, User.ratingCount)
+        .where(*conds)
+    ).all()
+
+def _match_stats(*conds):
+    """performerId -> (avg rate, avg capacity of the offers applied to)."""
+    rows = db.session.execute(
+        select(Match.performerId, func.avg(Match.rate), func.avg(Offer.capacity))
+        .join(Offer, Offer.offerId == Match.offerId)
+        .where(*conds)
+        .group_by(Match.performerId)
+    ).all()
+    return {pid: (_nan(rate), _nan(cap)) for pid, rate, cap in rows}
+
+
+class RecommendationIndex:
+    def __init__(self):
+        self.genres = _Vocab()
+        self.cities = _Vocab()
+        self.offers = _Table(OFFER_SPEC)
+        self.performers = _Table(PERFORMER_SPEC)
+        self._lock = threading.Lock()
+        self._synced_at = None      # wall clock, compared with updatedAt
+        self._checked = 0.0         # monotonic
+        self._built = 0.0           # monotonic
+
+    # feature rows
+    def _offer_features(self, row):
+        _, _, genre, city, capacity, budget, rating_avg, rating_count, _ = row
+        return {"genre": self.genres.code(genre), "city": self.cities.code(city),
+                "capacity": _nan(capacity), "budget": _nan(budget),
+                "rating": _rating_fit(rating_avg, rating_count)}
+
+    def _performer_features(self, row, stats):
+        user_id, _, _, genre, city, rating_avg, rating_count = row
+        rate, capacity = stats.get(user_id, (np.nan, np.nan))
+        return {"genre": self.genres.code(genre), "city": self.cities.code(city),
+                "capacity": capacity, "rate": rate,
+                "rating": _rating_fit(rating_avg, rating_count)}
+
+    @staticmethod
+    def _offer_is_live(row):
+        return row[1] == "open" and row[-1] is None
+
+    @staticmethod
+    def _performer_is_live(row):
+        return row[1] == "performer" and row[2] is None
+
+    # maintenance
+    def rebuild(self):
+        started = datetime.now()
+        offer_rows = _offer_rows(Offer.status == "open", User.deletedAt.is_(None))
+        performer_rows = _performer_rows(User.role == "performer", User.deletedAt.is_(None))
+        stats = _match_stats()
+
+        offer_feats = [self._offer_features(r) for r in offer_rows]
+        perf_feats = [self._performer_features(r, stats) for r in performer_rows]
+        offers = _Table.from_arrays(
+            OFFER_SPEC, [r[0] for r in offer_rows],
+            {name: [f[name] for f in offer_feats] for name in OFFER_SPEC})
+        performers = _Table.from_arrays(
+            PERFORMER_SPEC, [r[0] for r in performer_rows],
+            {name: [f[name] for f in perf_feats] for name in PERFORMER_SPEC})
+
+        self.offers, self.performers = offers, performers
+        self._synced_at = started
+        self._built = self._checked = time.monotonic()
+
+    def sync(self):
+        """Applies rows whose updatedAt moved since the last sync."""
+        started = datetime.now()
+        since = self._synced_at - SYNC_OVERLAP
+
+        offer_rows = _offer_rows(Offer.updatedAt >= since)
+        user_rows = _performer_rows(User.updatedAt >= since)
+        touched = set(db.session.execute(
+            select(Match.performerId).where(Match.updatedAt >= since)
+        ).scalars())
+
+        venue_ids = [r[0] for r in user_rows if r[1] != "performer"]
+        if venue_ids:
+            # venue capacity / rating / deletion feed into their offers' rows
+            offer_rows += _offer_rows(Offer.distributorId.in_(venue_ids))
+        for row in offer_rows:
+            if self._offer_is_live(row):
+                self.offers.upsert(row[0], self._offer_features(row))
+            else:
+                self.offers.remove(row[0])
+
+        performer_rows = {r[0]: r for r in user_rows if r[1] == "performer"}
+        touched -= set(performer_rows)
+        if touched:
+            performer_rows.update((r[0], r) for r in _performer_rows(User.userId.in_(touched)))
+        if performer_rows:
+            stats = _match_stats(Match.performerId.in_(list(performer_rows)))
+            for user_id, row in performer_rows.items():
+                if self._performer_is_live(row):
+                    self.performers.upsert(user_id, self._performer_features(row, stats))
+                else:
+                    self.performers.remove(user_id)
+
+        self._synced_at = started
+        self._checked = time.monotonic()
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._checked < SYNC_INTERVAL:
+            return
+        # the first build blocks; later refreshes are skipped while another thread runs one
+        if not self._lock.acquire(blocking=self._synced_at is None):
+            return
+        try:
+            if self._synced_at is None or now - self._built >= REBUILD_INTERVAL:
+                self.rebuild()
+            elif now - self._checked >= SYNC_INTERVAL:
+                self.sync()
+        finally:
+            self._lock.release()
+
+    # queries
+    def performer_features(self, user_id):
+        feats = self.performers.row(user_id)
+        if feats is None:
+            # not synced yet (or not a live performer)
+            rows = _performer_rows(User.userId == user_id)
+            if not rows or not self._performer_is_live(rows[0]):
+                return None
+            feats = self._performer_features(rows[0], _match_stats(Match.performerId == user_id))
+        return feats
+
+    def offer_features(self, offer_id):
+        feats = self.offers.row(offer_id)
+        if feats is None:
+            # closed offers can still ask for performers
+            rows = _offer_rows(Offer.offerId == offer_id)
+            if not rows:
+                return None
+            feats = self._offer_features(rows[0])
+        return feats
+
+    def recommend_offers(self, user_id, k, exclude=()):
+        """[(offerId, score)] best first, or None if user_id is not a live performer."""
+        self.ensure_fresh()
+        performer = self.performer_features(user_id)
+        if performer is None:
+            return None
+        offers = self.offers
+        ids, active, cols = offers.view()
+        return top_k(ids, active, offers.pos, score_offers(performer, cols), k, exclude)
+
+    def recommend_performers(self, offer_id, k, exclude=()):
+        """[(userId, score)] best first, or None if the offer does not exist."""
+        self.ensure_fresh()
+        offer = self.offer_features(offer_id)
+        if offer is None:
+            return None
+        performers = self.performers
+        ids, active, cols = performers.view()
+        return top_k(ids, active, performers.pos, score_performers(offer, cols), k, exclude)
+
+
+index = RecommendationIndex()
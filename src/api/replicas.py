@@ -0,0 +1,152 @@
+"""
+Read-replica routing.
+
+DATABASE_REPLICA_URLS (comma-separated) adds replica engines as binds
+"replica1", "replica2", ... next to the primary (DATABASE_URL). The session
+then sends a statement to a replica only when all of these hold:
+  - it is a plain SELECT (no FOR UPDATE), not part of a flush;
+  - the request is a GET/HEAD whose view is not marked @primary_only and
+    that has not called use_primary();
+  - the caller (JWT identity) has not written anything in the last
+    REPLICA_STICKY_SECONDS (default 10): users read their own writes.
+Everything else (writes, CLI commands, background jobs) uses the primary.
+One replica is picked per request, at random.
+
+Stickiness is stored like the response cache (RESPONSE_CACHE_BACKEND):
+"shared" pins a user in every worker on the host, "lru" only in the worker
+that served the write (a second, in-process LRU is used when the cache is
+disabled). Bodies that go into the shared caches are rendered on the
+primary (see on_primary()), so a lagging replica never gets cached for
+everyone.
+
+With no replicas configured every hook returns early and the session
+behaves like the stock Flask-SQLAlchemy one.
+"""
+import os
+import random
+import threading
+from contextlib import contextmanager
+
+from flask import current_app, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+REPLICA_PREFIX = "replica"
+SAFE_METHODS = ("GET", "HEAD")
+
+_sticky = None
+_sticky_lock = threading.Lock()
+
+
+def replica_binds(urls: str | None = None) -> dict:
+    """DATABASE_REPLICA_URLS -> {"replica1": url, ...} for SQLALCHEMY_BINDS."""
+    urls = os.getenv("DATABASE_REPLICA_URLS", "") if urls is None else urls
+    return {
+        f"{REPLICA_PREFIX}{i}": url.strip().replace("postgres://", "postgresql://")
+        for i, url in enumerate((u for u in urls.split(",") if u.strip()), start=1)
+    }
+
+
+def engine_label(key) -> str:
+    """Bind key -> name used in metrics ("primary" for the default engine)."""
+    return "primary" if key is None else str(key)
+
+
+def _replica_keys(engines):
+    return [key for key in engines if isinstance(key, str) and key.startswith(REPLICA_PREFIX)]
+
+
+def _sticky_store():
+    global _sticky
+    if _sticky is None:
+        with _sticky_lock:
+            if _sticky is None:
+                from .cache import LRUCache, _make_backend  # cache imports this module
+
+                _sticky = _make_backend(10000) or LRUCache(10000)
+    return _sticky
+
+
+def _identity():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:  # a bad token is the route's business
+        return None
+
+
+def primary_only(view):
+    """Marks a GET view whose reads must see the latest writes."""
+    view.primary_only = True
+    return view
+
+
+def use_primary():
+    """Sends the rest of the current request's reads to the primary."""
+    if has_request_context():
+        request.environ["db.replica"] = None
+
+
+@contextmanager
+def on_primary():
+    """Reads inside the block go to the primary; the request's choice is restored after."""
+    if not has_request_context():
+        yield
+        return
+    env = request.environ
+    saved = env.get("db.replica", ...)
+    env["db.replica"] = None
+    try:
+        yield
+    finally:
+        if saved is ...:
+            env.pop("db.replica", None)
+        else:
+            env["db.replica"] = saved
+
+
+def _choose(engines):
+    """Replica bind key for the current request, or None for the primary."""
+    keys = _replica_keys(engines)
+    if not keys or request.method not in SAFE_METHODS:
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if view is None or getattr(view, "primary_only", False):
+        return None
+    identity = _identity()
+    if identity and _sticky_store().get(f"sticky:{identity}") is not None:
+        return None
+    return random.choice(keys)
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends eligible reads to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and isinstance(clause, Select)
+                and clause._for_update_arg is None and has_request_context()):
+            env = request.environ
+            if "db.replica" not in env:
+                env["db.replica"] = None  # the JWT check below must not recurse
+                env["db.replica"] = _choose(self._db.engines)
+            key = env["db.replica"]
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _after_request(response):
+    if request.method not in SAFE_METHODS and request.method != "OPTIONS" and response.status_code < 400:
+        identity = _identity()
+        if identity:
+            _sticky_store().set(f"sticky:{identity}", b"1", REPLICA_STICKY_SECONDS)
+    return response
+
+
+def init_app(app):
+    """Registers the stickiness hook when replica binds are configured."""
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    if _replica_keys(binds) and REPLICA_STICKY_SECONDS > 0:
+        app.after_request(_after_request)
@@ -1,16 +1,41 @@
 from datetime import datetime
+import base64
+import json
 import os
-from flask import request, jsonify
+import time
+from contextlib import nullcontext
+from flask import request, jsonify, Response, current_app, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
-from sqlalchemy import select, update as sa_update, delete as sa_delete, or_
+from sqlalchemy import (
+    select, update as sa_update, or_, and_, func, case
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from werkzeug.http import http_date
 from sqlalchemy.exc import IntegrityError
 
 # Use the SINGLE shared blueprint from api.__init__
 from . import api_bp as api
 
 # Use the SINGLE db instance defined in models.py
-from api.models import db, User, Offer, Match, Message, Review
-from .utils import hash_password, verify_password
+from sqlalchemy.orm import aliased
+from api.models import db, User, Offer, Match, Message, Review, ChatRead
+from .utils import hash_password, verify_password, password_needs_rehash, PasswordHasherBusy
+from .ratings import apply_review_to_ratings
+from . import fulltext
+from .broker import broker, chat_channel
+from . import cache
+from . import jobs
+from .conditional import conditional
+from .querylog import query_budget
+from .ratelimit import rate_limit
+from .replicas import on_primary, primary_only, use_primary
+from .counters import (
+    add_applications, add_events_finalised, finalised_delta, move_event_finalised, record_message,
+)
+from .serializers import Projection, projection_from_request, fields_key, json_response, dumps
+from .cache import get_permission_cache, invalidate_chat_permissions, chat_perm_key
+from .cache import cached, offer_key, user_key, reviews_key, reviews_prefix, latest_key
+from .cache import OFFERS_LATEST, USERS_LATEST
 
 
 # We store roles as: performer | distributor | admin
@@ -28,6 +53,88 @@ def _parse_iso_dt(s: str):
     except Exception:
         return None
 
+def _encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), int(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(token: str):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_raw, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_raw), int(row_id)
+    except Exception:
+        return None
+
+def _page_args(default_limit: int = 20, max_limit: int = 100):
+    """
+    Reads ?limit=&cursor= from the query string.
+    Returns (limit, cursor, error) where cursor is (createdAt, id) or None.
+    """
+    try:
+        limit = int(request.args.get("limit", default_limit))
+    except ValueError:
+        limit = default_limit
+    limit = max(1, min(limit, max_limit))
+
+    token = request.args.get("cursor")
+    if not token:
+        return limit, None, None
+    cursor = _decode_cursor(token)
+    if not cursor:
+        return limit, None, "invalid cursor"
+    return limit, cursor, None
+
+def _wants_page() -> bool:
+    return "limit" in request.args or "cursor" in request.args
+
+def _keyset(q, created_col, id_col, cursor, limit: int):
+    """Newest first on (createdAt, id); fetches one extra row to detect a next page."""
+    if cursor:
+        created_at, row_id = cursor
+        q = q.where(or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+        ))
+    return q.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+def _projected_page(proj, rows, limit: int, extra_names=()):
+    """
+    rows come from proj.select(*extra, createdAt, id) with one look-ahead row.
+    Returns the { items, nextCursor } payload.
+    """
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    next_cursor = _encode_cursor(page[-1][-2], page[-1][-1]) if has_more and page else None
+    return {"items": proj.to_dicts(page, extra_names), "nextCursor": next_cursor}
+
+BATCH_MAX_ITEMS = 100
+
+def _batch_items(data):
+    """Reads body["items"] for the batch endpoints; returns (items, error)."""
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, "items must be a non-empty array"
+    if len(items) > BATCH_MAX_ITEMS:
+        return None, f"at most {BATCH_MAX_ITEMS} items per batch"
+    return items, None
+
+def _item_int(item, key):
+    try:
+        return int(item.get(key))
+    except Exception:
+        return None
+
+def _upsert(model):
+    """Dialect INSERT that supports .on_conflict_do_update (Postgres / SQLite)."""
+    dialect = postgresql if db.engine.dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+def _busy_response(exc):
+    resp = jsonify({"msg": exc.message, **exc.to_dict()})
+    resp.status_code = exc.status_code
+    resp.headers["Retry-After"] = str(exc.payload.get("retryAfter", 1))
+    return resp
+
 def _normalize_role(role_raw: str) -> str:
     role = (role_raw or "").strip().lower()
     if role == "venue":
@@ -44,42 +151,249 @@ def _current_role() -> str:
     claims = get_jwt() if get_jwt else {}
     return (claims.get("role") or "").lower()
 
+# soft-deleted users (User.deletedAt set) are invisible to every read path
+LIVE_USER = User.deletedAt.is_(None)
+
+def _by_live_user(user_col):
+    """Hides rows written by soft-deleted users (messages, matches, reviews) until the purge."""
+    return user_col.not_in(select(User.userId).where(User.deletedAt.is_not(None)))
+
+def _live_user(user_id: int) -> User | None:
+    user = db.session.get(User, user_id)
+    return user if user and user.deletedAt is None else None
+
 def _ensure_offer(offer_id: int) -> Offer | None:
     return db.session.get(Offer, offer_id)
 
-def _is_offer_owner(user_id: int, offer: Offer) -> bool:
-    return offer and offer.distributorId == user_id
+def _owned_offer(user_id: int, offer_id: int) -> tuple[Offer | None, bool]:
+    """(offer or None, whether user_id is its live owner), in one SELECT."""
+    row = db.session.execute(_owned_offer_stmt(user_id, offer_id)).first()
+    return (None, False) if row is None else (row[0], row[1] is not None)
 
 def _role_from_claims() -> str:
     claims = get_jwt() or {}
     return (claims.get("role") or "").lower()
 
-def _can_view_or_send_messages(user_id: int, role: str, offer: Offer) -> bool:
+def _can_view_or_send_messages(user_id: int, role: str, distributor_id, accepted_id, approved) -> bool:
     if role == "admin":
         return True
     if role in ("distributor", "venue"):
-        return offer.distributorId == user_id
+        return distributor_id == user_id
     if role == "performer":
-        if offer.acceptedPerformerId and int(offer.acceptedPerformerId) == int(user_id):
+        if accepted_id and int(accepted_id) == int(user_id):
             return True
-        m = db.session.execute(
-            select(Match).where(Match.offerId == offer.offerId, Match.performerId == user_id)
-        ).scalar_one_or_none()
-        return bool(m and m.chatApproved)
+        return bool(approved)
     return False
 
-def _recompute_user_ratings(user_id: int):
-    """Recalculate ratingAvg and ratingCount for a user."""
-    rows = db.session.execute(
-        select(Review.score).where(Review.ratedId == user_id)
-    ).scalars().all()
-    count = len(rows)
-    avg = (sum(rows) / count) if count else 0.0
-    u = db.session.get(User, user_id)
-    if u:
-        u.ratingCount = count
-        u.ratingAvg = round(float(avg), 2)
-        db.session.commit()
+CHAT_PERMISSION_TTL = float(os.getenv("CHAT_PERMISSION_TTL", "300"))
+
+def _chat_allowed(user_id: int, role: str, offer_id: int) -> bool | None:
+    """
+    Cached _can_view_or_send_messages per (offer, user, role); a soft-deleted
+    user is never allowed. Returns None if the offer does not exist (never cached).
+    approve_chat / accept / conclude, DELETE /users/<id> and the user purge
+    invalidate the offer's entries.
+    """
+    # the fingerprint and the view both ask: decide once per request, cache or not
+    memo = request.environ.setdefault("chat.allowed", {})
+    if (offer_id, user_id, role) not in memo:
+        memo[offer_id, user_id, role] = _chat_decision(user_id, role, offer_id)
+    return memo[offer_id, user_id, role]
+
+# Statement builders for the hot reads. The views execute them and
+# api/query_plans.py checks the very same statements with EXPLAIN.
+
+def _chat_permission_stmt(user_id: int, offer_id: int):
+    """The offer, the user's chat approval and whether the user is live in one round trip."""
+    approved = (
+        select(Match.chatApproved)
+        .where(Match.offerId == Offer.offerId, Match.performerId == user_id)
+        .scalar_subquery()
+    )
+    live = select(User.userId).where(User.userId == user_id, LIVE_USER).exists()
+    return (
+        select(Offer.distributorId, Offer.acceptedPerformerId, approved, live)
+        .where(Offer.offerId == offer_id)
+    )
+
+def _owned_offer_stmt(user_id: int, offer_id: int):
+    """
+    The offer and the caller's userId if they are its live owner, else NULL:
+    a soft-deleted venue's token still verifies until it expires.
+    """
+    return (
+        select(Offer, User.userId)
+        .outerjoin(User, and_(User.userId == Offer.distributorId, User.userId == user_id, LIVE_USER))
+        .where(Offer.offerId == offer_id)
+    )
+
+def _users_stmt(proj, *conds):
+    return proj.select(User.createdAt, User.userId).where(LIVE_USER, *conds)
+
+def _offers_stmt(proj, *conds):
+    return proj.select(Offer.createdAt, Offer.offerId).where(*conds)
+
+def _latest_stmt(proj, model, limit: int, *conds):
+    created, pk = (User.createdAt, User.userId) if model is User else (Offer.createdAt, Offer.offerId)
+    return proj.select().where(*conds).order_by(created.desc(), pk.desc()).limit(limit)
+
+def _applied_stmt(proj, user_id: int):
+    return (
+        proj.select(Match.status, Match.matchId, Offer.createdAt, Offer.offerId)
+        .join(Match, Match.offerId == Offer.offerId)
+        .where(Match.performerId == user_id)
+    )
+
+def _facets_stmt(conds):
+    return select(Offer.city, Offer.genre, func.count()).where(*conds).group_by(Offer.city, Offer.genre)
+
+def _offer_matches_stmt(proj, offer_id: int):
+    return (
+        proj.select()
+        .where(Match.offerId == offer_id, _by_live_user(Match.performerId))
+        .order_by(Match.createdAt.desc())
+    )
+
+def _messages_stmt(proj, offer_id: int, since: int | None = None):
+    """All of the offer's messages (oldest first), or those after messageId `since`."""
+    q = proj.select().where(Message.offerId == offer_id, _by_live_user(Message.authorId))
+    if since is None:
+        return q.order_by(Message.createdAt.asc())
+    return q.where(Message.messageId > since).order_by(Message.messageId.asc())
+
+def _reviews_stmt(proj, user_id: int):
+    return (
+        proj.select()
+        .where(Review.ratedId == user_id, _by_live_user(Review.raterId))
+        .order_by(Review.createdAt.desc())
+    )
+
+def _chat_decision(user_id: int, role: str, offer_id: int) -> bool | None:
+    backend = get_permission_cache()
+    key = chat_perm_key(offer_id, user_id, role)
+    if backend is not None:
+        hit = backend.get(key)
+        if hit is not None:
+            return hit == b"1"
+
+    # a decision that gets cached is read from the primary (see api/replicas.py)
+    with on_primary() if backend is not None else nullcontext():
+        row = db.session.execute(_chat_permission_stmt(user_id, offer_id)).first()
+    if not row:
+        return None
+    allowed = bool(row[-1]) and _can_view_or_send_messages(user_id, role, *row[:-1])
+    if backend is not None:
+        backend.set(key, b"1" if allowed else b"0", CHAT_PERMISSION_TTL)
+    return allowed
+
+# -------------------------
+# Conditional GET fingerprints (see api/conditional.py)
+# Each returns (seed, last_modified) from one small query, or None to skip.
+# -------------------------
+
+def _fp_agg_stmt(version_col, *conds):
+    return select(func.count(), func.max(version_col)).where(*conds)
+
+def _fp_agg(version_col, *conds):
+    """count(*) + max(version_col) over a filtered set."""
+    count, last = db.session.execute(_fp_agg_stmt(version_col, *conds)).one()
+    return f"{count}:{last}", last
+
+def _fp_user(user_id):
+    if not user_id:
+        return None
+    updated = db.session.execute(
+        select(User.updatedAt).where(User.userId == user_id, LIVE_USER)
+    ).first()
+    return (f"user:{updated[0]}", updated[0]) if updated else None
+
+def _fp_offer(offer_id):
+    updated = db.session.execute(
+        select(Offer.updatedAt).where(Offer.offerId == offer_id)
+    ).first()
+    return (f"offer:{updated[0]}", updated[0]) if updated else None
+
+def _fp_offers(*conds):
+    return _fp_agg(Offer.updatedAt, *conds)
+
+def _fp_users(*conds):
+    return _fp_agg(User.updatedAt, LIVE_USER, *conds)
+
+def _fp_applied_stmt(user_id):
+    return (
+        select(func.count(), func.max(Offer.updatedAt), func.max(Match.updatedAt))
+        .join(Match, Match.offerId == Offer.offerId)
+        .where(Match.performerId == user_id)
+    )
+
+def _fp_applied(user_id):
+    if not _live_user(user_id):
+        return None
+    count, offer_last, match_last = db.session.execute(_fp_applied_stmt(user_id)).one()
+    last = max((d for d in (offer_last, match_last) if d), default=None)
+    return f"{count}:{offer_last}:{match_last}", last
+
+def _fp_search():
+    conds, err = _search_conditions(request.args)
+    return None if err else _fp_offers(*conds)
+
+def _fp_offer_matches(offer_id):
+    user_id = _current_user_id()
+    if not user_id:
+        return None
+    offer, owner = _owned_offer(user_id, offer_id)
+    if not offer or not (_current_role() == "admin" or owner):
+        return None
+    seed, last = _fp_agg(Match.updatedAt, Match.offerId == offer_id, _by_live_user(Match.performerId))
+    return f"{seed}:{offer.updatedAt}", max((d for d in (last, offer.updatedAt) if d), default=None)
+
+def _fp_messages(offer_id):
+    if "wait" in request.args:
+        return None  # long-poll: never answer 304 instead of waiting
+    user_id = _current_user_id()
+    if not user_id or not _chat_allowed(user_id, _role_from_claims(), offer_id):
+        return None
+    count, last_id, last_at = db.session.execute(_fp_messages_stmt(offer_id)).one()
+    return f"{count}:{last_id}", last_at
+
+def _fp_messages_stmt(offer_id):
+    return (
+        select(func.count(), func.max(Message.messageId), func.max(Message.createdAt))
+        .where(Message.offerId == offer_id, _by_live_user(Message.authorId))
+    )
+
+def _fp_dashboard_stmt(user_id, viewer_id):
+    owned = select(Offer.offerId).where(Offer.distributorId == user_id)
+    # chat activity from the offers' own counters instead of scanning messages;
+    # unread counts also move with the viewer's read watermarks
+    return select(
+        func.count(Offer.offerId), func.max(Offer.updatedAt),
+        select(func.max(Match.updatedAt)).where(Match.offerId.in_(owned)).scalar_subquery(),
+        func.sum(Offer.messageCount), func.max(Offer.lastMessageAt),
+        select(func.max(ChatRead.updatedAt))
+        .where(ChatRead.userId == viewer_id, ChatRead.offerId.in_(owned))
+        .scalar_subquery(),
+    ).where(Offer.distributorId == user_id)
+
+def _fp_dashboard(user_id):
+    count, offer_last, match_last, messages, message_last, read_last = db.session.execute(
+        _fp_dashboard_stmt(user_id, _current_user_id())
+    ).one()
+    last = max((d for d in (offer_last, match_last, message_last, read_last) if d), default=None)
+    return f"{count}:{offer_last}:{match_last}:{messages}:{message_last}:{read_last}", last
+
+def _fp_reviews_stmt(user_id):
+    return (
+        select(func.count(), func.max(Review.reviewId), func.max(Review.createdAt))
+        .where(Review.ratedId == user_id, _by_live_user(Review.raterId))
+    )
+
+def _fp_reviews(user_id):
+    if not _live_user(user_id):
+        return None
+    count, last_id, last_at = db.session.execute(_fp_reviews_stmt(user_id)).one()
+    return f"{count}:{last_id}", last_at
+
 # Alias
 @api.route("/register", methods=["POST", "OPTIONS"])
 def register_alias():
@@ -91,6 +405,7 @@ def register_alias():
 # Authentication
 
 @api.route("/login", methods=["POST"])
+@rate_limit("login", "10/minute")
 def login():
     """
     Signin: verifies credentials and returns { user, token }.
@@ -103,20 +418,34 @@ def login():
     email = (data.get("email") or "").strip().lower()
     password = data.get("password") or ""
 
-    user = db.session.scalar(select(User).where(User.email == email))
-    if not user or not verify_password(user.password, password):
-        return jsonify({"msg": "invalid credentials"}), 401
+    user = db.session.scalar(select(User).where(User.email == email, LIVE_USER))
+    # hand the pooled connection back before the slow hash; `user` stays loaded
+    db.session.close()
+    try:
+        if not user or not verify_password(user.password, password):
+            return jsonify({"msg": "invalid credentials"}), 401
+        if password_needs_rehash(user.password):
+            # cost settings changed since this hash was made: upgrade it transparently
+            new_hash = hash_password(password)
+            db.session.execute(
+                sa_update(User).where(User.userId == user.userId).values(password=new_hash)
+            )
+            db.session.commit()
+    except PasswordHasherBusy as e:
+        return _busy_response(e)
 
     token = create_access_token(identity=str(user.userId), additional_claims={"role": user.role})
     return jsonify({"user": user.serialize(), "token": token}), 200
 
 @api.route("/auth/me", methods=["GET"])
+@primary_only
 @jwt_required()
+@conditional(lambda: _fp_user(_current_user_id()))
 def auth_me():
     ident = _current_user_id()
     if not ident:
         return jsonify({"msg": "invalid token"}), 401
-    user = db.session.get(User, ident)
+    user = _live_user(ident)
     if not user:
         return jsonify({"msg": "user not found"}), 404
     return jsonify(user.serialize()), 200
@@ -126,11 +455,28 @@ def auth_me():
 
 
 @api.route('/users', methods=['GET'])
+@conditional(lambda: _fp_users())
 def get_users():
-    rows = db.session.execute(db.select(User)).scalars().all()
-    return jsonify([u.serialize() for u in rows]), 200
+    """
+    Without ?limit/?cursor returns the full list (legacy clients).
+    With them returns { items, nextCursor }, newest first.
+    Optional ?fields=a,b,c returns only those keys.
+    """
+    proj, err = projection_from_request(User)
+    if err:
+        return jsonify({"message": err}), 400
+    q = _users_stmt(proj)
+    if not _wants_page():
+        return json_response(proj.to_dicts(db.session.execute(q).all()))
+
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_keyset(q, User.createdAt, User.userId, cursor, limit)).all()
+    return json_response(_projected_page(proj, rows, limit))
 
 @api.route("/new-user", methods=["POST"])
+@rate_limit("register", "20/hour", burst=5)
 def post_users():
     """
     Signup: creates a user and returns { user, token } so the client is logged in immediately.
@@ -149,7 +495,7 @@ def post_users():
 
     # Admin guard
     if role == "admin":
-        existing_admin = db.session.scalar(select(User).where(User.role == "admin"))
+        existing_admin = db.session.scalar(select(User).where(User.role == "admin", LIVE_USER))
         if existing_admin:
             provided_code = (data.get("adminCode") or "").strip()
             expected_code = os.getenv("ADMIN_SIGNUP_CODE", "")
@@ -196,6 +542,7 @@ def post_users():
         )
         db.session.add(user)
         db.session.commit()
+        cache.invalidate(prefixes=(USERS_LATEST,))
 
         token = create_access_token(identity=str(user.userId), additional_claims={"role": user.role})
         return jsonify({"user": user.serialize(), "token": token}), 201
@@ -203,13 +550,18 @@ def post_users():
     except IntegrityError:
         db.session.rollback()
         return jsonify({"msg": "email already registered"}), 409
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return _busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({"msg": "unexpected error", "detail": str(e)}), 500
 
 @api.route('/users/<int:user_id>', methods=['GET'])
+@conditional(_fp_user)
+@cached(lambda user_id: user_key(user_id))
 def get_user(user_id):
-    user = db.session.get(User, user_id)
+    user = _live_user(user_id)
     if not user:
         return jsonify({"message": "user not found"}), 404
     return jsonify(user.serialize()), 200
@@ -217,13 +569,13 @@ def get_user(user_id):
 @api.route('/users/<int:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
-    user = db.session.get(User, user_id)
+    user = _live_user(user_id)
     if not user:
         return jsonify({"message": "user not found"}), 404
 
     data = request.get_json() or {}
     allowed = ("email", "name", "city", "role", "avatarUrl", "capacity",
-               "genre", "slogan", "bio", "musicians", "eventsFinalised")
+               "genre", "slogan", "bio", "musicians")  # eventsFinalised is server-maintained
     for key in allowed:
         if key in data:
             if key == "role":
@@ -233,12 +585,13 @@ def update_user(user_id):
 
     try:
         db.session.commit()
+        cache.invalidate(user_key(user_id), prefixes=(USERS_LATEST,))
         return jsonify(user.serialize()), 200
     except IntegrityError:
         db.session.rollback()
         return jsonify({"message": "conflict updating user"}), 409
 
-# delete user cascade
+# delete user: tombstone now, cascade purged by a background job (api/purge.py)
 @api.route('/users/<int:user_id>', methods=['DELETE'])
 @jwt_required()
 def delete_user(user_id):
@@ -251,12 +604,12 @@ def delete_user(user_id):
     if role != "admin" and current_id != user_id:
         return jsonify({"message": "forbidden"}), 403
 
-    user = db.session.get(User, user_id)
+    user = _live_user(user_id)
     if not user:
         return jsonify({"message": "user not found"}), 404
 
     if user.role == "admin":
-        admin_count = db.session.query(User).filter_by(role="admin").count()
+        admin_count = db.session.query(User).filter_by(role="admin").filter(LIVE_USER).count()
         if admin_count <= 1:
             return jsonify({"message": "cannot delete the last admin"}), 409
 
@@ -264,31 +617,33 @@ def delete_user(user_id):
         offer_ids = db.session.execute(
             select(Offer.offerId).where(Offer.distributorId == user_id)
         ).scalars().all()
-
+        # their chats and reviews disappear from other users' reads right away
+        chat_ids = set(offer_ids) | set(db.session.execute(
+            select(Match.offerId).where(Match.performerId == user_id)
+        ).scalars())
+        rated_ids = set(db.session.execute(
+            select(Review.ratedId).where(Review.raterId == user_id)
+        ).scalars())
+
+        user.deletedAt = datetime.now()
+        # frees the address for a new signup and blocks logins right away
+        user.email = f"deleted-{user_id}@deleted.invalid"
         if offer_ids:
-            db.session.execute(sa_delete(Message).where(Message.offerId.in_(offer_ids)))
-        db.session.execute(sa_delete(Message).where(Message.authorId == user_id))
-
-        if offer_ids:
-            db.session.execute(sa_delete(Match).where(Match.offerId.in_(offer_ids)))
-        db.session.execute(sa_delete(Match).where(Match.performerId == user_id))
-
-        cond = or_(Review.raterId == user_id, Review.ratedId == user_id)
-        if offer_ids:
-            cond = or_(cond, Review.offerId.in_(offer_ids))
-        db.session.execute(sa_delete(Review).where(cond))
+            # nobody can apply to a venue that is gone while its offers wait for the purge
+            db.session.execute(
+                sa_update(Offer)
+                .where(Offer.distributorId == user_id, Offer.status == "open")
+                .values(status="cancelled")
+            )
+        jobs.enqueue("purge_user", {"userId": user_id}, priority=jobs.PRIORITY_LOW)
+        db.session.commit()
 
-        db.session.execute(
-            sa_update(Offer)
-            .where(Offer.acceptedPerformerId == user_id)
-            .values(acceptedPerformerId=None)
+        cache.invalidate(
+            user_key(user_id), *(offer_key(oid) for oid in offer_ids),
+            prefixes=(USERS_LATEST, OFFERS_LATEST,
+                      *(reviews_prefix(uid) for uid in rated_ids | {user_id})),
         )
-
-        if offer_ids:
-            db.session.execute(sa_delete(Offer).where(Offer.offerId.in_(offer_ids)))
-
-        db.session.delete(user)
-        db.session.commit()
+        invalidate_chat_permissions(*chat_ids)
         return ("", 204)
 
     except Exception as e:
@@ -301,50 +656,166 @@ def delete_user(user_id):
 
 @api.route('/users/<int:user_id>/offers/created', methods=['GET'])
 @jwt_required()
+@conditional(lambda user_id: _fp_offers(Offer.distributorId == user_id))
 def offers_created_by_user(user_id):
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+    q = _offers_stmt(proj, Offer.distributorId == user_id)
+    if not _wants_page():
+        rows = db.session.execute(q.order_by(Offer.createdAt.desc())).all()
+        return json_response(proj.to_dicts(rows))
+
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_keyset(q, Offer.createdAt, Offer.offerId, cursor, limit)).all()
+    return json_response(_projected_page(proj, rows, limit))
+
+def _offer_stats(offer_ids, viewer_id: int) -> dict:
+    """
+    Per-offer application and chat aggregates for the venue dashboard.
+    Totals and last message time come from the offers' counters; the status
+    breakdown and unread counts take one grouped query each, and only over
+    offers that have applications / messages at all.
+    "unread" counts messages from others past the viewer's read watermark
+    (POST /users/me/conversations/<id>/read, or the viewer's own last message).
+    """
+    stats = {oid: {
+        "applications": 0, "pending": 0, "accepted": 0, "rejected": 0, "chatApproved": 0,
+        "rateMin": None, "rateAvg": None, "rateMax": None, "messages": 0, "lastMessageAt": None,
+        "unread": 0,
+    } for oid in offer_ids}
+    if not offer_ids:
+        return stats
+
+    applied, chatted = [], []
+    for oid, apps, messages, last_at in db.session.execute(
+        select(Offer.offerId, Offer.applicationsCount, Offer.messageCount, Offer.lastMessageAt)
+        .where(Offer.offerId.in_(offer_ids))
+    ).all():
+        stats[oid].update(applications=apps, messages=messages,
+                          lastMessageAt=http_date(last_at) if last_at else None)
+        if apps:
+            applied.append(oid)
+        if messages:
+            chatted.append(oid)
+
+    def count_if(cond):
+        return func.sum(case((cond, 1), else_=0))
+
     rows = db.session.execute(
-        select(Offer).where(Offer.distributorId == user_id).order_by(Offer.createdAt.desc())
-    ).scalars().all()
-    return jsonify([o.serialize() for o in rows]), 200
+        select(
+            Match.offerId,
+            count_if(Match.status == "pending"), count_if(Match.status == "accepted"),
+            count_if(Match.status == "rejected"), count_if(Match.chatApproved.is_(True)),
+            func.min(Match.rate), func.avg(Match.rate), func.max(Match.rate),
+        )
+        .where(Match.offerId.in_(applied))
+        .group_by(Match.offerId)
+    ).all() if applied else []
+    for oid, pending, accepted, rejected, approved, rate_min, rate_avg, rate_max in rows:
+        stats[oid].update(
+            pending=pending or 0, accepted=accepted or 0,
+            rejected=rejected or 0, chatApproved=approved or 0,
+            rateMin=float(rate_min) if rate_min is not None else None,
+            rateAvg=round(float(rate_avg), 2) if rate_avg is not None else None,
+            rateMax=float(rate_max) if rate_max is not None else None,
+        )
+
+    if not chatted:
+        return stats
+    rows = db.session.execute(
+        select(Message.offerId, func.count())
+        .outerjoin(ChatRead, and_(ChatRead.offerId == Message.offerId, ChatRead.userId == viewer_id))
+        .where(Message.offerId.in_(chatted), Message.authorId != viewer_id,
+               Message.messageId > func.coalesce(ChatRead.lastReadMessageId, 0),
+               _by_live_user(Message.authorId))
+        .group_by(Message.offerId)
+    ).all()
+    for oid, unread in rows:
+        stats[oid]["unread"] = unread
+    return stats
+
+@api.route('/users/<int:user_id>/offers/dashboard', methods=['GET'])
+@jwt_required()
+@conditional(_fp_dashboard)
+def offers_dashboard(user_id):
+    """
+    The venue's offers, newest first, each with { stats }: application counts by
+    status, chat-approved count, min/avg/max proposed rate, last message time and
+    unread count. Self or admin. Same ?limit/?cursor/?fields as offers/created.
+    """
+    current_id = _current_user_id()
+    if not current_id:
+        return jsonify({"message": "invalid token"}), 401
+    if _current_role() != "admin" and current_id != user_id:
+        return jsonify({"message": "forbidden"}), 403
+
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+    q = _offers_stmt(proj, Offer.distributorId == user_id)
+    if _wants_page():
+        limit, cursor, err = _page_args()
+        if err:
+            return jsonify({"message": err}), 400
+        rows = db.session.execute(_keyset(q, Offer.createdAt, Offer.offerId, cursor, limit)).all()
+        payload = _projected_page(proj, rows, limit)
+        rows = rows[:limit]
+        items = payload["items"]
+    else:
+        rows = db.session.execute(q.order_by(Offer.createdAt.desc())).all()
+        payload = items = proj.to_dicts(rows)
+
+    stats = _offer_stats([row[-1] for row in rows], current_id)
+    for row, item in zip(rows, items):
+        item["stats"] = stats[row[-1]]
+    return json_response(payload)
 
 @api.route('/users/<int:user_id>/offers/applied', methods=['GET'])
 @jwt_required()
+@conditional(_fp_applied)
 def offers_user_applied(user_id):
-    q = (
-        select(Offer, Match.status.label("match_status"), Match.matchId.label("match_id"))
-        .join(Match, Match.offerId == Offer.offerId)
-        .where(Match.performerId == user_id)
-        .order_by(Offer.createdAt.desc())
-    )
-    rows = db.session.execute(q).all()
-
-    out = []
-    for offer, match_status, match_id in rows:
-        item = offer.serialize()
-        item["matchStatus"] = match_status
-        item["matchId"] = match_id
-        out.append(item)
-    return jsonify(out), 200
+    if not _live_user(user_id):
+        return jsonify({"message": "user not found"}), 404
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+    extra_names = ("matchStatus", "matchId")
+    q = _applied_stmt(proj, user_id)
+    if not _wants_page():
+        rows = db.session.execute(q.order_by(Offer.createdAt.desc())).all()
+        return json_response(proj.to_dicts(rows, extra_names))
+
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_keyset(q, Offer.createdAt, Offer.offerId, cursor, limit)).all()
+    return json_response(_projected_page(proj, rows, limit, extra_names))
 
 
 # Offers
 
 
 @api.route('/offers/latest', methods=['GET'])
+@conditional(lambda: _fp_offers())
+@cached(lambda: latest_key(OFFERS_LATEST, fields_key(Offer)))
 def offers_latest():
     try:
         limit = int(request.args.get("limit", 10))
     except ValueError:
         limit = 10
     limit = max(1, min(limit, 50))
-    rows = (
-        db.session.execute(
-            select(Offer).order_by(Offer.createdAt.desc()).limit(limit)
-        ).scalars().all()
-    )
-    return jsonify([o.serialize() for o in rows]), 200
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_latest_stmt(proj, Offer, limit)).all()
+    return json_response(proj.to_dicts(rows))
 
 @api.route('/offers/<int:offer_id>', methods=['GET'])
+@conditional(_fp_offer)
+@cached(lambda offer_id: offer_key(offer_id))
 def get_offer(offer_id):
     offer = _ensure_offer(offer_id)
     if not offer:
@@ -353,9 +824,133 @@ def get_offer(offer_id):
 
 @api.route('/offers', methods=['GET'])
 @jwt_required()
+@conditional(lambda: _fp_offers())
 def get_offers():
-    rows = db.session.execute(db.select(Offer).order_by(Offer.createdAt.desc())).scalars().all()
-    return jsonify([o.serialize() for o in rows]), 200
+    """
+    Without ?limit/?cursor returns the full list (legacy clients).
+    With them returns { items, nextCursor }, newest first.
+    Optional ?fields=a,b,c returns only those keys.
+    """
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+    q = _offers_stmt(proj)
+    if not _wants_page():
+        rows = db.session.execute(q.order_by(Offer.createdAt.desc())).all()
+        return json_response(proj.to_dicts(rows))
+
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_keyset(q, Offer.createdAt, Offer.offerId, cursor, limit)).all()
+    return json_response(_projected_page(proj, rows, limit))
+
+def _search_conditions(args):
+    """
+    Builds WHERE clauses for /offers/search from the query string.
+    Returns (conditions, error).
+    """
+    conds = []
+
+    status = (args.get("status") or "").strip().lower()
+    if status:
+        conds.append(Offer.status == status)
+    city = (args.get("city") or "").strip().lower()
+    if city:
+        conds.append(func.lower(Offer.city) == city)
+    genre = (args.get("genre") or "").strip().lower()
+    if genre:
+        conds.append(func.lower(Offer.genre) == genre)
+
+    for key, col, op in (("dateFrom", Offer.eventDate, "ge"), ("dateTo", Offer.eventDate, "le")):
+        raw = args.get(key)
+        if raw:
+            dt = _parse_iso_dt(raw)
+            if not dt:
+                return None, f"invalid {key}, expected ISO 8601"
+            conds.append(col >= dt if op == "ge" else col <= dt)
+
+    for key, col, op, cast_fn in (
+        ("minBudget", Offer.budget, "ge", float),
+        ("maxBudget", Offer.budget, "le", float),
+        ("minCapacity", Offer.capacity, "ge", int),
+        ("maxCapacity", Offer.capacity, "le", int),
+    ):
+        raw = args.get(key)
+        if raw not in (None, ""):
+            try:
+                val = cast_fn(raw)
+            except ValueError:
+                return None, f"invalid {key}"
+            conds.append(col >= val if op == "ge" else col <= val)
+
+    return conds, None
+
+@api.route('/offers/search', methods=['GET'])
+@jwt_required()
+@conditional(_fp_search)
+def search_offers():
+    """
+    Server-side offer filtering.
+    Query: status, city, genre, dateFrom, dateTo, minBudget, maxBudget,
+           minCapacity, maxCapacity, limit, cursor
+    Returns { items, nextCursor, facets? } — facets ({ city: {..}, genre: {..} })
+    are only computed for the first page (no cursor).
+    """
+    conds, err = _search_conditions(request.args)
+    if err:
+        return jsonify({"message": err}), 400
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+    proj, err = projection_from_request(Offer)
+    if err:
+        return jsonify({"message": err}), 400
+
+    q = _offers_stmt(proj, *conds)
+    rows = db.session.execute(_keyset(q, Offer.createdAt, Offer.offerId, cursor, limit)).all()
+    out = _projected_page(proj, rows, limit)
+
+    if not cursor:
+        # one grouped query, folded into per-city and per-genre counts
+        facets = {"city": {}, "genre": {}}
+        grouped = db.session.execute(_facets_stmt(conds)).all()
+        for c, g, n in grouped:
+            if c:
+                facets["city"][c] = facets["city"].get(c, 0) + n
+            if g:
+                facets["genre"][g] = facets["genre"].get(g, 0) + n
+        out["facets"] = facets
+
+    return json_response(out)
+
+def _fulltext_page(search_fn):
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"message": "q is required"}), 400
+    limit, _, _ = _page_args(default_limit=20, max_limit=50)
+    try:
+        offset = max(0, min(int(request.args.get("offset", 0)), 1000))
+    except ValueError:
+        return jsonify({"message": "invalid offset"}), 400
+
+    rows = search_fn(q, limit + 1, offset)
+    page = rows[:limit]
+    next_offset = offset + limit if len(rows) > limit else None
+    return jsonify({"items": [r.serialize() for r in page], "nextOffset": next_offset}), 200
+
+@api.route('/search/offers', methods=['GET'])
+@jwt_required()
+@conditional(lambda: _fp_offers())
+def fulltext_offers():
+    """Full-text search on offer title/description. Query: q, limit, offset."""
+    return _fulltext_page(fulltext.search_offers)
+
+@api.route('/search/performers', methods=['GET'])
+@conditional(lambda: _fp_users(User.role == "performer"))
+def fulltext_performers():
+    """Full-text search on performer name/bio/slogan/genre. Query: q, limit, offset."""
+    return _fulltext_page(fulltext.search_performers)
 
 @api.route('/offers', methods=['POST'])
 @jwt_required()
@@ -373,7 +968,7 @@ def create_offer():
     if not all(k in data and data[k] for k in required):
         return jsonify({"message": "missing parameters", "required": list(required)}), 400
 
-    distributor = db.session.get(User, user_id)
+    distributor = _live_user(user_id)
     if not distributor:
         return jsonify({"message": "distributor not found"}), 404
 
@@ -399,6 +994,7 @@ def create_offer():
     )
     db.session.add(offer)
     db.session.commit()
+    cache.invalidate(prefixes=(OFFERS_LATEST,))
     return jsonify(offer.serialize()), 201
 
 
@@ -407,12 +1003,15 @@ def create_offer():
 
 @api.route('/offers/<int:offer_id>/apply', methods=['POST'])
 @jwt_required()
+@rate_limit("apply", "30/minute", burst=10)
 def apply_offer(offer_id):
     user_id = _current_user_id()
     if not user_id:
         return jsonify({"message": "invalid token"}), 401
     if _current_role() not in ("performer", "admin"):
         return jsonify({"message": "only performers can apply"}), 403
+    if not _live_user(user_id):
+        return jsonify({"message": "invalid token"}), 401
 
     offer = _ensure_offer(offer_id)
     if not offer:
@@ -452,28 +1051,127 @@ def apply_offer(offer_id):
         chatApproved=False
     )
     db.session.add(m)
+    db.session.flush()
+    add_applications({offer_id: 1})
+    payload = m.serialize()
     db.session.commit()
-    return jsonify(m.serialize()), 201
+    cache.invalidate(offer_key(offer_id), prefixes=(OFFERS_LATEST,))
+    return jsonify(payload), 201
+
+@api.route('/offers/apply/batch', methods=['POST'])
+@jwt_required()
+@rate_limit("apply_batch", "10/minute", burst=3)
+def apply_offers_batch():
+    """
+    Performer applies to many offers in one transaction (one INSERT ... ON CONFLICT).
+    Body: { items: [{ offerId: number, rate: number, message?: string }] }
+    Returns { results } in input order; per item 201 (new application), 200 (re-applied:
+    rate/message updated, back to pending), 400 (invalid / offer not open) or 404.
+    """
+    user_id = _current_user_id()
+    if not user_id:
+        return jsonify({"message": "invalid token"}), 401
+    if _current_role() not in ("performer", "admin"):
+        return jsonify({"message": "only performers can apply"}), 403
+    if not _live_user(user_id):
+        return jsonify({"message": "invalid token"}), 401
+
+    items, err = _batch_items(request.get_json(silent=True))
+    if err:
+        return jsonify({"message": err}), 400
+
+    results = [None] * len(items)
+    wanted = {}  # offerId -> (index, rate, message)
+    for i, item in enumerate(items):
+        offer_id = _item_int(item, "offerId") if isinstance(item, dict) else None
+        if offer_id is None:
+            results[i] = {"status": 400, "message": "offerId required"}
+            continue
+        if offer_id in wanted:
+            results[i] = {"offerId": offer_id, "status": 400, "message": "duplicate offerId"}
+            continue
+        if item.get("rate") in (None, ""):
+            results[i] = {"offerId": offer_id, "status": 400, "message": "rate is required"}
+            continue
+        try:
+            rate = float(item["rate"])
+            if rate < 0:
+                raise ValueError()
+        except Exception:
+            results[i] = {"offerId": offer_id, "status": 400, "message": "invalid rate"}
+            continue
+        wanted[offer_id] = (i, rate, (item.get("message") or "").strip() or None)
+
+    statuses = dict(db.session.execute(
+        select(Offer.offerId, Offer.status).where(Offer.offerId.in_(list(wanted)))
+    ).all()) if wanted else {}
+    open_ids = [oid for oid in wanted if statuses.get(oid) == "open"]
+
+    existing = set()
+    if open_ids:
+        existing = set(db.session.execute(
+            select(Match.offerId)
+            .where(Match.performerId == user_id, Match.offerId.in_(open_ids))
+        ).scalars())
+        stmt = _upsert(Match).values([
+            {"performerId": user_id, "offerId": oid, "status": "pending",
+             "rate": wanted[oid][1], "message": wanted[oid][2], "chatApproved": False}
+            for oid in open_ids
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["performerId", "offerId"],
+            set_={
+                "rate": stmt.excluded.rate,
+                "status": "pending",
+                "message": func.coalesce(stmt.excluded.message, Match.message),
+                "updatedAt": datetime.now(),
+            },
+        )
+        db.session.execute(stmt)
+        # a concurrent apply to the same offer can make this off by one; reconcile fixes it
+        added = [oid for oid in open_ids if oid not in existing]
+        add_applications({oid: 1 for oid in added})
+        db.session.commit()
+        if added:
+            cache.invalidate(*(offer_key(oid) for oid in added), prefixes=(OFFERS_LATEST,))
+
+    proj = Projection(Match)
+    rows = db.session.execute(
+        proj.select(Match.offerId)
+        .where(Match.performerId == user_id, Match.offerId.in_(open_ids))
+    ).all() if open_ids else []
+    matches = {row[-1]: m for row, m in zip(rows, proj.to_dicts(rows))}
+    for offer_id, (i, _, _) in wanted.items():
+        if offer_id in matches:
+            results[i] = {"offerId": offer_id, "status": 200 if offer_id in existing else 201,
+                          "match": matches[offer_id]}
+        elif offer_id in statuses:
+            results[i] = {"offerId": offer_id, "status": 400, "message": "offer is not open"}
+        else:
+            results[i] = {"offerId": offer_id, "status": 404, "message": "offer not found"}
+    return json_response({"results": results})
 
 @api.route('/offers/<int:offer_id>/matches', methods=['GET'])
 @jwt_required()
+@conditional(_fp_offer_matches)
 def list_offer_matches(offer_id):
     user_id = _current_user_id()
     if not user_id:
         return jsonify({"message": "invalid token"}), 401
     role = _current_role()
 
-    offer = _ensure_offer(offer_id)
+    offer, owner = _owned_offer(user_id, offer_id)
     if not offer:
         return jsonify({"message": "offer not found"}), 404
 
-    if not (role == "admin" or _is_offer_owner(user_id, offer)):
+    if not (role == "admin" or owner):
         return jsonify({"message": "forbidden"}), 403
 
-    rows = db.session.execute(
-        select(Match).where(Match.offerId == offer_id).order_by(Match.createdAt.desc())
-    ).scalars().all()
-    return jsonify([m.serialize() for m in rows]), 200
+    proj, err = projection_from_request(Match)
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_offer_matches_stmt(proj, offer_id)).all()
+    return json_response(proj.to_dicts(rows))
 
 @api.route('/offers/<int:offer_id>/approve-chat', methods=['POST'])
 @jwt_required()
@@ -487,10 +1185,10 @@ def approve_chat(offer_id):
         return jsonify({"message": "invalid token"}), 401
     role = _current_role()
 
-    offer = _ensure_offer(offer_id)
+    offer, owner = _owned_offer(user_id, offer_id)
     if not offer:
         return jsonify({"message": "offer not found"}), 404
-    if not (role == "admin" or _is_offer_owner(user_id, offer)):
+    if not (role == "admin" or owner):
         return jsonify({"message": "forbidden"}), 403
 
     data = request.get_json() or {}
@@ -508,49 +1206,132 @@ def approve_chat(offer_id):
 
     match.chatApproved = approved
     db.session.commit()
+    invalidate_chat_permissions(offer_id)
     return jsonify(match.serialize()), 200
 
-@api.route('/offers/<int:offer_id>/accept', methods=['POST'])
+@api.route('/offers/<int:offer_id>/approve-chat/batch', methods=['POST'])
 @jwt_required()
-def accept_performer(offer_id):
+def approve_chat_batch(offer_id):
     """
-    Venue/admin accepts a given performer -> marks their match accepted and rejects others.
-    Body: { performerId: number }
+    Venue/admin approves or revokes chat for many performers on this offer in one transaction.
+    Body: { items: [{ performerId: number, approved?: boolean }] }  (default approved=True)
+    Returns { results } in input order; each result has its own status (200 | 400 | 404).
     """
     user_id = _current_user_id()
     if not user_id:
         return jsonify({"message": "invalid token"}), 401
     role = _current_role()
 
-    offer = _ensure_offer(offer_id)
+    offer, owner = _owned_offer(user_id, offer_id)
     if not offer:
         return jsonify({"message": "offer not found"}), 404
-    if not (role == "admin" or _is_offer_owner(user_id, offer)):
+    if not (role == "admin" or owner):
         return jsonify({"message": "forbidden"}), 403
 
+    items, err = _batch_items(request.get_json(silent=True))
+    if err:
+        return jsonify({"message": err}), 400
+
+    results = [None] * len(items)
+    wanted = {}  # performerId -> (index, approved)
+    for i, item in enumerate(items):
+        performer_id = _item_int(item, "performerId") if isinstance(item, dict) else None
+        if performer_id is None:
+            results[i] = {"status": 400, "message": "performerId required"}
+        elif performer_id in wanted:
+            results[i] = {"performerId": performer_id, "status": 400, "message": "duplicate performerId"}
+        else:
+            wanted[performer_id] = (i, bool(item.get("approved", True)))
+
+    found = set()
+    if wanted:
+        found = set(db.session.execute(
+            select(Match.performerId)
+            .where(Match.offerId == offer_id, Match.performerId.in_(list(wanted)))
+        ).scalars())
+        for approved in (True, False):
+            ids = [pid for pid, (_, flag) in wanted.items() if flag is approved and pid in found]
+            if ids:
+                db.session.execute(
+                    sa_update(Match)
+                    .where(Match.offerId == offer_id, Match.performerId.in_(ids))
+                    .values(chatApproved=approved)
+                    .execution_options(synchronize_session=False)
+                )
+        db.session.commit()
+    if found:
+        invalidate_chat_permissions(offer_id)
+
+    proj = Projection(Match)
+    rows = db.session.execute(
+        proj.select(Match.performerId)
+        .where(Match.offerId == offer_id, Match.performerId.in_(list(found)))
+    ).all() if found else []
+    matches = {row[-1]: m for row, m in zip(rows, proj.to_dicts(rows))}
+    for performer_id, (i, _) in wanted.items():
+        if performer_id in matches:
+            results[i] = {"performerId": performer_id, "status": 200, "match": matches[performer_id]}
+        else:
+            results[i] = {"performerId": performer_id, "status": 404, "message": "match not found"}
+    return json_response({"results": results})
+
+@api.route('/offers/<int:offer_id>/accept', methods=['POST'])
+@query_budget(4)
+@jwt_required()
+def accept_performer(offer_id):
+    """
+    Venue/admin accepts a given performer -> marks their match accepted and rejects others.
+    Body: { performerId: number }
+    """
+    user_id = _current_user_id()
+    if not user_id:
+        return jsonify({"message": "invalid token"}), 401
+    role = _current_role()
+
     data = request.get_json() or {}
     try:
         performer_id = int(data.get("performerId"))
     except Exception:
-        return jsonify({"message": "performerId required"}), 400
+        performer_id = None
 
-    target = db.session.scalar(
-        select(Match).where(Match.offerId == offer_id, Match.performerId == performer_id)
-    )
+    # the offer, the caller's ownership and the target match in one round trip
+    stmt = _owned_offer_stmt(user_id, offer_id)
+    if performer_id is not None:
+        stmt = stmt.add_columns(Match).outerjoin(
+            Match, and_(Match.offerId == Offer.offerId, Match.performerId == performer_id)
+        )
+    row = db.session.execute(stmt).first()
+    offer, owner_id = (row[0], row[1]) if row else (None, None)
+    target = row[2] if row and performer_id is not None else None
+    if not offer:
+        return jsonify({"message": "offer not found"}), 404
+    if not (role == "admin" or owner_id is not None):
+        return jsonify({"message": "forbidden"}), 403
+    if performer_id is None:
+        return jsonify({"message": "performerId required"}), 400
     if not target:
         return jsonify({"message": "match not found"}), 404
 
-    target.status = "accepted"
-    offer.acceptedPerformerId = performer_id
-
-    # reject the rest (BUGFIX: use sa_update)
+    # accept the target and reject the rest in one statement
     db.session.execute(
         sa_update(Match)
-        .where(Match.offerId == offer_id, Match.performerId != performer_id)
-        .values(status="rejected")
+        .where(Match.offerId == offer_id)
+        .values(status=case((Match.performerId == performer_id, "accepted"), else_="rejected"))
+        .execution_options(synchronize_session=False)
     )
+    moved = []
+    if offer.acceptedPerformerId != performer_id and finalised_delta("open", offer.status):
+        # re-assigning a closed offer moves the finalised event to the new performer
+        move_event_finalised(offer.acceptedPerformerId, performer_id)
+        moved = [uid for uid in (offer.acceptedPerformerId, performer_id) if uid is not None]
+    offer.acceptedPerformerId = performer_id
+    # serialized before commit, so no refresh SELECTs afterwards
+    payload = {"offer": offer.serialize(), "accepted": {**target.serialize(), "status": "accepted"}}
     db.session.commit()
-    return jsonify({"offer": offer.serialize(), "accepted": target.serialize()}), 200
+    cache.invalidate(offer_key(offer_id), *(user_key(uid) for uid in moved),
+                     prefixes=(OFFERS_LATEST,) + ((USERS_LATEST,) if moved else ()))
+    invalidate_chat_permissions(offer_id)
+    return jsonify(payload), 200
 
 @api.route('/offers/<int:offer_id>/conclude', methods=['POST'])
 @jwt_required()
@@ -564,10 +1345,10 @@ def conclude_offer(offer_id):
         return jsonify({"message": "invalid token"}), 401
     role = _current_role()
 
-    offer = _ensure_offer(offer_id)
+    offer, owner = _owned_offer(user_id, offer_id)
     if not offer:
         return jsonify({"message": "offer not found"}), 404
-    if not (role == "admin" or _is_offer_owner(user_id, offer)):
+    if not (role == "admin" or owner):
         return jsonify({"message": "forbidden"}), 403
 
     data = request.get_json() or {}
@@ -575,70 +1356,324 @@ def conclude_offer(offer_id):
     if new_status not in ("closed", "cancelled"):
         return jsonify({"message": "invalid status"}), 400
 
-    offer.status = new_status
+    old_status = offer.status
+    events = 0
+    if new_status != old_status:
+        # compare-and-set, so two concurrent concludes count the event once
+        changed = db.session.execute(
+            sa_update(Offer)
+            .where(Offer.offerId == offer_id, Offer.status == old_status)
+            .values(status=new_status)
+        ).rowcount
+        if not changed:
+            db.session.rollback()
+            return jsonify({"message": "offer changed concurrently, retry"}), 409
+        events = finalised_delta(old_status, new_status) if offer.acceptedPerformerId else 0
+        add_events_finalised(offer.acceptedPerformerId, events)
+    payload = offer.serialize()
     db.session.commit()
-    return jsonify(offer.serialize()), 200
+    cache.invalidate(offer_key(offer_id), prefixes=(OFFERS_LATEST,))
+    if events:
+        cache.invalidate(user_key(offer.acceptedPerformerId), prefixes=(USERS_LATEST,))
+    invalidate_chat_permissions(offer_id)
+    return jsonify(payload), 200
 
 
 # Messages
 
+MESSAGE_WAIT_MAX = 30.0
+MESSAGE_STREAM_SECONDS = 55.0
+
+def _messages_after(offer_id: int, since: int) -> list:
+    proj = Projection(Message)
+    rows = db.session.execute(_messages_stmt(proj, offer_id, since)).all()
+    return proj.to_dicts(rows)
+
 
 @api.route('/offers/<int:offer_id>/messages', methods=['GET'])
+@query_budget(3)
 @jwt_required()
+@conditional(_fp_messages)
 def get_messages_for_offer(offer_id):
     try:
         user_id = int(get_jwt_identity())
     except Exception:
         return jsonify({"message": "invalid token identity"}), 401
 
-    role = _role_from_claims()
-    offer = db.session.get(Offer, offer_id)
-    if not offer:
+    allowed = _chat_allowed(user_id, _role_from_claims(), offer_id)
+    if allowed is None:
         return jsonify({"message": "offer not found"}), 404
+    if not allowed:
+        return jsonify({"message": "chat not approved for this offer"}), 403
+
+    # Incremental fetch: ?since=<messageId> returns only newer messages.
+    # Long-poll: add ?wait=<seconds> (max 30) to block until one arrives.
+    since = request.args.get("since")
+    if since is None:
+        proj, err = projection_from_request(Message)
+        if err:
+            return jsonify({"message": err}), 400
+        rows = db.session.execute(_messages_stmt(proj, offer_id)).all()
+        return json_response(proj.to_dicts(rows))
+
+    try:
+        since = int(since)
+        wait = max(0.0, min(float(request.args.get("wait", 0)), MESSAGE_WAIT_MAX))
+    except ValueError:
+        return jsonify({"message": "since and wait must be numbers"}), 400
+
+    if wait:
+        use_primary()  # woken by the broker: the new row may not be on a replica yet
+    items = _messages_after(offer_id, since)
+    if not items and wait:
+        db.session.close()  # don't hold a pooled connection while parked
+        if broker.wait(chat_channel(offer_id), since, wait) is not None:
+            items = _messages_after(offer_id, since)
+    return json_response(items)
+
+@api.route('/offers/<int:offer_id>/messages/stream', methods=['GET'])
+@primary_only
+@jwt_required()
+def stream_messages_for_offer(offer_id):
+    """
+    Server-Sent Events feed of new messages for an offer.
+    Starts after ?since=<messageId> / Last-Event-ID, or after the newest message.
+    Each connection lives MESSAGE_STREAM_SECONDS; clients reconnect with Last-Event-ID.
+    Needs a threaded/async gunicorn worker class so streams don't pin sync workers.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+    except Exception:
+        return jsonify({"message": "invalid token identity"}), 401
 
-    if not _can_view_or_send_messages(user_id, role, offer):
+    allowed = _chat_allowed(user_id, _role_from_claims(), offer_id)
+    if allowed is None:
+        return jsonify({"message": "offer not found"}), 404
+    if not allowed:
         return jsonify({"message": "chat not approved for this offer"}), 403
 
-    rows = db.session.execute(
-        select(Message).where(Message.offerId == offer_id).order_by(Message.createdAt.asc())
-    ).scalars().all()
-    return jsonify([m.serialize() for m in rows]), 200
+    since = request.args.get("since") or request.headers.get("Last-Event-ID")
+    if since is None:
+        since = db.session.scalar(
+            select(func.max(Message.messageId)).where(Message.offerId == offer_id)
+        ) or 0
+    try:
+        since = int(since)
+    except ValueError:
+        return jsonify({"message": "invalid since"}), 400
+    db.session.close()
+
+    channel = chat_channel(offer_id)
+
+    def events():
+        last = since
+        deadline = time.monotonic() + MESSAGE_STREAM_SECONDS
+        yield "retry: 3000\n\n"
+        while time.monotonic() < deadline:
+            items = _messages_after(offer_id, last)
+            db.session.close()
+            for item in items:
+                last = item["messageId"]
+                yield f"id: {last}\nevent: message\ndata: {current_app.json.dumps(item)}\n\n"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if broker.wait(channel, last, min(15.0, remaining)) is None:
+                yield ": keep-alive\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @api.route('/offers/<int:offer_id>/messages', methods=['POST'])
 @jwt_required()
+@rate_limit("message", "60/minute", burst=20)
 def post_message_for_offer(offer_id):
     try:
         user_id = int(get_jwt_identity())
     except Exception:
         return jsonify({"message": "invalid token identity"}), 401
 
-    role = _role_from_claims()
-    offer = db.session.get(Offer, offer_id)
-    if not offer:
-        return jsonify({"message": "offer not found"}), 404
-
     data = request.get_json() or {}
     body = (data.get("body") or "").strip()
     if not body:
         return jsonify({"message": "body is required"}), 400
 
-    if not _can_view_or_send_messages(user_id, role, offer):
+    allowed = _chat_allowed(user_id, _role_from_claims(), offer_id)
+    if allowed is None:
+        return jsonify({"message": "offer not found"}), 404
+    if not allowed:
         return jsonify({"message": "chat not approved for this offer"}), 403
 
-    msg = Message(offerId=offer.offerId, authorId=user_id, body=body)
+    msg = Message(offerId=offer_id, authorId=user_id, body=body)
     db.session.add(msg)
+    db.session.flush()
+    record_message(offer_id, msg.createdAt)
+    _advance_read(user_id, offer_id, msg.messageId)  # you have read what you answer to
+    payload = msg.serialize()  # before commit, so no refresh SELECT afterwards
     db.session.commit()
-    return jsonify(msg.serialize()), 201
+    try:
+        broker.publish(chat_channel(offer_id), payload["messageId"])
+    except OSError:
+        # listeners fall back to their own timeout; the message itself is stored
+        current_app.logger.exception("chat broker publish failed")
+    return jsonify(payload), 201
+
+
+# Conversations (chat inbox)
+
+CONVERSATION_PREVIEW_CHARS = 120
+
+def _advance_read(user_id: int, offer_id: int, message_id: int):
+    """
+    Moves the user's read watermark on the offer up to message_id (never back)
+    with one upsert; returns the resulting watermark. Does not commit.
+    """
+    stmt = _upsert(ChatRead).values(userId=user_id, offerId=offer_id, lastReadMessageId=message_id)
+    ahead = stmt.excluded.lastReadMessageId > ChatRead.lastReadMessageId
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["userId", "offerId"],
+        set_={
+            "lastReadMessageId": case((ahead, stmt.excluded.lastReadMessageId),
+                                      else_=ChatRead.lastReadMessageId),
+            "updatedAt": case((ahead, datetime.now()), else_=ChatRead.updatedAt),
+        },
+    )
+    return db.session.execute(stmt.returning(ChatRead.lastReadMessageId)).scalar()
+
+def _conversations_query(user_id: int, role: str):
+    """
+    One row per chat the user takes part in: offer fields, read watermark,
+    unread count (others' messages past the watermark) and the newest message,
+    newest activity first. Returns (select, sort column) or None for unknown roles.
+    """
+    approved = select(Match.offerId).where(Match.performerId == user_id, Match.chatApproved.is_(True))
+    has_chat = or_(
+        Offer.messageCount > 0,
+        select(Match.matchId).where(Match.offerId == Offer.offerId, Match.chatApproved.is_(True)).exists(),
+    )
+    member = []
+    if role in ("distributor", "venue", "admin"):
+        member.append(and_(Offer.distributorId == user_id, has_chat))
+    if role in ("performer", "admin"):
+        member += [Offer.acceptedPerformerId == user_id, Offer.offerId.in_(approved)]
+    if not member:
+        return None
+
+    watermark = func.coalesce(ChatRead.lastReadMessageId, 0)
+    unread = (
+        select(func.count()).select_from(Message)
+        .where(Message.offerId == Offer.offerId, Message.messageId > watermark,
+               Message.authorId != user_id, _by_live_user(Message.authorId))
+        .scalar_subquery()
+    )
+    last = aliased(Message)
+    newest = (
+        select(func.max(Message.messageId))
+        .where(Message.offerId == Offer.offerId, _by_live_user(Message.authorId))
+        .scalar_subquery()
+    )
+    sort_at = func.coalesce(Offer.lastMessageAt, Offer.createdAt)
+    q = (
+        select(Offer.offerId, Offer.title, Offer.status, Offer.distributorId,
+               Offer.acceptedPerformerId, Offer.messageCount, watermark, unread,
+               last.messageId, last.authorId, last.body, last.createdAt,
+               sort_at, Offer.offerId)
+        .outerjoin(ChatRead, and_(ChatRead.offerId == Offer.offerId, ChatRead.userId == user_id))
+        .outerjoin(last, last.messageId == newest)
+        .where(or_(*member))
+    )
+    return q, sort_at
+
+@api.route('/users/me/conversations', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+def my_conversations():
+    """
+    The caller's chats (offers they own with chat activity, or whose chat they
+    were approved for), newest activity first, each with the last message
+    preview and unread count. ?limit (default 20) & ?cursor page through them.
+    """
+    user_id = _current_user_id()
+    if not user_id:
+        return jsonify({"message": "invalid token"}), 401
+    built = _conversations_query(user_id, _current_role())
+    if built is None:
+        return jsonify({"message": "forbidden"}), 403
+    limit, cursor, err = _page_args()
+    if err:
+        return jsonify({"message": err}), 400
+
+    q, sort_at = built
+    rows = db.session.execute(_keyset(q, sort_at, Offer.offerId, cursor, limit)).all()
+    items = []
+    for (offer_id, title, status, distributor_id, accepted_id, message_count, read_id, unread,
+         message_id, author_id, body, created_at, _, _) in rows[:limit]:
+        items.append({
+            "offerId": offer_id,
+            "title": title,
+            "status": status,
+            "distributorId": distributor_id,
+            "acceptedPerformerId": accepted_id,
+            "messageCount": message_count,
+            "lastReadMessageId": read_id,
+            "unread": unread,
+            "lastMessage": {
+                "messageId": message_id,
+                "authorId": author_id,
+                "body": body[:CONVERSATION_PREVIEW_CHARS],
+                "createdAt": http_date(created_at),
+            } if message_id is not None else None,
+        })
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(rows[limit - 1][-2], rows[limit - 1][-1])
+    return json_response({"items": items, "nextCursor": next_cursor})
+
+@api.route('/users/me/conversations/<int:offer_id>/read', methods=['POST'])
+@query_budget(3)
+@jwt_required()
+def mark_conversation_read(offer_id):
+    """
+    Advances the caller's read watermark on the offer's chat.
+    Optional body: { messageId } (default: the newest message). Never moves back.
+    """
+    user_id = _current_user_id()
+    if not user_id:
+        return jsonify({"message": "invalid token"}), 401
+    allowed = _chat_allowed(user_id, _role_from_claims(), offer_id)
+    if allowed is None:
+        return jsonify({"message": "offer not found"}), 404
+    if not allowed:
+        return jsonify({"message": "chat not approved for this offer"}), 403
+
+    data = request.get_json(silent=True) or {}
+    upto = select(func.max(Message.messageId)).where(Message.offerId == offer_id)
+    if data.get("messageId") is not None:
+        message_id = _item_int(data, "messageId")
+        if message_id is None:
+            return jsonify({"message": "invalid messageId"}), 400
+        upto = upto.where(Message.messageId <= message_id)
+    watermark = _advance_read(user_id, offer_id, db.session.scalar(upto) or 0)
+    db.session.commit()
+    return jsonify({"offerId": offer_id, "lastReadMessageId": watermark}), 200
 
 
 # Reviews
 
 @api.route('/users/<int:user_id>/reviews', methods=['GET'])
+@conditional(_fp_reviews)
+@cached(lambda user_id: reviews_key(user_id, fields_key(Review)))
 def get_reviews_for_user(user_id):
-    rows = db.session.execute(
-        select(Review).where(Review.ratedId == user_id).order_by(Review.createdAt.desc())
-    ).scalars().all()
-    return jsonify([r.serialize() for r in rows]), 200
+    if not _live_user(user_id):
+        return jsonify({"message": "user not found"}), 404
+    proj, err = projection_from_request(Review)
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_reviews_stmt(proj, user_id)).all()
+    return json_response(proj.to_dicts(rows))
 
 @api.route('/reviews', methods=['POST'])
 @jwt_required()
@@ -663,6 +1698,11 @@ def create_review():
         return jsonify({"message": "invalid token"}), 401
     if role != "admin" and current_id != rater_id:
         return jsonify({"message": "forbidden"}), 403
+    people = {current_id, rater_id, rated_id}
+    if db.session.scalar(
+        select(func.count()).select_from(User).where(User.userId.in_(people), LIVE_USER)
+    ) != len(people):
+        return jsonify({"message": "user not found"}), 404
 
     offer = db.session.get(Offer, offer_id)
     if not offer:
@@ -694,7 +1734,10 @@ def create_review():
             comment=comment
         )
         db.session.add(review)
+        db.session.flush()
+        apply_review_to_ratings(rated_id, score, 1)
         db.session.commit()
+        cache.invalidate(user_key(rated_id), prefixes=(USERS_LATEST, reviews_prefix(rated_id)))
     except IntegrityError:
         db.session.rollback()
         return jsonify({"message": "you already reviewed this user for this offer"}), 409
@@ -702,7 +1745,6 @@ def create_review():
         db.session.rollback()
         return jsonify({"message": "failed to create review", "detail": str(e)}), 500
 
-    _recompute_user_ratings(rated_id)
     return jsonify(review.serialize()), 201
 
 @api.route('/reviews/<int:review_id>', methods=['DELETE'])
@@ -711,10 +1753,10 @@ def delete_review(review_id):
     review = db.session.get(Review, review_id)
     if not review:
         return jsonify({"message": "review not found"}), 404
-    rated_id = review.ratedId
     db.session.delete(review)
+    apply_review_to_ratings(review.ratedId, review.score, -1)
     db.session.commit()
-    _recompute_user_ratings(rated_id)
+    cache.invalidate(user_key(review.ratedId), prefixes=(USERS_LATEST, reviews_prefix(review.ratedId)))
     return jsonify({"deleted": review_id}), 200
 
 
@@ -722,6 +1764,8 @@ def delete_review(review_id):
 
 
 @api.route('/users/latest', methods=['GET'])
+@conditional(lambda: _fp_users(User.role == _normalize_role(request.args.get("role"))))
+@cached(lambda: latest_key(USERS_LATEST, fields_key(User)))
 def users_latest():
     role = _normalize_role(request.args.get("role"))
     try:
@@ -733,12 +1777,166 @@ def users_latest():
     if role not in ("performer", "distributor"):
         return jsonify({"message": "invalid or missing role"}), 400
 
-    rows = (
-        db.session.execute(
-            db.select(User)
-              .where(User.role == role)
-              .order_by(User.createdAt.desc())
-              .limit(limit)
-        ).scalars().all()
+    proj, err = projection_from_request(User)
+    if err:
+        return jsonify({"message": err}), 400
+    rows = db.session.execute(_latest_stmt(proj, User, limit, User.role == role, LIVE_USER)).all()
+    return json_response(proj.to_dicts(rows))
+
+
+# Recommendations (api/recommend.py)
+
+def _limit_arg(default: int = 10, max_limit: int = 50) -> int:
+    try:
+        limit = int(request.args.get("limit", default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, max_limit))
+
+def _recommendations():
+    # imported on first use: keeps numpy out of worker startup
+    from .recommend import index
+    return index
+
+@api.route('/users/<int:user_id>/recommended-offers', methods=['GET'])
+@jwt_required()
+def recommended_offers(user_id):
+    """
+    Open offers that best fit this performer, best first: [ {...offer, score} ].
+    ?limit= (default 10, max 50). Offers already applied to are skipped.
+    """
+    current_id = _current_user_id()
+    if not current_id:
+        return jsonify({"message": "invalid token"}), 401
+    if _current_role() != "admin" and current_id != user_id:
+        return jsonify({"message": "forbidden"}), 403
+
+    applied = db.session.execute(
+        select(Match.offerId).where(Match.performerId == user_id)
+    ).scalars().all()
+    ranked = _recommendations().recommend_offers(user_id, _limit_arg(), exclude=applied)
+    if ranked is None:
+        return jsonify({"message": "performer not found"}), 404
+    if not ranked:
+        return json_response([])
+
+    proj = Projection(Offer)
+    rows = db.session.execute(
+        proj.select(Offer.offerId).where(Offer.offerId.in_([oid for oid, _ in ranked]))
+    ).all()
+    offers = {row[-1]: o for row, o in zip(rows, proj.to_dicts(rows))}
+    return json_response([
+        {**offers[oid], "score": round(score, 4)} for oid, score in ranked if oid in offers
+    ])
+
+@api.route('/offers/<int:offer_id>/recommended-performers', methods=['GET'])
+@jwt_required()
+def recommended_performers(offer_id):
+    """
+    Performers that best fit this offer, best first: [ {...user, score} ].
+    Owner/admin only. ?limit= (default 10, max 50). Performers who already applied are skipped.
+    """
+    user_id = _current_user_id()
+    if not user_id:
+        return jsonify({"message": "invalid token"}), 401
+    offer, owner = _owned_offer(user_id, offer_id)
+    if not offer:
+        return jsonify({"message": "offer not found"}), 404
+    if not (_current_role() == "admin" or owner):
+        return jsonify({"message": "forbidden"}), 403
+
+    applied = db.session.execute(
+        select(Match.performerId).where(Match.offerId == offer_id)
+    ).scalars().all()
+    ranked = _recommendations().recommend_performers(offer_id, _limit_arg(), exclude=applied)
+    if not ranked:
+        return json_response([])
+
+    proj = Projection(User)
+    rows = db.session.execute(
+        proj.select(User.userId)
+        .where(User.userId.in_([uid for uid, _ in ranked]), LIVE_USER)
+    ).all()
+    users = {row[-1]: u for row, u in zip(rows, proj.to_dicts(rows))}
+    return json_response([
+        {**users[uid], "score": round(score, 4)} for uid, score in ranked if uid in users
+    ])
+
+
+# Batch (multiplexed reads)
+
+BATCH_MAX_REQUESTS = 20
+# long-lived or recursive endpoints can't run inside a batch
+_BATCH_EXCLUDED = {"api.batch", "api.stream_messages_for_offer"}
+_BATCH_FORWARDED_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+def _run_subrequest(path: str, headers: dict):
+    """
+    Dispatches one GET through the normal route (auth, cache, ETag) inside
+    the current app context, so it shares the outer request's DB session.
+    Returns (status, etag, body bytes | None).
+    """
+    app = current_app._get_current_object()
+    with app.test_request_context(path, method="GET", headers=headers):
+        if request.routing_exception is not None:
+            exc = request.routing_exception
+            return getattr(exc, "code", 400), None, dumps({"message": exc.description})
+        if request.url_rule.endpoint in _BATCH_EXCLUDED or "wait" in request.args:
+            return 400, None, dumps({"message": "endpoint not allowed in a batch"})
+        try:
+            resp = app.full_dispatch_request()
+        except Exception as e:
+            db.session.rollback()
+            return 500, None, dumps({"message": "sub-request failed", "detail": str(e)})
+        body = resp.get_data()
+        if not body:
+            body = None
+        elif not resp.is_json:
+            body = dumps(body.decode(errors="replace"))
+        return resp.status_code, resp.headers.get("ETag"), body
+
+@api.route('/batch', methods=['POST'])
+@jwt_required(optional=True)
+def batch():
+    """
+    Runs up to 20 GET sub-requests in-process and returns every result at once.
+    Body: { requests: [{ id?: any, path: "/api/offers/3/matches", headers?: { "If-None-Match": ... } }] }
+    Sub-requests reuse this request's Authorization header, app context and DB
+    session, and behave exactly as if called directly.
+    Returns { responses: [{ id, status, etag?, body }] } in input order.
+    """
+    data = request.get_json(silent=True)
+    subs = data.get("requests") if isinstance(data, dict) else None
+    if not isinstance(subs, list) or not subs:
+        return jsonify({"message": "requests must be a non-empty array"}), 400
+    if len(subs) > BATCH_MAX_REQUESTS:
+        return jsonify({"message": f"at most {BATCH_MAX_REQUESTS} requests per batch"}), 400
+
+    shared = {}
+    if request.headers.get("Authorization"):
+        shared["Authorization"] = request.headers["Authorization"]
+
+    parts = []
+    for i, sub in enumerate(subs):
+        if not isinstance(sub, dict):
+            sub = {}
+        ident = sub.get("id", i)
+        path = sub.get("path")
+        if not isinstance(path, str) or not path.startswith("/api/"):
+            status, etag, body = 400, None, dumps({"message": "path must start with /api/"})
+        elif (sub.get("method") or "GET").upper() != "GET":
+            status, etag, body = 405, None, dumps({"message": "only GET sub-requests are supported"})
+        else:
+            extra = sub.get("headers") if isinstance(sub.get("headers"), dict) else {}
+            headers = {**shared, **{k: str(extra[k]) for k in _BATCH_FORWARDED_HEADERS if k in extra}}
+            status, etag, body = _run_subrequest(path, headers)
+
+        head = {"id": ident, "status": status}
+        if etag:
+            head["etag"] = etag
+        # splice the sub-response bytes in as-is instead of decoding and re-encoding them
+        parts.append(dumps(head)[:-1] + b',"body":' + (body or b"null") + b"}")
+
+    return current_app.response_class(
+        b'{"responses":[' + b",".join(parts) + b"]}", status=200, mimetype="application/json"
     )
-    return jsonify([u.serialize() for u in rows]), 200
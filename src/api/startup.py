@@ -0,0 +1,81 @@
+"""
+Worker cold-start check (`flask check-startup`).
+
+Imports the serving entry point (wsgi.py, which builds the app) in fresh
+interpreters under `python -X importtime`, and fails if
+  - the median cumulative import time exceeds the budget
+    (STARTUP_BUDGET_MS, default 800), or
+  - any module in LAZY_MODULES was imported: those belong to optional
+    subsystems and must only load on first use.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "800"))
+
+# optional subsystems that must stay out of worker startup
+LAZY_MODULES = (
+    "flask_migrate",   # only the `flask db` CLI (MIGRATIONS config)
+    "alembic",
+    "flask_admin",     # ADMIN_ENABLED
+    "cloudinary",
+    "numpy",           # recommendations, on first request
+    "api.recommend",
+    "api.benchmarks",  # CLI only
+    "api.loadtest",
+    "api.datagen",
+)
+
+
+def _parse(stderr: str):
+    """-X importtime output -> (cumulative us per module, imported module names)."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cum, name = line.split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def measure(module: str = "wsgi", repeat: int = 5) -> dict:
+    """Median/min cumulative import ms of `module`, the slowest imports and lazy-module violations."""
+    env = dict(os.environ, AUTO_CREATE_DB="0", PYTHONDONTWRITEBYTECODE="")
+    totals, runs = [], []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=SRC_DIR, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        cumulative = _parse(proc.stderr)
+        totals.append(cumulative[module] / 1000)
+        runs.append(cumulative)
+
+    last = runs[-1]
+    top_level = {name: us for name, us in last.items() if "." not in name and name != module}
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "slowest": sorted(((name, round(us / 1000, 1)) for name, us in top_level.items()),
+                          key=lambda item: -item[1])[:8],
+        "eager": sorted(name for name in last
+                        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)),
+    }
+
+
+def check_startup(budget_ms: float = STARTUP_BUDGET_MS, repeat: int = 5) -> tuple[dict, list[str]]:
+    result = measure(repeat=repeat)
+    failures = []
+    if result["median_ms"] > budget_ms:
+        failures.append(f"import of {result['module']} took {result['median_ms']} ms "
+                        f"(median of {repeat}), budget {budget_ms} ms")
+    roots = sorted({name.split(".")[0] if not name.startswith("api.") else name
+                    for name in result["eager"]})
+    if roots:
+        failures.append("optional modules imported at startup: " + ", ".join(roots))
+    return result, failures
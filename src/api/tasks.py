@@ -0,0 +1,40 @@
+"""
+Handlers for the background job kinds (see api/jobs.py).
+Imported by the worker; producers only need api.jobs.enqueue().
+"""
+import os
+
+from sqlalchemy import select
+
+from api.jobs import task
+from api.models import db, User
+from api.purge import purge_user
+from api.ratings import rebuild_ratings
+from api.counters import reconcile_counters
+
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+
+
+@task("purge_user")
+def purge_user_task(userId: int):
+    """Enqueued by DELETE /users/<id>."""
+    if purge_user(userId, PURGE_BATCH_SIZE):
+        return
+    if db.session.scalar(select(User.userId).where(User.userId == userId)) is not None:
+        # a concurrent write got in the way; the retry picks up the remaining rows
+        raise RuntimeError(f"purge of user {userId} incomplete")
+
+
+@task("rebuild_ratings")
+def rebuild_ratings_task():
+    rebuild_ratings()
+
+
+@task("reconcile_counters")
+def reconcile_counters_task():
+    reconcile_counters()
+
+
+@task("noop")
+def noop_task(**_):
+    """Used by `flask bench-jobs`."""
@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from flask import jsonify, url_for
 from werkzeug.security import generate_password_hash, check_password_hash
 class APIException(Exception):
@@ -39,8 +43,56 @@ def generate_sitemap(app):
         <p>Start working on your project by following the <a href="https://start.4geeksacademy.com/starters/full-stack" target="_blank">Quick Start</a></p>
         <p>Remember to specify a real endpoint path like: </p>
         <ul style="text-align: left;">"""+links_html+"</ul></div>"
+# -------------------------
+# Password hashing
+# Hashing is CPU-bound (scrypt/PBKDF2 release the GIL while they run), so it
+# goes through a small dedicated pool: at most PASSWORD_HASH_WORKERS hashes run
+# at once per process, and a caller that cannot get a slot within
+# PASSWORD_HASH_QUEUE_TIMEOUT seconds gets PasswordHasherBusy (-> 503) instead
+# of tying up the worker. Other endpoints keep their CPU share under a login storm.
+# -------------------------
+
+# werkzeug writes the method with its cost parameters into the hash
+# ("scrypt:32768:8:1$salt$hash"), so changing this triggers a rehash on login.
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2.0"))
+
+_hash_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+# running + queued jobs; beyond this callers wait (up to the timeout) for a slot
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+class PasswordHasherBusy(APIException):
+    status_code = 503
+
+    def __init__(self):
+        super().__init__("server busy, retry shortly", payload={"retryAfter": 1})
+
+
+def _run_hashing(fn, *args):
+    deadline = time.monotonic() + PASSWORD_HASH_QUEUE_TIMEOUT
+    if not _hash_slots.acquire(timeout=PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise PasswordHasherBusy()
+    try:
+        future = _hash_pool.submit(fn, *args)
+        try:
+            # the timeout only bounds time spent queued; a started hash is awaited
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            if future.cancel():
+                raise PasswordHasherBusy()
+            return future.result()
+    finally:
+        _hash_slots.release()
+
 def hash_password(password):
-    return generate_password_hash(password)
+    return _run_hashing(generate_password_hash, password, PASSWORD_HASH_METHOD)
 
 def verify_password(hashed_password, plain_password):
-    return check_password_hash(hashed_password, plain_password)
\ No newline at end of file
+    return _run_hashing(check_password_hash, hashed_password, plain_password)
+
+def password_needs_rehash(hashed_password):
+    """True if the stored hash was made with a different method/cost than configured."""
+    return (hashed_password or "").split("$", 1)[0] != PASSWORD_HASH_METHOD
\ No newline at end of file
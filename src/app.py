@@ -1,83 +1,159 @@
 # app.py
+"""
+Application factory.
+
+create_app(config) builds a fresh app; `app` (module attribute) is a default
+instance built on first access, so `FLASK_APP=src/app.py`, `from app import app`
+and `python app.py` keep working. wsgi.py builds the serving app.
+
+Optional subsystems are only imported when enabled:
+  - MIGRATIONS (default on): Flask-Migrate/alembic, for `flask db ...`;
+    the serving app (wsgi.py) turns it off.
+  - ADMIN_ENABLED (env ADMIN_ENABLED=1): flask-admin at /admin.
+
+GET traffic can be served from read replicas (DATABASE_REPLICA_URLS), see
+api/replicas.py.
+"""
 import os
 from pathlib import Path
-from flask import Flask, jsonify
+
+from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 
 from api.models import db
 from api import api_bp
+from api.commands import setup_commands
+from api import metrics, querylog, ratelimit, replicas
 
-app = Flask(__name__, instance_relative_config=True)
-
-# ensure instance dir
 BASE_DIR = Path(__file__).resolve().parent
 INSTANCE_DIR = BASE_DIR / "instance"
-INSTANCE_DIR.mkdir(parents=True, exist_ok=True)
-
-# DB URI
-db_url = os.getenv("DATABASE_URL")
-if db_url:
-    db_url = db_url.replace("postgres://", "postgresql://")
-    app.config["SQLALCHEMY_DATABASE_URI"] = db_url
-else:
+
+# Safe defaults: prod frontend + local dev
+DEFAULT_ORIGINS = [
+    "https://music-match-tt10.onrender.com",
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+]
+
+
+def _database_url():
+    db_url = os.getenv("DATABASE_URL")
+    if db_url:
+        return db_url.replace("postgres://", "postgresql://")
     DB_FILE = (INSTANCE_DIR / "app.db").resolve()
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_FILE.as_posix()}"
-
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-# JWT (header-based)
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
-jwt = JWTManager(app)
-
-# Init extensions
-db.init_app(app)
-Migrate(app, db)
-
-#initiate db
-with app.app_context():
-    if os.getenv("AUTO_CREATE_DB", "0") == "1":
-        db.create_all()
-# CORS (app-wide)
-allowed = os.getenv("CORS_ALLOWED_ORIGINS", "").strip()
-if allowed:
-    ORIGINS = [o.strip() for o in allowed.split(",") if o.strip()]
-else:
-    # Safe defaults: prod frontend + local dev
-    ORIGINS = [
-        "https://music-match-tt10.onrender.com",
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-    ]
-
-CORS(
-    app,
-    resources={r"/api/*": {"origins": ORIGINS}},
-    # We use Authorization header tokens, not cookies → simpler CORS:
-    supports_credentials=False,
-    allow_headers=["Authorization", "Content-Type"],
-    expose_headers=["Authorization", "Content-Type"],
-    methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-)
-
-# Ensure CORS headers are present even on errors / edge cases
-@app.after_request
-def _add_cors_headers(resp):
-    resp.headers.setdefault("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
-    resp.headers.setdefault("Access-Control-Allow-Headers", "Authorization, Content-Type")
-    return resp
-
-# Register API
-app.register_blueprint(api_bp)
-
-@app.get("/")
-def root():
-    return jsonify({"message": "Music project backend is running!"})
-
-@app.get("/health")
-def health():
-    return jsonify({"ok": True})
+    return f"sqlite:///{DB_FILE.as_posix()}"
+
+
+def _default_config():
+    allowed = os.getenv("CORS_ALLOWED_ORIGINS", "").strip()
+    return {
+        "SQLALCHEMY_DATABASE_URI": _database_url(),
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        # read replicas (DATABASE_REPLICA_URLS), see api/replicas.py
+        "SQLALCHEMY_BINDS": replicas.replica_binds(),
+        # JWT (header-based)
+        "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "dev-secret-change-me"),
+        "CORS_ORIGINS": [o.strip() for o in allowed.split(",") if o.strip()] or DEFAULT_ORIGINS,
+        "AUTO_CREATE_DB": os.getenv("AUTO_CREATE_DB", "0") == "1",
+        "MIGRATIONS": True,
+        "ADMIN_ENABLED": os.getenv("ADMIN_ENABLED", "0") == "1",
+    }
+
+
+def create_app(config=None) -> Flask:
+    """
+    Builds the app. `config` (a mapping) overrides the environment-derived
+    defaults, e.g. create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "TESTING": True}).
+    """
+    app = Flask(__name__, instance_relative_config=True, instance_path=str(INSTANCE_DIR))
+    INSTANCE_DIR.mkdir(parents=True, exist_ok=True)
+    app.config.from_mapping(_default_config())
+    if config:
+        app.config.from_mapping(config)
+
+    JWTManager(app)
+    db.init_app(app)
+
+    if app.config["MIGRATIONS"]:
+        from flask_migrate import Migrate  # pulls in alembic; only the CLI needs it
+        Migrate(app, db)
+
+    if app.config["AUTO_CREATE_DB"]:
+        with app.app_context():
+            # primary only: replicas get the schema through replication
+            db.create_all(bind_key=None)
+
+    # CORS (app-wide)
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": app.config["CORS_ORIGINS"]}},
+        # We use Authorization header tokens, not cookies → simpler CORS:
+        supports_credentials=False,
+        allow_headers=["Authorization", "Content-Type"],
+        expose_headers=["Authorization", "Content-Type"],
+        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    )
+
+    # Ensure CORS headers are present even on errors / edge cases
+    @app.after_request
+    def _add_cors_headers(resp):
+        resp.headers.setdefault("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+        resp.headers.setdefault("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        return resp
+
+    # Request/SQL instrumentation for /metrics
+    metrics.init_app(app)
+    # N+1 / slow query / query budget checks (QUERY_DEBUG=1 or app.testing)
+    querylog.init_app(app)
+    # load shedding (503 + Retry-After); per-route rate limits are decorators in routes.py
+    ratelimit.init_app(app)
+    # read-your-writes stickiness for replica routing
+    replicas.init_app(app)
+
+    # Register API
+    app.register_blueprint(api_bp)
+
+    if app.config["ADMIN_ENABLED"]:
+        from api.admin import setup_admin  # flask-admin + wtforms, only when enabled
+        setup_admin(app)
+
+    # CLI commands (flask check-query-plans, ...)
+    setup_commands(app)
+
+    @app.get("/")
+    def root():
+        return jsonify({"message": "Music project backend is running!"})
+
+    @app.get("/health")
+    def health():
+        return jsonify({"ok": True})
+
+    @app.get("/metrics")
+    def prometheus_metrics():
+        """Prometheus scrape target; set METRICS_TOKEN to require `Authorization: Bearer <token>`."""
+        token = os.getenv("METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return jsonify({"message": "unauthorized"}), 401
+        if not metrics.METRICS_ENABLED:
+            return jsonify({"message": "metrics disabled"}), 404
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    return app
+
+
+_default_app = None
+
+
+def __getattr__(name):
+    # `app` is built on first access, not at import (PEP 562)
+    global _default_app
+    if name == "app":
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=3001, debug=True)
+    create_app().run(host="0.0.0.0", port=3001, debug=True)
@@ -101,15 +101,14 @@ export const Home = () => {
           return;
         }
 
-        const ro = await fetch(`${backend}/api/offers`, { headers: authHeaders });
+        const qs = new URLSearchParams({ limit: String(LIMIT) });
+        if (isPerformer) qs.set("status", "open");
+        const ro = await fetch(`${backend}/api/offers/search?${qs}`, { headers: authHeaders });
         if (!alive) return;
 
         if (ro.ok) {
-          const all = (await ro.json()) || [];
-          const filtered = isPerformer
-            ? all.filter((o) => (o.status || "").toLowerCase() === "open")
-            : all;
-          setLatestOffers(filtered.slice(0, LIMIT));
+          const data = (await ro.json()) || {};
+          setLatestOffers(Array.isArray(data.items) ? data.items : []);
         } else {
           setLatestOffers([]);
         }
@@ -150,16 +150,11 @@ export const Profile = () => {
       }
       try {
         setLoadingCityOffers(true);
-        const res = await fetch(`${backend}/api/offers`, { headers: getAuthHeaders() });
+        const qs = new URLSearchParams({ status: "open", city: form.city.trim(), limit: "6" });
+        const res = await fetch(`${backend}/api/offers/search?${qs}`, { headers: getAuthHeaders() });
         const data = await res.json();
         if (!res.ok) throw new Error(data?.message || data?.msg || "Error loading offers");
-        const inCity = (Array.isArray(data) ? data : []).filter(o => {
-          const sameCity =
-            (o.city || "").toLowerCase().trim() === form.city.toLowerCase().trim();
-          const isOpen = (o.status || "").toLowerCase() === "open";
-          return sameCity && isOpen;
-        });
-        setCityOffers(inCity.slice(0, 6));
+        setCityOffers(Array.isArray(data?.items) ? data.items : []);
       } catch {
         setCityOffers([]);
       } finally {
@@ -0,0 +1,51 @@
+"""
+Gunicorn settings. Picked up automatically: the Procfile / render.yaml start
+gunicorn with --chdir ./src/, and gunicorn looks for ./gunicorn.conf.py there.
+
+With preload (default; GUNICORN_PRELOAD=0 to disable) the app is imported
+once in the master and the workers are forked from it, sharing those pages
+copy-on-write instead of each importing everything again. Workers count
+still comes from WEB_CONCURRENCY / -w.
+
+Threads per worker come from GUNICORN_THREADS (default 8). The same number
+becomes the default ADMISSION_MAX_INFLIGHT (api/ratelimit.py): a worker never
+has more requests in flight than threads, so a higher cap would never shed.
+"""
+import gc
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+# read by api/ratelimit.py when the app is imported, which happens after this file
+os.environ.setdefault("ADMISSION_MAX_INFLIGHT", str(threads))
+# each web worker also drains due background jobs (purge_user, ...), so no
+# separate worker service is required; JOBS_IN_WEB=0 when one is deployed
+jobs_in_web = os.getenv("JOBS_IN_WEB", "1") == "1"
+
+
+def when_ready(server):
+    if preload_app:
+        # move everything loaded so far to the permanent generation, so the
+        # workers' garbage collector never writes to (and copies) those pages
+        gc.collect()
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        # connections the master opened (AUTO_CREATE_DB, ...) must not be shared
+        from api.models import db
+        from wsgi import application
+
+        with application.app_context():
+            for engine in db.engines.values():  # primary and replicas
+                engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    if jobs_in_web:
+        from api import tasks  # noqa: F401  registers the handlers
+        from api.jobs import start_background_worker
+        from wsgi import application
+
+        start_background_worker(application)
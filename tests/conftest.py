@@ -0,0 +1,93 @@
+"""
+Shared fixtures: a fresh app on a throwaway SQLite file per test, with
+app.testing on (so route query budgets are enforced, see api/querylog.py).
+"""
+import os
+
+# module-level settings are read at import time
+os.environ.setdefault("METRICS_ENABLED", "0")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "lru")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+os.environ.setdefault("ADMISSION_MAX_INFLIGHT", "0")
+os.environ.setdefault("ADMISSION_MAX_QUEUE_MS", "0")
+
+import pytest
+
+from api import cache, ratelimit, replicas
+from api.broker import broker
+from api.models import db
+from app import create_app
+
+
+def _reset_singletons():
+    cache._cache = None
+    cache._perm_cache = None
+    ratelimit._buckets = None
+    replicas._sticky = None
+    broker._latest.clear()  # offer ids repeat across the per-test databases
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """create_app() on this test's SQLite file; keyword arguments override the config."""
+    monkeypatch.setenv("BROKER_DIR", str(tmp_path / "broker"))
+    _reset_singletons()
+    made = []
+
+    def make(**overrides):
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "SQLALCHEMY_BINDS": {},
+            "TESTING": True,
+            "MIGRATIONS": False,
+            "AUTO_CREATE_DB": True,
+            "JWT_SECRET_KEY": "test-secret-at-least-32-bytes-long!",
+            **overrides,
+        })
+        made.append(app)
+        return app
+
+    yield make
+    for app in made:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    _reset_singletons()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class Api:
+    """Thin helper around the test client for the common signup/login flows."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def signup(self, email, role="performer", **extra):
+        body = {"email": email, "password": "pw", "role": role, "name": email.split("@")[0],
+                "city": "Madrid", "capacity": 200, **extra}
+        res = self.client.post("/api/new-user", json=body)
+        assert res.status_code == 201, res.get_json()
+        data = res.get_json()
+        return data["user"]["userId"], {"Authorization": f"Bearer {data['token']}"}
+
+    def offer(self, headers, **extra):
+        body = {"title": "Gig", "city": "Madrid", "venueName": "Sala", "description": "Live music",
+                "eventDate": "2026-11-15T21:00", **extra}
+        res = self.client.post("/api/offers", json=body, headers=headers)
+        assert res.status_code == 201, res.get_json()
+        return res.get_json()["offerId"]
+
+
+@pytest.fixture
+def api(client):
+    return Api(client)
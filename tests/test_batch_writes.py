@@ -0,0 +1,66 @@
+import pytest
+
+
+@pytest.fixture
+def board(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offers = [api.offer(venue, title=f"t{i}") for i in range(3)]
+    client.post(f"/api/offers/{offers[2]}/conclude", json={}, headers=venue)
+    return venue, performer_id, performer, offers
+
+
+def test_apply_batch_reports_per_item(client, board):
+    venue, _, performer, (first, second, closed) = board
+    client.post(f"/api/offers/{first}/apply", json={"rate": 5, "message": "orig"}, headers=performer)
+
+    res = client.post("/api/offers/apply/batch", headers=performer, json={"items": [
+        {"offerId": first, "rate": 7},
+        {"offerId": second, "rate": 8, "message": "hey"},
+        {"offerId": second, "rate": 1},
+        {"offerId": closed, "rate": 1},
+        {"offerId": 999, "rate": 1},
+        {"offerId": first, "rate": -1},
+        {"rate": 1},
+    ]})
+    assert res.status_code == 200
+    assert [r["status"] for r in res.get_json()["results"]] == [200, 201, 400, 400, 404, 400, 400]
+
+    matches = client.get(f"/api/offers/{first}/matches", headers=venue).get_json()
+    assert [(m["rate"], m["message"]) for m in matches] == [(7.0, "orig")]
+    offer = client.get(f"/api/offers/{second}").get_json()
+    assert offer["applicationsCount"] == 1
+
+
+@pytest.mark.parametrize("body", [{}, {"items": []}, {"items": [{"offerId": 1}] * 101}])
+def test_apply_batch_rejects_bad_envelopes(client, board, body):
+    _, _, performer, _ = board
+    assert client.post("/api/offers/apply/batch", json=body, headers=performer).status_code == 400
+
+
+def test_apply_batch_performers_only(client, board):
+    venue, _, _, (first, _, _) = board
+    res = client.post("/api/offers/apply/batch", json={"items": [{"offerId": first, "rate": 1}]}, headers=venue)
+    assert res.status_code == 403
+
+
+def test_approve_chat_batch(api, client, board):
+    venue, performer_id, performer, (first, _, _) = board
+    other_id, other = api.signup("o@x.com", "performer")
+    for headers in (performer, other):
+        client.post(f"/api/offers/{first}/apply", json={"rate": 5}, headers=headers)
+
+    res = client.post(f"/api/offers/{first}/approve-chat/batch", headers=venue, json={"items": [
+        {"performerId": performer_id},
+        {"performerId": other_id, "approved": False},
+        {"performerId": 999},
+        {"performerId": performer_id},
+    ]})
+    assert [r["status"] for r in res.get_json()["results"]] == [200, 200, 404, 400]
+    assert client.get(f"/api/offers/{first}/messages", headers=performer).status_code == 200
+    assert client.get(f"/api/offers/{first}/messages", headers=other).status_code == 403
+
+    # only the offer's owner may approve
+    res = client.post(f"/api/offers/{first}/approve-chat/batch", headers=performer,
+                      json={"items": [{"performerId": performer_id}]})
+    assert res.status_code == 403
@@ -0,0 +1,37 @@
+from sqlalchemy import func, select
+
+from api import datagen, loadtest
+from api.models import db, User, Offer, Match, Message, Review
+
+
+def test_generate_appends_consistent_rows(app):
+    with app.app_context():
+        first = datagen.generate(users=20, offers=10, matches=30, messages=40, batch_size=7)
+        assert first["user"] == 20 and first["offers"] == 10 and first["messages"] == 40
+        second = datagen.generate(users=20, offers=10, matches=30, messages=40, batch_size=7)
+        assert second == first
+
+        assert db.session.scalar(select(func.count()).select_from(User)) == 40
+        # every foreign key points at a generated row
+        assert db.session.scalar(
+            select(func.count()).select_from(Match).where(Match.offerId.not_in(select(Offer.offerId)))) == 0
+        assert db.session.scalar(
+            select(func.count()).select_from(Message).where(Message.authorId.not_in(select(User.userId)))) == 0
+        # aggregates were rebuilt from the generated reviews
+        reviews = db.session.scalar(select(func.count()).select_from(Review))
+        assert db.session.scalar(select(func.sum(User.ratingCount))) == reviews
+
+
+def test_short_load_run_without_errors(app, tmp_path, monkeypatch):
+    monkeypatch.setenv("BENCH_RESULTS_DIR", str(tmp_path))
+    with app.app_context():
+        datagen.generate(users=20, offers=10, matches=30, messages=40)
+        result = loadtest.run_load(concurrency=2, seconds=0.5, warmup=0.2)
+        assert result["total"]["requests"] > 0
+        assert result["total"]["errors"] == 0
+
+        path = loadtest.save_results(result)
+        assert loadtest.load_results("last") == result
+        rows = loadtest.compare_results(result, loadtest.load_results(str(path)))
+        assert rows[0]["endpoint"] == "total"
+        assert rows[0]["rps"]["change_pct"] == 0.0
@@ -0,0 +1,92 @@
+from api import cache
+
+
+def test_latest_offers_cached_per_fields(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue, title="One")
+
+    res = client.get("/api/offers/latest?fields=title")
+    assert res.headers["X-Cache"] == "MISS"
+    assert res.get_json() == [{"title": "One"}]
+
+    res = client.get("/api/offers/latest")
+    assert res.headers["X-Cache"] == "MISS"
+    assert set(res.get_json()[0]) > {"title", "offerId", "city"}
+
+    # the same projection written differently shares the entry
+    res = client.get("/api/offers/latest?fields=title,%20")
+    assert res.headers["X-Cache"] == "HIT"
+    assert res.get_json() == [{"title": "One"}]
+
+
+def test_invalid_fields_never_served_from_cache(api, client):
+    api.signup("p@x.com", "performer")
+    assert client.get("/api/users/latest?role=performer").status_code == 200
+
+    res = client.get("/api/users/latest?role=performer&fields=nope")
+    assert res.status_code == 400
+    assert "X-Cache" not in res.headers
+    res = client.get("/api/users/latest?role=performer&fields=nope")
+    assert res.status_code == 400
+
+
+def test_reviews_variants_dropped_on_write(app, api, client):
+    user_id, _ = api.signup("p@x.com", "performer")
+    assert client.get(f"/api/users/{user_id}/reviews?fields=score").headers["X-Cache"] == "MISS"
+    assert client.get(f"/api/users/{user_id}/reviews").headers["X-Cache"] == "MISS"
+    assert client.get(f"/api/users/{user_id}/reviews?fields=score").headers["X-Cache"] == "HIT"
+
+    with app.test_request_context():
+        cache.invalidate(prefixes=(cache.reviews_prefix(user_id),))
+    assert client.get(f"/api/users/{user_id}/reviews?fields=score").headers["X-Cache"] == "MISS"
+    assert client.get(f"/api/users/{user_id}/reviews").headers["X-Cache"] == "MISS"
+
+
+def test_write_invalidates_latest(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue, title="One")
+    assert len(client.get("/api/offers/latest").get_json()) == 1
+    assert client.get("/api/offers/latest").headers["X-Cache"] == "HIT"
+
+    api.offer(venue, title="Two")
+    res = client.get("/api/offers/latest")
+    assert res.headers["X-Cache"] == "MISS"
+    assert [o["title"] for o in res.get_json()] == ["Two", "One"]
+
+
+def test_profile_cached_until_edited(api, client):
+    user_id, headers = api.signup("p@x.com", "performer")
+    assert client.get(f"/api/users/{user_id}").headers["X-Cache"] == "MISS"
+    res = client.get(f"/api/users/{user_id}")
+    assert res.headers["X-Cache"] == "HIT"
+    assert int(res.headers["X-Query-Count"]) == 0
+
+    client.put(f"/api/users/{user_id}", json={"name": "Renamed"}, headers=headers)
+    res = client.get(f"/api/users/{user_id}")
+    assert res.headers["X-Cache"] == "MISS"
+    assert res.get_json()["name"] == "Renamed"
+
+
+def test_errors_not_cached(client):
+    for _ in range(2):
+        res = client.get("/api/users/999")
+        assert res.status_code == 404
+        assert "X-Cache" not in res.headers
+
+
+def test_shared_backend_serves_other_workers(monkeypatch, tmp_path, api, client):
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "shared")
+    monkeypatch.setenv("RESPONSE_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    cache._cache = None
+    user_id, _ = api.signup("p@x.com", "performer")
+    assert client.get(f"/api/users/{user_id}").headers["X-Cache"] == "MISS"
+
+    cache._cache = None  # a fresh worker process opens the same file
+    assert client.get(f"/api/users/{user_id}").headers["X-Cache"] == "HIT"
+
+
+def test_disabled_backend(monkeypatch, api, client):
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "none")
+    cache._cache = None
+    user_id, _ = api.signup("p@x.com", "performer")
+    assert "X-Cache" not in client.get(f"/api/users/{user_id}").headers
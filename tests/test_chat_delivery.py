@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from api import routes
+
+
+@pytest.fixture
+def chat(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    client.post(f"/api/offers/{offer_id}/approve-chat", json={"performerId": performer_id}, headers=venue)
+    return offer_id, venue, performer
+
+
+def _post(client, offer_id, headers, body):
+    res = client.post(f"/api/offers/{offer_id}/messages", json={"body": body}, headers=headers)
+    assert res.status_code == 201
+    return res.get_json()["messageId"]
+
+
+def test_since_returns_only_newer(client, chat):
+    offer_id, venue, performer = chat
+    first = _post(client, offer_id, venue, "one")
+    _post(client, offer_id, performer, "two")
+
+    res = client.get(f"/api/offers/{offer_id}/messages?since={first}", headers=venue)
+    assert [m["body"] for m in res.get_json()] == ["two"]
+    assert client.get(f"/api/offers/{offer_id}/messages?since=x", headers=venue).status_code == 400
+
+
+def test_long_poll_wakes_on_new_message(app, client, chat):
+    offer_id, venue, performer = chat
+    last = _post(client, offer_id, venue, "one")
+    poster = threading.Timer(0.3, lambda: _post(app.test_client(), offer_id, performer, "late"))
+    poster.start()
+
+    started = time.monotonic()
+    res = client.get(f"/api/offers/{offer_id}/messages?since={last}&wait=10", headers=venue)
+    poster.join()
+    assert [m["body"] for m in res.get_json()] == ["late"]
+    assert time.monotonic() - started < 5
+
+
+def test_long_poll_times_out_empty(client, chat):
+    offer_id, venue, _ = chat
+    last = _post(client, offer_id, venue, "one")
+    res = client.get(f"/api/offers/{offer_id}/messages?since={last}&wait=0.2", headers=venue)
+    assert res.status_code == 200 and res.get_json() == []
+
+
+def test_stream_resumes_after_last_event_id(monkeypatch, client, chat):
+    monkeypatch.setattr(routes, "MESSAGE_STREAM_SECONDS", 0.3)
+    offer_id, venue, performer = chat
+    first = _post(client, offer_id, venue, "one")
+    second = _post(client, offer_id, performer, "two")
+
+    res = client.get(f"/api/offers/{offer_id}/messages/stream",
+                     headers={**venue, "Last-Event-ID": str(first)})
+    assert res.mimetype == "text/event-stream"
+    body = res.get_data(as_text=True)
+    assert f"id: {second}\nevent: message\n" in body
+    assert '"one"' not in body
+
+
+def test_stream_forbidden_for_strangers(api, client, chat):
+    offer_id, _, _ = chat
+    _, stranger = api.signup("s@x.com", "performer")
+    assert client.get(f"/api/offers/{offer_id}/messages/stream", headers=stranger).status_code == 403
@@ -0,0 +1,53 @@
+import pytest
+
+from api import cache
+
+
+@pytest.fixture
+def applied(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    return offer_id, venue, performer_id, performer
+
+
+def _approve(client, offer_id, venue, performer_id, approved=True):
+    res = client.post(f"/api/offers/{offer_id}/approve-chat", headers=venue,
+                      json={"performerId": performer_id, "approved": approved})
+    assert res.status_code == 200
+
+
+def test_decision_cached_between_requests(client, applied):
+    offer_id, venue, performer_id, performer = applied
+    _approve(client, offer_id, venue, performer_id)
+    url = f"/api/offers/{offer_id}/messages?since=0"
+
+    cold = client.get(url, headers=performer)
+    warm = client.get(url, headers=performer)
+    assert cold.status_code == warm.status_code == 200
+    # the permission lookup is skipped; the fingerprint and the read remain
+    assert int(warm.headers["X-Query-Count"]) == int(cold.headers["X-Query-Count"]) - 1
+
+
+def test_cached_denial_dropped_on_approval(client, applied):
+    offer_id, venue, performer_id, performer = applied
+    url = f"/api/offers/{offer_id}/messages"
+    assert client.get(url, headers=performer).status_code == 403
+    assert client.get(url, headers=performer).status_code == 403
+
+    _approve(client, offer_id, venue, performer_id)
+    assert client.get(url, headers=performer).status_code == 200
+
+    _approve(client, offer_id, venue, performer_id, approved=False)
+    assert client.get(url, headers=performer).status_code == 403
+    assert client.post(url, json={"body": "still here?"}, headers=performer).status_code == 403
+
+
+def test_without_cache_backend(monkeypatch, client, applied):
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "none")
+    cache._cache = cache._perm_cache = None
+    offer_id, venue, performer_id, performer = applied
+    _approve(client, offer_id, venue, performer_id)
+    assert client.get(f"/api/offers/{offer_id}/messages", headers=performer).status_code == 200
+    assert client.get("/api/offers/999/messages", headers=performer).status_code == 404
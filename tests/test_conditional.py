@@ -0,0 +1,48 @@
+def test_cached_view_revalidates_without_queries(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue)
+
+    miss = client.get("/api/offers/latest")
+    assert miss.headers["X-Cache"] == "MISS"
+    etag = miss.headers["ETag"]
+
+    hit = client.get("/api/offers/latest")
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.headers["ETag"] == etag
+    assert hit.headers["X-Query-Count"] == "0"
+
+    res = client.get("/api/offers/latest", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["X-Query-Count"] == "0"
+
+
+def test_write_changes_etag(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    offer_id = api.offer(venue)
+    etag = client.get(f"/api/offers/{offer_id}").headers["ETag"]
+    assert client.get(f"/api/offers/{offer_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    res = client.post(f"/api/offers/{offer_id}/conclude", json={"status": "cancelled"}, headers=venue)
+    assert res.status_code == 200
+    res = client.get(f"/api/offers/{offer_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.get_json()["status"] == "cancelled"
+    assert res.headers["ETag"] != etag
+
+
+def test_uncached_view_uses_fingerprint(api, client):
+    _, performer = api.signup("p@x.com", "performer")
+    res = client.get("/api/auth/me", headers=performer)
+    assert res.status_code == 200
+    res = client.get("/api/auth/me", headers={**performer, "If-None-Match": res.headers["ETag"]})
+    assert res.status_code == 304
+    assert res.headers["X-Query-Count"] == "1"
+
+
+def test_if_modified_since(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    offer_id = api.offer(venue)
+    res = client.get(f"/api/offers/{offer_id}")
+    last_modified = res.headers["Last-Modified"]
+    res = client.get(f"/api/offers/{offer_id}", headers={"If-Modified-Since": last_modified})
+    assert res.status_code == 304
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def chats(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    p1_id, p1 = api.signup("p1@x.com")
+    p2_id, p2 = api.signup("p2@x.com")
+    offers = [api.offer(venue) for _ in range(3)]
+    client.post("/api/offers/apply/batch", headers=p1,
+                json={"items": [{"offerId": o, "rate": 100} for o in offers]})
+    client.post(f"/api/offers/{offers[0]}/apply", json={"rate": 250}, headers=p2)
+    for o in offers:
+        client.post(f"/api/offers/{o}/approve-chat/batch", headers=venue, json={"items": [{"performerId": p1_id}]})
+    client.post(f"/api/offers/{offers[0]}/approve-chat/batch", headers=venue, json={"items": [{"performerId": p2_id}]})
+    return dict(venue=venue, p1=p1, p2=p2, offers=offers)
+
+
+def _say(client, offer_id, headers, body):
+    resp = client.post(f"/api/offers/{offer_id}/messages", json={"body": body}, headers=headers)
+    time.sleep(0.01)  # distinct lastMessageAt, so the inbox order is deterministic
+    return resp.get_json()["messageId"]
+
+
+def _inbox(client, headers, query=""):
+    resp = client.get("/api/users/me/conversations" + query, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["X-Query-Count"] == "1"
+    return resp.get_json()
+
+
+def test_inbox_unread_counts_and_previews(client, chats):
+    c = chats
+    first, second, third = c["offers"]
+    _say(client, first, c["p1"], "hello " * 50)
+    _say(client, first, c["venue"], "b")
+    _say(client, second, c["p1"], "x")
+    last = _say(client, first, c["p2"], "d")
+
+    venue = {i["offerId"]: i for i in _inbox(client, c["venue"])["items"]}
+    assert [i for i in venue] == [first, second, third]
+    assert (venue[first]["unread"], venue[second]["unread"], venue[third]["unread"]) == (1, 1, 0)
+    assert venue[first]["lastMessage"]["messageId"] == last
+    assert venue[third]["lastMessage"] is None
+
+    p1 = {i["offerId"]: i for i in _inbox(client, c["p1"])["items"]}
+    assert (p1[first]["unread"], p1[second]["unread"]) == (2, 0)
+
+    p2 = _inbox(client, c["p2"])["items"]
+    assert [i["offerId"] for i in p2] == [first]
+    assert p2[0]["unread"] == 0  # posting marks your own message read
+
+
+def test_mark_read_never_moves_back(client, chats):
+    c = chats
+    first, second, _ = c["offers"]
+    m1 = _say(client, first, c["p1"], "a")
+    m2 = _say(client, first, c["p2"], "b")
+    m3 = _say(client, second, c["p1"], "c")
+
+    url = f"/api/users/me/conversations/{first}/read"
+    assert client.post(url, json={"messageId": m1}, headers=c["venue"]).get_json()["lastReadMessageId"] == m1
+    assert {i["offerId"]: i["unread"] for i in _inbox(client, c["venue"])["items"]}[first] == 1
+    assert client.post(url, json={}, headers=c["venue"]).get_json()["lastReadMessageId"] == m2
+    assert client.post(url, json={"messageId": m1}, headers=c["venue"]).get_json()["lastReadMessageId"] == m2
+
+    # clamped to the offer's own newest message
+    resp = client.post(f"/api/users/me/conversations/{second}/read", json={"messageId": 10**6}, headers=c["venue"])
+    assert resp.get_json()["lastReadMessageId"] == m3
+    assert all(i["unread"] == 0 for i in _inbox(client, c["venue"])["items"])
+
+    assert client.post(url, json={"messageId": "x"}, headers=c["venue"]).status_code == 400
+    assert client.post(f"/api/users/me/conversations/{second}/read", json={}, headers=c["p2"]).status_code == 403
+    assert client.post("/api/users/me/conversations/999/read", json={}, headers=c["venue"]).status_code == 404
+
+
+def test_inbox_pages_with_cursor(client, chats):
+    c = chats
+    for o in c["offers"]:
+        _say(client, o, c["p1"], "hi")
+    seen, cursor = [], None
+    while True:
+        page = _inbox(client, c["p1"], "?limit=1" + (f"&cursor={cursor}" if cursor else ""))
+        seen += [i["offerId"] for i in page["items"]]
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    assert seen == c["offers"][::-1]
+    assert client.get("/api/users/me/conversations?cursor=bad", headers=c["p1"]).status_code == 400
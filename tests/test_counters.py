@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import update
+
+from api.counters import reconcile_counters
+from api.models import db, Offer, User
+from api.purge import purge_user
+
+
+@pytest.fixture
+def gig(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    p1_id, p1 = api.signup("p1@x.com")
+    p2_id, p2 = api.signup("p2@x.com")
+    offer_id = api.offer(venue)
+    return dict(venue_id=venue_id, venue=venue, p1_id=p1_id, p1=p1, p2_id=p2_id, p2=p2, offer_id=offer_id)
+
+
+def _offer(client, offer_id):
+    return client.get(f"/api/offers/{offer_id}").get_json()
+
+
+def _events(client, user_id):
+    return client.get(f"/api/users/{user_id}").get_json()["eventsFinalised"]
+
+
+def test_applications_count_new_applicants_once(api, client, gig):
+    g = gig
+    other = api.offer(g["venue"])
+    assert client.post(f"/api/offers/{g['offer_id']}/apply", json={"rate": 5}, headers=g["p1"]).status_code == 201
+    assert client.post(f"/api/offers/{g['offer_id']}/apply", json={"rate": 6}, headers=g["p1"]).status_code == 200
+    client.post("/api/offers/apply/batch", headers=g["p2"],
+                json={"items": [{"offerId": g["offer_id"], "rate": 3}, {"offerId": other, "rate": 3}]})
+    client.post("/api/offers/apply/batch", headers=g["p2"], json={"items": [{"offerId": g["offer_id"], "rate": 4}]})
+
+    assert _offer(client, g["offer_id"])["applicationsCount"] == 2
+    assert _offer(client, other)["applicationsCount"] == 1
+
+
+def test_events_finalised_follow_status(client, gig):
+    g = gig
+    offer = g["offer_id"]
+    for headers in (g["p1"], g["p2"]):
+        client.post(f"/api/offers/{offer}/apply", json={"rate": 5}, headers=headers)
+    client.post(f"/api/offers/{offer}/accept", json={"performerId": g["p1_id"]}, headers=g["venue"])
+    client.post(f"/api/offers/{offer}/conclude", json={}, headers=g["venue"])
+    client.post(f"/api/offers/{offer}/conclude", json={}, headers=g["venue"])
+    assert _events(client, g["p1_id"]) == 1
+
+    # accepting someone else on a closed offer moves the event
+    client.post(f"/api/offers/{offer}/accept", json={"performerId": g["p2_id"]}, headers=g["venue"])
+    assert (_events(client, g["p1_id"]), _events(client, g["p2_id"])) == (0, 1)
+
+    client.put(f"/api/users/{g['p2_id']}", json={"eventsFinalised": 99}, headers=g["p2"])
+    assert _events(client, g["p2_id"]) == 1
+
+    client.post(f"/api/offers/{offer}/conclude", json={"status": "cancelled"}, headers=g["venue"])
+    assert _events(client, g["p2_id"]) == 0
+
+
+def test_purge_and_reconcile(app, client, gig):
+    g = gig
+    offer = g["offer_id"]
+    for headers in (g["p1"], g["p2"]):
+        client.post(f"/api/offers/{offer}/apply", json={"rate": 5}, headers=headers)
+    client.post(f"/api/offers/{offer}/approve-chat/batch", headers=g["venue"],
+                json={"items": [{"performerId": g["p1_id"]}, {"performerId": g["p2_id"]}]})
+    for headers in (g["venue"], g["p1"], g["p2"]):
+        client.post(f"/api/offers/{offer}/messages", json={"body": "hi"}, headers=headers)
+    assert _offer(client, offer)["applicationsCount"] == 2
+
+    client.delete(f"/api/users/{g['p1_id']}", headers=g["p1"])
+    with app.app_context():
+        purge_user(g["p1_id"])
+        row = db.session.get(Offer, offer)
+        assert (row.applicationsCount, row.messageCount) == (1, 2)
+        assert reconcile_counters(dry_run=True) == {"offers": 0, "users": 0}
+
+        db.session.execute(update(Offer).values(applicationsCount=42, messageCount=0))
+        db.session.execute(update(User).where(User.userId == g["p2_id"]).values(eventsFinalised=5))
+        db.session.commit()
+        assert reconcile_counters(dry_run=True) == {"offers": 1, "users": 1}
+        assert reconcile_counters(batch_size=1) == {"offers": 1, "users": 1}
+        assert reconcile_counters(dry_run=True) == {"offers": 0, "users": 0}
+    assert _offer(client, offer)["applicationsCount"] == 1
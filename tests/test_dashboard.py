@@ -0,0 +1,56 @@
+def _dashboard(client, venue_id, headers, query=""):
+    res = client.get(f"/api/users/{venue_id}/offers/dashboard{query}", headers=headers)
+    assert res.status_code == 200
+    return res
+
+
+def test_per_offer_stats(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    p1_id, p1 = api.signup("p1@x.com")
+    p2_id, p2 = api.signup("p2@x.com")
+    busy, quiet = api.offer(venue, title="busy"), api.offer(venue, title="quiet")
+    client.post(f"/api/offers/{busy}/apply", json={"rate": 100}, headers=p1)
+    client.post(f"/api/offers/{busy}/apply", json={"rate": 250}, headers=p2)
+    client.post(f"/api/offers/{busy}/approve-chat/batch", headers=venue,
+                json={"items": [{"performerId": p1_id}, {"performerId": p2_id}]})
+    for headers, body in ((p1, "a"), (venue, "b"), (p1, "c"), (p2, "d")):
+        client.post(f"/api/offers/{busy}/messages", json={"body": body}, headers=headers)
+    client.post(f"/api/offers/{busy}/accept", json={"performerId": p1_id}, headers=venue)
+
+    items = _dashboard(client, venue_id, venue).get_json()
+    assert [o["offerId"] for o in items] == [quiet, busy]
+    stats = items[1]["stats"]
+    assert {k: stats[k] for k in ("applications", "pending", "accepted", "rejected", "chatApproved")} == {
+        "applications": 2, "pending": 0, "accepted": 1, "rejected": 1, "chatApproved": 2}
+    assert (stats["rateMin"], stats["rateAvg"], stats["rateMax"]) == (100.0, 175.0, 250.0)
+    # the venue answered "b", so only "c" and "d" are unread
+    assert (stats["messages"], stats["unread"]) == (4, 2)
+    assert items[0]["stats"]["applications"] == 0 and items[0]["stats"]["rateAvg"] is None
+
+
+def test_query_count_independent_of_offers(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue)
+    one = int(_dashboard(client, venue_id, venue).headers["X-Query-Count"])
+    for _ in range(4):
+        api.offer(venue)
+    assert int(_dashboard(client, venue_id, venue).headers["X-Query-Count"]) == one
+
+
+def test_paging_fields_and_conditional(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    for i in range(3):
+        api.offer(venue, title=f"t{i}")
+    page = _dashboard(client, venue_id, venue, "?limit=2&fields=title").get_json()
+    assert [set(item) for item in page["items"]] == [{"title", "stats"}] * 2
+    assert page["nextCursor"]
+
+    etag = _dashboard(client, venue_id, venue).headers["ETag"]
+    res = client.get(f"/api/users/{venue_id}/offers/dashboard", headers={**venue, "If-None-Match": etag})
+    assert res.status_code == 304
+
+
+def test_owner_only(api, client):
+    venue_id, _ = api.signup("v@x.com", "distributor")
+    _, performer = api.signup("p@x.com")
+    assert client.get(f"/api/users/{venue_id}/offers/dashboard", headers=performer).status_code == 403
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import app as app_module
+from api.models import db, User
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_apps_are_independent(make_app, tmp_path):
+    first = make_app()
+    second = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'other.db'}")
+    first.test_client().post("/api/new-user", json={
+        "email": "p@x.com", "password": "pw", "role": "performer", "name": "p", "city": "Madrid"})
+
+    with first.app_context():
+        assert db.session.query(User).count() == 1
+    with second.app_context():
+        assert db.session.query(User).count() == 0
+    assert "migrate" not in first.extensions
+
+
+def test_migrations_loaded_only_when_asked(make_app):
+    assert "migrate" in make_app(MIGRATIONS=True).extensions
+
+
+def test_serving_startup_skips_optional_imports(tmp_path):
+    # wsgi.py is what gunicorn loads: no alembic, numpy or flask-admin at startup
+    code = (
+        "import sys, wsgi, app; "
+        "assert app._default_app is None; "
+        "print(','.join(m for m in ('alembic', 'flask_migrate', 'numpy', 'flask_admin') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True,
+        env={"PATH": "", "DATABASE_URL": f"sqlite:///{tmp_path / 'wsgi.db'}", "METRICS_ENABLED": "0"},
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_default_app_built_on_first_access(monkeypatch, tmp_path):
+    monkeypatch.setattr(app_module, "_default_app", None)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'default.db'}")
+    built = app_module.app
+    assert built is app_module.app
+    assert built.config["SQLALCHEMY_DATABASE_URI"].endswith("default.db")
+    with built.app_context():
+        db.engine.dispose()
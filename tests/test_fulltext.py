@@ -0,0 +1,45 @@
+def _offer_ids(client, headers, q, **params):
+    res = client.get("/api/search/offers", query_string={"q": q, **params}, headers=headers)
+    assert res.status_code == 200
+    return res.get_json()
+
+
+def test_offer_search_ranks_and_pages(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    rock = api.offer(venue, title="Rock night", description="Loud guitars all night")
+    jazz = api.offer(venue, title="Jazz brunch", description="Smooth sunday jazz")
+    api.offer(venue, title="Rockabilly", description="Quiff contest")
+
+    # every word required, the last one as a prefix
+    assert [o["offerId"] for o in _offer_ids(client, venue, "rock ni")["items"]] == [rock]
+    assert [o["offerId"] for o in _offer_ids(client, venue, "JAZZ")["items"]] == [jazz]
+
+    first = _offer_ids(client, venue, "rock", limit=1)
+    assert len(first["items"]) == 1 and first["nextOffset"] == 1
+    second = _offer_ids(client, venue, "rock", limit=1, offset=1)
+    assert second["nextOffset"] is None
+    assert {first["items"][0]["offerId"], second["items"][0]["offerId"]} == {rock, rock + 2}
+
+
+def test_performer_search_skips_venues_and_deleted(api, client):
+    rocker_id, _ = api.signup("r@x.com", name="Los Rockeros")
+    gone_id, gone = api.signup("g@x.com", name="Rockers Gone")
+    api.signup("v@x.com", "distributor", name="Rockers Hall")
+    client.delete(f"/api/users/{gone_id}", headers=gone)
+
+    res = client.get("/api/search/performers?q=rocker").get_json()
+    assert [u["userId"] for u in res["items"]] == [rocker_id]
+
+
+def test_profile_edits_are_indexed(api, client):
+    user_id, headers = api.signup("p@x.com")
+    assert client.get("/api/search/performers?q=theremin").get_json()["items"] == []
+    client.put(f"/api/users/{user_id}", json={"bio": "theremin and synths"}, headers=headers)
+    assert [u["userId"] for u in client.get("/api/search/performers?q=theremin").get_json()["items"]] == [user_id]
+
+
+def test_query_syntax_is_not_interpreted(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    assert _offer_ids(client, venue, '"((* OR NEAR')["items"] == []
+    assert client.get("/api/search/offers?q=", headers=venue).status_code == 400
+    assert client.get("/api/search/offers?q=x&offset=no", headers=venue).status_code == 400
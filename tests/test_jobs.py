@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+import time
+
+import pytest
+from sqlalchemy import update
+
+from api import jobs
+from api.models import db, Job
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+
+
+def _add(kind, **kw):
+    job = jobs.enqueue(kind, **kw)
+    db.session.commit()
+    return job.jobId
+
+
+def test_claims_by_priority_then_age(ctx):
+    low = _add("noop", priority=jobs.PRIORITY_LOW)
+    first = _add("noop")
+    second = _add("noop")
+    high = _add("noop", priority=jobs.PRIORITY_HIGH)
+    later = _add("noop", delay=3600)
+
+    assert jobs.claim("w", limit=10) == [high, first, second, low]
+    assert jobs.claim("w", limit=10) == []
+    assert db.session.get(Job, later).status == "queued"
+    assert db.session.get(Job, high).attempts == 1
+
+
+def test_failures_back_off_then_fail(monkeypatch, ctx):
+    calls = []
+
+    def flaky(**payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs._handlers, "flaky", flaky)
+    job_id = _add("flaky", payload={"n": 1}, max_attempts=2)
+
+    [claimed] = jobs.claim("w")
+    assert not jobs.run_job(claimed)
+    job = db.session.get(Job, job_id)
+    assert job.status == "queued" and "boom" in job.lastError
+    assert job.runAt > datetime.now()
+
+    db.session.execute(update(Job).values(runAt=datetime.now()))
+    db.session.commit()
+    jobs.run_job(*jobs.claim("w"))
+    db.session.expire_all()
+    assert db.session.get(Job, job_id).status == "failed"
+    assert calls == [{"n": 1}, {"n": 1}]
+
+
+def test_unknown_kind_is_an_error(ctx):
+    job_id = _add("missing", max_attempts=1)
+    assert not jobs.run_job(*jobs.claim("w"))
+    assert "no handler" in db.session.get(Job, job_id).lastError
+
+
+def test_stale_running_jobs_requeued(ctx):
+    job_id = _add("noop")
+    jobs.claim("dead-worker")
+    db.session.execute(update(Job).values(lockedAt=datetime.now() - timedelta(hours=1)))
+    db.session.commit()
+
+    assert jobs.requeue_stale() == 1
+    assert jobs.claim("w") == [job_id]
+
+
+def test_workers_run_each_job_once(monkeypatch, app):
+    seen = []
+    monkeypatch.setitem(jobs._handlers, "note", lambda n: seen.append(n))
+    with app.app_context():
+        for n in range(6):
+            jobs.enqueue("note", {"n": n})
+        db.session.commit()
+
+    workers = jobs.run_workers(app, concurrency=2, burst=True, batch_size=2)
+    assert sorted(seen) == list(range(6))
+    assert sum(w.succeeded for w in workers) == 6
+    with app.app_context():
+        assert jobs.queue_stats() == {"note": {"done": 6}}
+
+
+def test_background_worker_drains_in_process(monkeypatch, app):
+    seen = []
+    monkeypatch.setitem(jobs._handlers, "note", lambda n: seen.append(n))
+    stop = jobs.start_background_worker(app, poll_interval=0.01)
+    try:
+        with app.app_context():
+            jobs.enqueue("note", {"n": 1})
+            db.session.commit()
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+    assert seen == [1]
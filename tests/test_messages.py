@@ -0,0 +1,40 @@
+import pytest
+
+from api import cache
+
+
+@pytest.fixture
+def chat(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    client.post(f"/api/offers/{offer_id}/approve-chat", json={"performerId": performer_id}, headers=venue)
+    return offer_id, venue, performer
+
+
+@pytest.mark.parametrize("backend", ["lru", "none"])
+def test_get_messages_within_budget(monkeypatch, client, chat, backend):
+    # app.testing raises QueryBudgetExceeded when the route goes over @query_budget(3)
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", backend)
+    cache._cache = cache._perm_cache = None
+    offer_id, venue, performer = chat
+    client.post(f"/api/offers/{offer_id}/messages", json={"body": "hi"}, headers=performer)
+
+    res = client.get(f"/api/offers/{offer_id}/messages", headers=venue)
+    assert res.status_code == 200
+    assert int(res.headers["X-Query-Count"]) <= 3
+    assert [m["body"] for m in res.get_json()] == ["hi"]
+
+
+def test_incremental_and_forbidden(api, client, chat):
+    offer_id, venue, performer = chat
+    first = client.post(f"/api/offers/{offer_id}/messages", json={"body": "one"}, headers=venue).get_json()
+    client.post(f"/api/offers/{offer_id}/messages", json={"body": "two"}, headers=performer)
+
+    res = client.get(f"/api/offers/{offer_id}/messages?since={first['messageId']}&wait=5", headers=venue)
+    assert [m["body"] for m in res.get_json()] == ["two"]
+
+    _, stranger = api.signup("s@x.com", "performer")
+    assert client.get(f"/api/offers/{offer_id}/messages", headers=stranger).status_code == 403
+    assert client.get("/api/offers/999/messages", headers=venue).status_code == 404
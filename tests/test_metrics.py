@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from api import metrics
+
+
+@pytest.fixture
+def metered(monkeypatch, tmp_path, make_app):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    monkeypatch.setattr(metrics, "registry", metrics.Registry())
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path / "metrics"))
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    return make_app().test_client()
+
+
+def _sample(text, prefix):
+    [line] = [l for l in text.splitlines() if l.startswith(prefix + " ")]
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_requests_and_sql_are_recorded(metered):
+    client = metered
+    for _ in range(3):
+        assert client.get("/api/users").status_code == 200
+    client.get("/api/nope")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert _sample(text, 'http_request_duration_seconds_count{endpoint="api.get_users",method="GET",status="200"}') == 3
+    assert _sample(text, 'http_request_db_queries_count{endpoint="api.get_users"}') == 3
+    assert _sample(text, 'http_request_db_queries_sum{endpoint="api.get_users"}') >= 3
+    assert 'endpoint="<unmatched>",method="GET",status="404"' in text
+    # the scrape itself is still in flight
+    assert _sample(text, "http_requests_in_flight") == 1
+
+
+def test_snapshots_of_other_workers_are_merged(metered, tmp_path):
+    client = metered
+    client.get("/api/users")
+    directory = tmp_path / "metrics"
+    other = metrics.registry.snapshot()
+    other["pid"] = 2 ** 22 + 7  # an exited worker: its histograms still count
+    (directory / f"{other['pid']}.json").write_text(json.dumps(other))
+    (directory / "garbage.json").write_text("{")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert _sample(text, 'http_request_duration_seconds_count{endpoint="api.get_users",method="GET",status="200"}') == 2
+
+
+def test_token_and_disabled(monkeypatch, metered):
+    client = metered
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 404
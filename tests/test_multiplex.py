@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.fixture
+def setup(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    _, performer = api.signup("p@x.com", "performer")
+    offers = [api.offer(venue, title=f"t{i}") for i in range(2)]
+    client.post("/api/offers/apply/batch", headers=performer,
+                json={"items": [{"offerId": o, "rate": 5} for o in offers]})
+    return venue_id, venue, offers
+
+
+def _batch(client, requests, headers=None):
+    res = client.post("/api/batch", json={"requests": requests}, headers=headers)
+    assert res.status_code == 200
+    return res.get_json()["responses"]
+
+
+def test_fan_out_matches_direct_calls(client, setup):
+    venue_id, venue, offers = setup
+    paths = [f"/api/users/{venue_id}/offers/created"] + [f"/api/offers/{o}/matches" for o in offers]
+    out = _batch(client, [{"id": p, "path": p} for p in paths], venue)
+
+    assert [r["id"] for r in out] == paths
+    for r in out:
+        direct = client.get(r["id"], headers=venue)
+        assert (r["status"], r["body"], r.get("etag")) == (200, direct.get_json(), direct.headers["ETag"])
+
+
+def test_sub_request_conditional(client, setup):
+    _, venue, offers = setup
+    path = f"/api/offers/{offers[0]}/matches"
+    [first] = _batch(client, [{"path": path}], venue)
+    [again] = _batch(client, [{"path": path, "headers": {"If-None-Match": first["etag"]}}], venue)
+    assert again["status"] == 304 and again["body"] is None
+
+
+def test_refused_sub_requests(client, setup):
+    _, venue, offers = setup
+    out = _batch(client, [
+        {"path": "/api/nope"},
+        {"path": "x"},
+        {"path": "/api/batch"},
+        {"path": f"/api/offers/{offers[0]}/messages/stream"},
+        {"path": f"/api/offers/{offers[0]}/messages?since=0&wait=5"},
+        {"path": f"/api/offers/{offers[0]}", "method": "POST"},
+    ], venue)
+    # /api/batch itself only answers POST
+    assert [r["status"] for r in out] == [404, 400, 405, 400, 400, 405]
+
+
+def test_anonymous_batch_keeps_auth_per_sub_request(client, setup):
+    _, _, offers = setup
+    out = _batch(client, [{"path": f"/api/offers/{offers[0]}/matches"}, {"path": f"/api/offers/{offers[0]}"}])
+    assert [r["status"] for r in out] == [401, 200]
+
+
+@pytest.mark.parametrize("body", [{}, {"requests": []}, {"requests": [{}] * 21}])
+def test_bad_envelopes(client, body):
+    assert client.post("/api/batch", json=body).status_code == 400
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from api.models import db, Offer
+
+
+def _walk(client, url, headers=None):
+    ids, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers).get_json()
+        ids += [item.get("offerId", item.get("userId")) for item in page["items"]]
+        cursor = page["nextCursor"]
+        if not cursor:
+            return ids
+
+
+def test_offers_pages_cover_everything_newest_first(app, api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    created = [api.offer(venue, title=f"t{i}") for i in range(5)]
+    # ties on createdAt are broken by the id
+    with app.app_context():
+        db.session.execute(update(Offer).values(createdAt=datetime(2026, 1, 1)))
+        db.session.commit()
+
+    assert _walk(client, "/api/offers?limit=2", venue) == sorted(created, reverse=True)
+    assert _walk(client, f"/api/users/{venue_id}/offers/created?limit=3", venue) == sorted(created, reverse=True)
+
+
+def test_legacy_list_without_paging_args(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue)
+    body = client.get("/api/offers", headers=venue).get_json()
+    assert isinstance(body, list) and len(body) == 1
+
+
+def test_users_pages(api, client):
+    ids = [api.signup(f"u{i}@x.com")[0] for i in range(3)]
+    assert _walk(client, "/api/users?limit=1") == sorted(ids, reverse=True)
+
+
+def test_applied_offers_page_carries_match(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 50}, headers=performer)
+
+    page = client.get(f"/api/users/{performer_id}/offers/applied?limit=5", headers=performer).get_json()
+    assert page["nextCursor"] is None
+    [item] = page["items"]
+    assert item["offerId"] == offer_id and item["matchStatus"] and item["matchId"]
+
+
+def test_bad_cursor_and_limit(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    assert client.get("/api/offers?cursor=zz", headers=venue).status_code == 400
+    # out-of-range limits are clamped rather than rejected
+    assert client.get("/api/offers?limit=1000", headers=venue).status_code == 200
+    assert client.get("/api/offers?limit=abc", headers=venue).status_code == 200
@@ -0,0 +1,40 @@
+import threading
+
+from api import utils
+from api.models import db, User
+
+
+def _login(client, password="pw"):
+    return client.post("/api/login", json={"email": "p@x.com", "password": password})
+
+
+def test_login_and_wrong_password(api, client):
+    api.signup("p@x.com")
+    assert _login(client).status_code == 200
+    assert _login(client, "nope").status_code == 401
+
+
+def test_login_upgrades_outdated_hash(monkeypatch, app, api, client):
+    user_id, _ = api.signup("p@x.com")
+    monkeypatch.setattr(utils, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+
+    assert _login(client).status_code == 200
+    with app.app_context():
+        stored = db.session.get(User, user_id).password
+    assert stored.startswith("pbkdf2:sha256:1000$")
+    assert not utils.password_needs_rehash(stored)
+    assert _login(client).status_code == 200
+
+
+def test_busy_hasher_answers_503(monkeypatch, api, client):
+    api.signup("p@x.com")
+    monkeypatch.setattr(utils, "_hash_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(utils, "PASSWORD_HASH_QUEUE_TIMEOUT", 0.01)
+    utils._hash_slots.acquire()  # every slot taken
+
+    res = _login(client)
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "1"
+    res = client.post("/api/new-user", json={"email": "q@x.com", "password": "pw", "role": "performer",
+                                             "name": "q", "city": "Madrid"})
+    assert res.status_code == 503
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+
+from api.models import db
+from api.query_plans import HOT_QUERIES, check_plans, _sqlite_full_scans
+
+
+def test_hot_queries_use_an_index(app):
+    with app.app_context():
+        assert check_plans() == []
+
+
+def test_hot_queries_cover_conversations_and_fingerprints():
+    labels = {label for label, _ in HOT_QUERIES}
+    assert "my_conversations (performer)" in labels
+    assert sum(label.endswith("fingerprint") for label in labels) >= 8
+
+
+@pytest.fixture
+def captured(app):
+    """Every SELECT the app sends to the database, with its parameters."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, tuple(parameters or ())))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_route_statements_use_an_index(app, api, client, captured):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    client.post(f"/api/offers/{offer_id}/approve-chat", json={"performerId": performer_id}, headers=venue)
+    first = client.post(f"/api/offers/{offer_id}/messages", json={"body": "hi"}, headers=venue).get_json()
+    captured.clear()
+
+    reads = [
+        ("/api/users?limit=5", venue),
+        ("/api/users/latest?role=performer", venue),
+        ("/api/offers?limit=5", venue),
+        ("/api/offers/latest", venue),
+        (f"/api/offers/{offer_id}", venue),
+        ("/api/offers/search?status=open&city=madrid&dateFrom=2025-01-01&limit=5", venue),
+        (f"/api/users/{venue_id}/offers/created?limit=5", venue),
+        (f"/api/users/{venue_id}/offers/dashboard?limit=5", venue),
+        (f"/api/users/{performer_id}/offers/applied?limit=5", performer),
+        (f"/api/offers/{offer_id}/matches", venue),
+        (f"/api/offers/{offer_id}/messages", performer),
+        (f"/api/offers/{offer_id}/messages?since={first['messageId']}", performer),
+        ("/api/users/me/conversations", venue),
+        ("/api/users/me/conversations", performer),
+        (f"/api/users/{venue_id}/reviews", performer),
+    ]
+    for url, headers in reads:
+        assert client.get(url, headers=headers).status_code == 200, url
+
+    assert captured
+    with app.app_context(), db.engine.connect() as conn:
+        scans = {sql: bad for sql, params in captured
+                 if (bad := _sqlite_full_scans(conn, sql, params))}
+    assert scans == {}
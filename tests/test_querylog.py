@@ -0,0 +1,86 @@
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from api import querylog
+from api.models import db, User
+from api.querylog import QueryBudgetExceeded, query_budget
+
+
+@pytest.fixture
+def probe(app):
+    """/probe/<n> runs the same lookup n times under a budget of 2."""
+    @query_budget(2)
+    def view(n):
+        for i in range(n):
+            db.session.execute(select(User.userId).where(User.userId == i)).all()
+        return {"ran": n}
+
+    app.add_url_rule("/probe/<int:n>", "probe", view)
+    return app.test_client()
+
+
+def test_counts_in_headers(probe):
+    res = probe.get("/probe/2")
+    assert res.status_code == 200
+    assert res.headers["X-Query-Count"] == "2"
+    assert float(res.headers["X-Query-Time-Ms"]) >= 0
+
+
+def test_budget_fails_the_request_under_testing(probe):
+    with pytest.raises(QueryBudgetExceeded, match=r"probe issued 3 queries \(budget 2\)"):
+        probe.get("/probe/3")
+
+
+def test_repeated_statement_logged_as_n_plus_one(monkeypatch, probe, caplog):
+    monkeypatch.setattr(querylog, "QUERY_DEBUG_REPEAT", 2)
+    with caplog.at_level(logging.WARNING):
+        probe.get("/probe/2")
+    [record] = [r for r in caplog.records if "N+1 suspect" in r.getMessage()]
+    assert "2 x SELECT" in record.getMessage()
+    assert "test_querylog.py" not in record.getMessage()  # call sites come from src/ only
+
+
+def test_slow_query_logged_with_plan(monkeypatch, probe, caplog):
+    monkeypatch.setattr(querylog, "QUERY_SLOW_MS", 0)
+    with caplog.at_level(logging.WARNING):
+        probe.get("/probe/1")
+    [record] = [r for r in caplog.records if "slow query" in r.getMessage()]
+    assert "plan:" in record.getMessage() and "SEARCH user" in record.getMessage()
+
+
+def test_off_outside_testing(app, probe):
+    app.testing = False
+    res = probe.get("/probe/3")
+    assert res.status_code == 200
+    assert "X-Query-Count" not in res.headers
+
+
+def test_budgets_declared_on_hot_routes(app):
+    budgets = {name: getattr(view, "query_budget", None) for name, view in app.view_functions.items()}
+    assert budgets["api.get_messages_for_offer"] == 3
+    assert budgets["api.my_conversations"] == 1
+    assert budgets["api.accept_performer"] == 4
+
+
+def test_accept_within_budget(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    p1_id, p1 = api.signup("p1@x.com")
+    p2_id, p2 = api.signup("p2@x.com")
+    offer_id = api.offer(venue)
+    for headers in (p1, p2):
+        client.post(f"/api/offers/{offer_id}/apply", json={"rate": 5}, headers=headers)
+
+    res = client.post(f"/api/offers/{offer_id}/accept", json={"performerId": p1_id}, headers=venue)
+    assert res.status_code == 200 and res.headers["X-Query-Count"] == "3"
+    client.post(f"/api/offers/{offer_id}/conclude", json={}, headers=venue)
+    # closed: the finalised event moves too
+    res = client.post(f"/api/offers/{offer_id}/accept", json={"performerId": p2_id}, headers=venue)
+    assert res.status_code == 200 and res.headers["X-Query-Count"] == "4"
+    assert res.get_json()["accepted"]["performerId"] == p2_id
+
+    res = client.post(f"/api/offers/{offer_id}/accept", json={"performerId": 999}, headers=venue)
+    assert res.status_code == 404
+    assert client.post(f"/api/offers/{offer_id}/accept", json={}, headers=venue).status_code == 400
+    assert client.post(f"/api/offers/{offer_id}/accept", json={}, headers=p1).status_code == 403
@@ -0,0 +1,113 @@
+import os
+import runpy
+import time
+from pathlib import Path
+
+import pytest
+
+from api import ratelimit
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_BACKEND", "memory")
+    ratelimit._buckets = None
+
+
+def _login(client, **kw):
+    return client.post("/api/login", json={"email": "x@y.z", "password": "nope"}, **kw)
+
+
+def test_parse_limit():
+    assert ratelimit.parse_limit("10/minute") == (10 / 60, 10)
+    assert ratelimit.parse_limit(" 2 / seconds ") == (2.0, 2)
+
+
+def test_bucket_refills(monkeypatch):
+    buckets = ratelimit.MemoryBuckets()
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    assert [buckets.take("k", rate=1.0, burst=2) for _ in range(3)] == [0.0, 0.0, 1.0]
+    now[0] += 1.0
+    assert buckets.take("k", rate=1.0, burst=2) == 0.0
+    assert buckets.take("other", rate=1.0, burst=2) == 0.0
+
+
+def test_shared_buckets_span_processes(tmp_path):
+    path = str(tmp_path / "rl.sqlite3")
+    first, second = ratelimit.SQLiteBuckets(path), ratelimit.SQLiteBuckets(path)
+    assert first.take("k", rate=0.01, burst=1) == 0.0
+    assert second.take("k", rate=0.01, burst=1) > 0
+
+
+def test_login_limited_per_client(limited, client):
+    codes = [_login(client).status_code for _ in range(10)]
+    assert codes == [401] * 10
+    res = _login(client)
+    assert res.status_code == 429
+    assert int(res.headers["Retry-After"]) >= 1
+    assert res.get_json()["retryAfter"] == int(res.headers["Retry-After"])
+    # another address has its own bucket
+    assert _login(client, environ_base={"REMOTE_ADDR": "10.0.0.9"}).status_code == 401
+
+
+def test_authenticated_clients_keyed_by_user(limited, api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    _, other = api.signup("o@x.com", "distributor")
+    offer_id = api.offer(venue)
+    _, performer = api.signup("p@x.com")
+    for _ in range(20):
+        client.post(f"/api/offers/{offer_id}/messages", json={"body": "x"}, headers=performer)
+    assert client.post(f"/api/offers/{offer_id}/messages", json={"body": "x"}, headers=performer).status_code == 429
+    # same address, different user
+    assert client.post(f"/api/offers/{offer_id}/messages", json={"body": "x"}, headers=venue).status_code != 429
+    assert client.post(f"/api/offers/{offer_id}/messages", json={"body": "x"}, headers=other).status_code != 429
+
+
+@pytest.fixture
+def admitting(monkeypatch, make_app):
+    controller = ratelimit.AdmissionController(max_inflight=1, queue_timeout=0.01, max_queue_ms=1000)
+    monkeypatch.setattr(ratelimit, "admission", controller)
+    return controller, make_app().test_client()
+
+
+def test_stale_requests_shed(admitting):
+    controller, client = admitting
+    stale = {"X-Request-Start": f"t={int((time.time() - 5) * 1e6)}"}
+    res = client.get("/api/users", headers=stale)
+    assert res.status_code == 503 and res.headers["Retry-After"] == "1"
+    assert client.get("/api/users", headers={"X-Request-Start": f"t={time.time():.3f}"}).status_code == 200
+    assert client.get("/health", headers=stale).status_code == 200
+    assert controller.shed == 1
+
+
+def test_full_slots_shed(admitting):
+    controller, client = admitting
+    controller._slots.acquire()
+    try:
+        assert client.get("/api/users").status_code == 503
+        assert client.get("/metrics").status_code != 503
+    finally:
+        controller._slots.release()
+    assert client.get("/api/users").status_code == 200
+
+
+def test_gunicorn_threads_cap_admission(monkeypatch, make_app):
+    monkeypatch.setenv("GUNICORN_THREADS", "3")
+    monkeypatch.setenv("ADMISSION_MAX_INFLIGHT", "")
+    monkeypatch.delenv("ADMISSION_MAX_INFLIGHT")
+    conf = runpy.run_path(str(Path(__file__).parents[1] / "src" / "gunicorn.conf.py"))
+    assert conf["threads"] == 3 and os.environ["ADMISSION_MAX_INFLIGHT"] == "3"
+
+    controller = ratelimit.AdmissionController(int(os.environ["ADMISSION_MAX_INFLIGHT"]), 0.01, 0)
+    monkeypatch.setattr(ratelimit, "admission", controller)
+    client = make_app().test_client()
+    for _ in range(conf["threads"]):  # every thread busy
+        assert controller._slots.acquire(timeout=0)
+    try:
+        res = client.get("/api/users")
+        assert res.status_code == 503 and res.headers["Retry-After"] == "1"
+    finally:
+        for _ in range(conf["threads"]):
+            controller._slots.release()
+    assert client.get("/api/users").status_code == 200
@@ -0,0 +1,71 @@
+from sqlalchemy import select, update
+
+from api.models import db, User
+from api.ratings import rebuild_ratings
+
+
+def _gig(api, client, performer_id, performer, email):
+    """A closed offer by a new venue with `performer` accepted; returns (venue_id, venue, offer_id)."""
+    venue_id, venue = api.signup(email, "distributor")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    client.post(f"/api/offers/{offer_id}/accept", json={"performerId": performer_id}, headers=venue)
+    client.post(f"/api/offers/{offer_id}/conclude", json={}, headers=venue)
+    return venue_id, venue, offer_id
+
+
+def _review(client, headers, rater_id, rated_id, offer_id, score):
+    return client.post("/api/reviews", headers=headers, json={
+        "raterId": rater_id, "ratedId": rated_id, "offerId": offer_id, "score": score})
+
+
+def _rating(client, user_id):
+    user = client.get(f"/api/users/{user_id}").get_json()
+    return user["ratingAvg"], user["ratingCount"], user["ratingHistogram"]
+
+
+def test_aggregates_follow_reviews(api, client):
+    performer_id, performer = api.signup("p@x.com")
+    a_id, a, offer_a = _gig(api, client, performer_id, performer, "a@x.com")
+    b_id, b, offer_b = _gig(api, client, performer_id, performer, "b@x.com")
+
+    assert _review(client, a, a_id, performer_id, offer_a, 4).status_code == 201
+    second = _review(client, b, b_id, performer_id, offer_b, 5)
+    assert second.status_code == 201
+    avg, count, hist = _rating(client, performer_id)
+    assert (avg, count) == (4.5, 2)
+    assert hist == {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1}
+
+    assert _review(client, a, a_id, performer_id, offer_a, 1).status_code == 409
+    assert _rating(client, performer_id)[:2] == (4.5, 2)
+
+    client.delete(f"/api/reviews/{second.get_json()['reviewId']}", headers=b)
+    assert _rating(client, performer_id)[:2] == (4.0, 1)
+
+
+def test_rebuild_repairs_drift(app, api, client):
+    performer_id, performer = api.signup("p@x.com")
+    venue_id, venue, offer_id = _gig(api, client, performer_id, performer, "v@x.com")
+    _review(client, venue, venue_id, performer_id, offer_id, 3)
+
+    with app.app_context():
+        db.session.execute(update(User).values(ratingCount=7, ratingAvg=1.0))
+        db.session.commit()
+        assert rebuild_ratings() == 1
+        user = db.session.get(User, performer_id)
+        assert (user.ratingCount, user.ratingSum, user.ratingAvg, user.ratingHist3) == (1, 3, 3.0, 1)
+        assert db.session.get(User, venue_id).ratingCount == 0
+
+
+def test_rebuild_leaves_settled_users_alone(app, api, client):
+    performer_id, performer = api.signup("p@x.com")
+    venue_id, venue, offer_id = _gig(api, client, performer_id, performer, "v@x.com")
+    _review(client, venue, venue_id, performer_id, offer_id, 4)
+    etag = client.get(f"/api/users/{performer_id}").headers["ETag"]
+
+    with app.app_context():
+        before = dict(db.session.execute(select(User.userId, User.updatedAt)).all())
+        assert rebuild_ratings() == 1
+        assert dict(db.session.execute(select(User.userId, User.updatedAt)).all()) == before
+    res = client.get(f"/api/users/{performer_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from api import recommend
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    # the index lives in the process; every test has its own database
+    monkeypatch.setattr(recommend, "index", recommend.RecommendationIndex())
+    monkeypatch.setattr(recommend, "SYNC_INTERVAL", 0)
+
+
+@pytest.fixture
+def market(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    client.put(f"/api/users/{performer_id}", json={"genre": "Rock"}, headers=performer)
+    offers = {
+        key: api.offer(venue, city=city, genre=genre, budget=budget)
+        for key, (city, genre, budget) in {
+            "madrid-rock": ("Madrid", "rock", 500),
+            "madrid-jazz": ("Madrid", "jazz", 500),
+            "bilbao-rock": ("Bilbao", "rock", 50),
+            "sevilla-pop": ("Sevilla", "pop", 1000),
+        }.items()
+    }
+    return venue, performer_id, performer, offers
+
+
+def _ranked(client, url, headers):
+    res = client.get(url, headers=headers)
+    assert res.status_code == 200
+    return [(item.get("offerId", item.get("userId")), item["score"]) for item in res.get_json()]
+
+
+def test_top_k_skips_inactive_and_excluded():
+    ids = np.array([10, 11, 12, 13])
+    scores = np.array([0.2, 0.9, 0.5, 0.7])
+    active = np.array([True, True, True, False])
+    pos = {10: 0, 11: 1, 12: 2, 13: 3}
+    assert recommend.top_k(ids, active, pos, scores, 2) == [(11, 0.9), (12, 0.5)]
+    assert recommend.top_k(ids, active, pos, scores, 5, exclude=[11]) == [(12, 0.5), (10, 0.2)]
+
+
+def test_offers_ranked_for_performer(client, market):
+    _, performer_id, performer, o = market
+    ranked = _ranked(client, f"/api/users/{performer_id}/recommended-offers", performer)
+    assert [oid for oid, _ in ranked][0] == o["madrid-rock"]
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+    assert len(_ranked(client, f"/api/users/{performer_id}/recommended-offers?limit=2", performer)) == 2
+
+
+def test_index_follows_writes(api, client, market):
+    venue, performer_id, performer, o = market
+    url = f"/api/users/{performer_id}/recommended-offers"
+    _ranked(client, url, performer)  # builds the index
+
+    client.post(f"/api/offers/{o['madrid-rock']}/apply", json={"rate": 400}, headers=performer)
+    client.post(f"/api/offers/{o['sevilla-pop']}/conclude", json={}, headers=venue)
+    new = api.offer(venue, city="Madrid", genre="rock", budget=800)
+
+    ids = [oid for oid, _ in _ranked(client, url, performer)]
+    assert ids[0] == new
+    assert o["madrid-rock"] not in ids and o["sevilla-pop"] not in ids
+
+
+def test_performers_ranked_for_offer(api, client, market):
+    venue, performer_id, _, o = market
+    far_id, far = api.signup("far@x.com", "performer", city="Bilbao")
+    url = f"/api/offers/{o['madrid-rock']}/recommended-performers"
+    assert [uid for uid, _ in _ranked(client, url, venue)] == [performer_id, far_id]
+
+    client.delete(f"/api/users/{far_id}", headers=far)
+    assert [uid for uid, _ in _ranked(client, url, venue)] == [performer_id]
+
+
+def test_access_rules(api, client, market):
+    venue, performer_id, performer, o = market
+    venue_id = client.get("/api/auth/me", headers=venue).get_json()["userId"]
+    _, other = api.signup("o@x.com", "performer")
+    assert client.get(f"/api/users/{venue_id}/recommended-offers", headers=venue).status_code == 404
+    assert client.get(f"/api/users/{performer_id}/recommended-offers", headers=other).status_code == 403
+    assert client.get(f"/api/offers/{o['madrid-rock']}/recommended-performers", headers=performer).status_code == 403
+    assert client.get("/api/offers/999/recommended-performers", headers=venue).status_code == 404
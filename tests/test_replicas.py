@@ -0,0 +1,73 @@
+import shutil
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api import replicas
+from api.models import db
+
+
+def test_replica_binds_from_env():
+    assert replicas.replica_binds(" postgres://r1/db , ,sqlite:///r2.db") == {
+        "replica1": "postgresql://r1/db", "replica2": "sqlite:///r2.db"}
+    assert replicas.replica_binds("") == {}
+
+
+@pytest.fixture
+def cluster(tmp_path, make_app, api, client):
+    """An app whose replica is a stale copy of the primary, plus the databases each read hit."""
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    _, performer = api.signup("p@x.com")
+    api.offer(venue, title="replicated")
+
+    app = make_app(SQLALCHEMY_BINDS={"replica1": f"sqlite:///{tmp_path / 'replica.db'}"})
+    with app.app_context():
+        db.engine.dispose()
+    shutil.copy(tmp_path / "test.db", tmp_path / "replica.db")  # "replication"
+
+    hits = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            hits.append(conn.engine.url.database.rsplit("/", 1)[-1])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield app.test_client(), venue, performer, hits
+    event.remove(Engine, "before_cursor_execute", record)
+
+
+def _titles(client, headers):
+    return [o["title"] for o in client.get("/api/offers?limit=20", headers=headers).get_json()["items"]]
+
+
+def test_reads_go_to_replica_and_writers_stick_to_primary(api, cluster):
+    client, venue, performer, hits = cluster
+    res = client.post("/api/offers", headers=venue, json={
+        "title": "fresh", "city": "Madrid", "venueName": "Sala", "description": "d",
+        "eventDate": "2026-11-15T21:00"})
+    assert res.status_code == 201
+
+    hits.clear()
+    assert _titles(client, performer) == ["replicated"]  # lagging replica
+    assert set(hits) == {"replica.db"}
+
+    hits.clear()
+    assert _titles(client, venue) == ["fresh", "replicated"]  # reads its own write
+    assert set(hits) == {"test.db"}
+
+
+def test_primary_only_and_long_polls(cluster):
+    client, venue, _, hits = cluster
+    hits.clear()
+    client.get("/api/offers/1/messages?since=0&wait=0.1", headers=venue)
+    assert set(hits) == {"test.db"}
+
+
+def test_app_without_replicas_after_one_with(make_app, tmp_path):
+    # the db extension is shared: a replica bind must not leak into later apps
+    make_app(SQLALCHEMY_BINDS={"replica1": f"sqlite:///{tmp_path / 'replica.db'}"})
+    plain = make_app()
+    with plain.app_context():
+        assert list(db.engines) == [None]
+    assert plain.test_client().get("/api/users").status_code == 200
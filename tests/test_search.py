@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.fixture
+def offers(api):
+    _, venue = api.signup("v@x.com", "distributor")
+    made = {
+        "madrid-rock": api.offer(venue, city="Madrid", genre="Rock", budget=100, capacity=150,
+                                 eventDate="2026-06-01T21:00"),
+        "madrid-jazz": api.offer(venue, city="Madrid", genre="Jazz", budget=300, capacity=80,
+                                 eventDate="2026-09-01T21:00"),
+        "bilbao-rock": api.offer(venue, city="Bilbao", genre="rock", budget=200, capacity=400,
+                                 eventDate="2026-12-01T21:00"),
+    }
+    return venue, made
+
+
+def _search(client, venue, query):
+    res = client.get(f"/api/offers/search?{query}", headers=venue)
+    assert res.status_code == 200, res.get_json()
+    return res.get_json()
+
+
+def _ids(page):
+    return {item["offerId"] for item in page["items"]}
+
+
+def test_predicates(client, offers):
+    venue, o = offers
+    assert _ids(_search(client, venue, "city=MADRID")) == {o["madrid-rock"], o["madrid-jazz"]}
+    assert _ids(_search(client, venue, "genre=rock")) == {o["madrid-rock"], o["bilbao-rock"]}
+    assert _ids(_search(client, venue, "minBudget=150&maxBudget=250")) == {o["bilbao-rock"]}
+    assert _ids(_search(client, venue, "minCapacity=100&maxCapacity=200")) == {o["madrid-rock"]}
+    assert _ids(_search(client, venue, "dateFrom=2026-08-01&dateTo=2026-10-01")) == {o["madrid-jazz"]}
+    assert _ids(_search(client, venue, "status=open&city=madrid&genre=jazz")) == {o["madrid-jazz"]}
+    assert _ids(_search(client, venue, "status=closed")) == set()
+
+
+def test_facets_on_first_page_only(client, offers):
+    venue, _ = offers
+    first = _search(client, venue, "genre=rock&limit=1")
+    assert first["facets"] == {"city": {"Madrid": 1, "Bilbao": 1}, "genre": {"Rock": 1, "rock": 1}}
+    assert len(first["items"]) == 1 and first["nextCursor"]
+
+    second = _search(client, venue, f"genre=rock&limit=1&cursor={first['nextCursor']}")
+    assert "facets" not in second
+    assert second["nextCursor"] is None
+
+
+@pytest.mark.parametrize("query", ["dateFrom=bad", "minBudget=lots", "maxCapacity=1.5", "cursor=zz"])
+def test_invalid_input(client, offers, query):
+    venue, _ = offers
+    assert client.get(f"/api/offers/search?{query}", headers=venue).status_code == 400
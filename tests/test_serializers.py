@@ -0,0 +1,46 @@
+import json
+
+from sqlalchemy import select
+
+from api.models import db
+from api.serializers import FIELDS, Projection, dumps
+
+
+def _roundtrip(payload):
+    return json.loads(dumps(payload))
+
+
+def test_projection_matches_serialize(app, api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue, budget=150.5, genre="rock")
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 99.5}, headers=performer)
+    client.post(f"/api/offers/{offer_id}/approve-chat", json={"performerId": performer_id}, headers=venue)
+    client.post(f"/api/offers/{offer_id}/messages", json={"body": "hi"}, headers=venue)
+    client.post(f"/api/offers/{offer_id}/accept", json={"performerId": performer_id}, headers=venue)
+    client.post(f"/api/offers/{offer_id}/conclude", json={}, headers=venue)
+    client.post("/api/reviews", headers=venue, json={
+        "raterId": venue_id, "ratedId": performer_id, "offerId": offer_id, "score": 5})
+
+    with app.app_context():
+        for model in FIELDS:
+            proj = Projection(model)
+            rows = db.session.execute(proj.select()).all()
+            objects = db.session.execute(select(model)).scalars().all()
+            assert rows, model
+            expected = [app.json.loads(app.json.dumps(obj.serialize())) for obj in objects]
+            assert _roundtrip(proj.to_dicts(rows)) == expected, model
+
+
+def test_sparse_fieldsets(api, client):
+    _, venue = api.signup("v@x.com", "distributor")
+    api.offer(venue, title="One")
+
+    page = client.get("/api/offers?fields=title,offerId&limit=5", headers=venue).get_json()
+    assert [set(item) for item in page["items"]] == [{"offerId", "title"}]
+    users = client.get("/api/users?fields=ratingHistogram").get_json()
+    assert users == [{"ratingHistogram": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}}]
+
+    res = client.get("/api/offers?fields=title,nope", headers=venue)
+    assert res.status_code == 400
+    assert "nope" in res.get_json()["message"]
@@ -0,0 +1,103 @@
+import pytest
+
+from api import tasks  # noqa: F401  registers the job handlers
+from api.jobs import run_workers
+from api.models import db, User, Match, Message, Review
+
+
+@pytest.fixture
+def gig(api, client):
+    """A closed offer with two applicants chatting; `gone` is accepted and reviewed both ways."""
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    gone_id, gone = api.signup("gone@x.com", "performer")
+    stay_id, stay = api.signup("stay@x.com", "performer")
+    offer_id = api.offer(venue)
+    for headers in (gone, stay):
+        assert client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=headers).status_code == 201
+    client.post(f"/api/offers/{offer_id}/approve-chat/batch", headers=venue,
+                json={"items": [{"performerId": gone_id}, {"performerId": stay_id}]})
+    for headers, body in ((gone, "from gone"), (stay, "from stay"), (venue, "from venue")):
+        assert client.post(f"/api/offers/{offer_id}/messages", json={"body": body}, headers=headers).status_code == 201
+    client.post(f"/api/offers/{offer_id}/accept", json={"performerId": gone_id}, headers=venue)
+    client.post(f"/api/offers/{offer_id}/conclude", json={}, headers=venue)
+    for rater, rated, headers in ((gone_id, venue_id, gone), (venue_id, gone_id, venue)):
+        res = client.post("/api/reviews", headers=headers,
+                          json={"raterId": rater, "ratedId": rated, "offerId": offer_id, "score": 4})
+        assert res.status_code == 201
+    return dict(venue_id=venue_id, venue=venue, gone_id=gone_id, gone=gone,
+                stay_id=stay_id, stay=stay, offer_id=offer_id)
+
+
+def _delete(client, g):
+    # warm the caches first: the delete has to drop them
+    client.get(f"/api/users/{g['venue_id']}/reviews")
+    client.get(f"/api/users/{g['gone_id']}/reviews")
+    assert client.delete(f"/api/users/{g['gone_id']}", headers=g["gone"]).status_code == 204
+
+
+def test_deleted_user_hidden_from_reads(client, gig):
+    g = gig
+    _delete(client, g)
+
+    assert client.get(f"/api/users/{g['gone_id']}").status_code == 404
+    assert client.get(f"/api/users/{g['gone_id']}/reviews").status_code == 404
+    assert client.get(f"/api/users/{g['venue_id']}/reviews").get_json() == []
+    assert client.get(f"/api/users/{g['gone_id']}/offers/applied", headers=g["venue"]).status_code == 404
+
+    matches = client.get(f"/api/offers/{g['offer_id']}/matches", headers=g["venue"]).get_json()
+    assert [m["performerId"] for m in matches] == [g["stay_id"]]
+
+    messages = client.get(f"/api/offers/{g['offer_id']}/messages", headers=g["venue"]).get_json()
+    assert [m["body"] for m in messages] == ["from stay", "from venue"]
+    since = client.get(f"/api/offers/{g['offer_id']}/messages?since=0", headers=g["stay"]).get_json()
+    assert [m["body"] for m in since] == ["from stay", "from venue"]
+
+    inbox = client.get("/api/users/me/conversations", headers=g["stay"]).get_json()["items"]
+    assert inbox[0]["unread"] == 1 and inbox[0]["lastMessage"]["body"] == "from venue"
+
+
+def test_deleted_users_token_rejected(api, client, gig):
+    g = gig
+    other = api.offer(g["venue"])
+    _delete(client, g)
+
+    assert client.post(f"/api/offers/{other}/apply", json={"rate": 1}, headers=g["gone"]).status_code == 401
+    res = client.post("/api/offers/apply/batch", json={"items": [{"offerId": other, "rate": 1}]}, headers=g["gone"])
+    assert res.status_code == 401
+    res = client.post(f"/api/offers/{g['offer_id']}/messages", json={"body": "still here?"}, headers=g["gone"])
+    assert res.status_code == 403
+    assert client.get(f"/api/offers/{g['offer_id']}/messages", headers=g["gone"]).status_code == 403
+    assert client.post("/api/login", json={"email": "gone@x.com", "password": "pw"}).status_code == 401
+
+
+def test_deleted_venue_cannot_manage_offers(api, client):
+    venue_id, venue = api.signup("v@x.com", "distributor")
+    performer_id, performer = api.signup("p@x.com", "performer")
+    offer_id = api.offer(venue)
+    client.post(f"/api/offers/{offer_id}/apply", json={"rate": 100}, headers=performer)
+    assert client.delete(f"/api/users/{venue_id}", headers=venue).status_code == 204
+
+    assert client.get(f"/api/offers/{offer_id}", headers=venue).get_json()["status"] == "cancelled"
+    res = client.post(f"/api/offers/{offer_id}/accept", json={"performerId": performer_id}, headers=venue)
+    assert res.status_code == 403
+    res = client.post(f"/api/offers/{offer_id}/approve-chat", json={"performerId": performer_id}, headers=venue)
+    assert res.status_code == 403
+    assert client.post(f"/api/offers/{offer_id}/conclude", json={}, headers=venue).status_code == 403
+    assert client.get(f"/api/offers/{offer_id}/matches", headers=venue).status_code == 403
+
+
+def test_purge_removes_cascade(app, client, gig):
+    g = gig
+    _delete(client, g)
+    run_workers(app, burst=True)
+
+    with app.app_context():
+        assert db.session.get(User, g["gone_id"]) is None
+        assert db.session.query(Match).filter_by(performerId=g["gone_id"]).count() == 0
+        assert db.session.query(Message).filter_by(authorId=g["gone_id"]).count() == 0
+        assert db.session.query(Review).filter_by(raterId=g["gone_id"]).count() == 0
+        venue = db.session.get(User, g["venue_id"])
+        assert venue.ratingCount == 0
+
+    res = client.get(f"/api/offers/{g['offer_id']}", headers=g["venue"]).get_json()
+    assert res["applicationsCount"] == 1 and res["acceptedPerformerId"] is None